@@ -0,0 +1 @@
+"""Exams API package."""
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import ExamTreeView
+
+urlpatterns = [
+    path("tree/", ExamTreeView.as_view()),
+]
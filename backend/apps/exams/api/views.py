@@ -0,0 +1,53 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.exams.application.tree import get_exam_tree
+
+
+class ExamTreeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Возвращает дерево рубрикатора: Exam → ExamType → ExamTaskGroup → ExamTaskType.
+
+        Поддерживает `If-None-Match`: если дерево не менялось, отвечает 304 без тела.
+
+        Пример ответа:
+            {
+              "exams": [
+                {
+                  "id": 1,
+                  "title": "ЕГЭ",
+                  "exam_types": [
+                    {
+                      "id": 3,
+                      "subject_id": 1,
+                      "subject_title": "Математика",
+                      "task_count": 540,
+                      "task_groups": [
+                        {
+                          "id": 10,
+                          "num": 13,
+                          "title": "Планиметрия",
+                          "max_score": 2,
+                          "task_count": 20,
+                          "task_types": [{"id": 7, "title": "Прямоугольный треугольник", "task_count": 20}]
+                        }
+                      ]
+                    }
+                  ]
+                }
+              ]
+            }
+        """
+        snapshot = get_exam_tree()
+
+        if request.headers.get("If-None-Match") == snapshot.etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({"exams": snapshot.exams})
+        response["ETag"] = snapshot.etag
+        return response
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from apps.monitoring.application.metrics import record_cache_lookup
+from apps.exams.models import Exam, ExamTaskGroup, ExamTaskType, ExamType
+from apps.tasks.models import Task
+
+EXAM_TREE_VERSION_KEY = "exams:tree:version"
+EXAM_TREE_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class ExamTreeSnapshot:
+    version: int
+    etag: str
+    exams: list[dict]
+
+
+def get_exam_tree() -> ExamTreeSnapshot:
+    """
+    Возвращает снапшот дерева Exam → ExamType → ExamTaskGroup → ExamTaskType из кеша.
+
+    Снапшот версионируется: любое сохранение/удаление модели рубрикатора (или задания)
+    меняет версию, и следующий запрос строит дерево заново.
+
+    Пример:
+        snapshot = get_exam_tree()
+        # snapshot.exams -> [{"id": 1, "title": "ЕГЭ", "exam_types": [...]}]
+    """
+    version = cache.get(EXAM_TREE_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(EXAM_TREE_VERSION_KEY, version, None):
+            version = cache.get(EXAM_TREE_VERSION_KEY, version)
+
+    cache_key = f"exams:tree:{version}"
+    snapshot = cache.get(cache_key)
+    record_cache_lookup("exam_tree", hit=snapshot is not None)
+    if snapshot is None:
+        exams = build_exam_tree()
+        payload = json.dumps(exams, ensure_ascii=False, sort_keys=True).encode()
+        snapshot = ExamTreeSnapshot(
+            version=version,
+            etag=f'"{hashlib.sha1(payload).hexdigest()}"',
+            exams=exams,
+        )
+        cache.set(cache_key, snapshot, EXAM_TREE_CACHE_TTL_SECONDS)
+    return snapshot
+
+
+def bump_exam_tree_version() -> None:
+    """
+    Инвалидирует снапшот дерева (вызывается из сигналов и массовых операций).
+
+    Пример:
+        bump_exam_tree_version()
+    """
+    cache.set(EXAM_TREE_VERSION_KEY, time.time_ns(), None)
+
+
+def build_exam_tree() -> list[dict]:
+    """
+    Строит дерево активного рубрикатора: по одному запросу на уровень + один запрос на счетчики заданий.
+
+    Пример:
+        build_exam_tree()
+        # [{"id": 1, "title": "ЕГЭ", "exam_types": [{"id": 3, "subject_title": "Математика",
+        #   "task_count": 540, "task_groups": [...]}]}]
+    """
+    task_counts = dict(
+        Task.objects.filter(exam_task_type__isnull=False)
+        .values("exam_task_type_id")
+        .annotate(task_count=Count("id"))
+        .values_list("exam_task_type_id", "task_count")
+    )
+
+    task_types_by_group: dict[int, list[dict]] = {}
+    for task_type in (
+        ExamTaskType.objects.filter(is_active=True)
+        .order_by("id")
+        .values("id", "exam_task_group_id", "title")
+    ):
+        task_types_by_group.setdefault(task_type.pop("exam_task_group_id"), []).append(
+            {**task_type, "task_count": task_counts.get(task_type["id"], 0)}
+        )
+
+    groups_by_exam_type: dict[int, list[dict]] = {}
+    for group in (
+        ExamTaskGroup.objects.filter(is_active=True)
+        .order_by("num")
+        .values("id", "exam_type_id", "num", "title", "max_score")
+    ):
+        task_types = task_types_by_group.get(group["id"], [])
+        groups_by_exam_type.setdefault(group.pop("exam_type_id"), []).append(
+            {
+                **group,
+                "task_count": sum(task_type["task_count"] for task_type in task_types),
+                "task_types": task_types,
+            }
+        )
+
+    exam_types_by_exam: dict[int, list[dict]] = {}
+    for exam_type in (
+        ExamType.objects.filter(is_active=True)
+        .order_by("id")
+        .values("id", "exam_id", "subject_id", "subject__title")
+    ):
+        task_groups = groups_by_exam_type.get(exam_type["id"], [])
+        exam_types_by_exam.setdefault(exam_type["exam_id"], []).append(
+            {
+                "id": exam_type["id"],
+                "subject_id": exam_type["subject_id"],
+                "subject_title": exam_type["subject__title"],
+                "task_count": sum(group["task_count"] for group in task_groups),
+                "task_groups": task_groups,
+            }
+        )
+
+    return [
+        {**exam, "exam_types": exam_types_by_exam.get(exam["id"], [])}
+        for exam in Exam.objects.order_by("id").values("id", "title")
+    ]
@@ -3,6 +3,32 @@ from django.contrib import admin
 from apps.exams.models import Exam, ExamTaskGroup, ExamTaskType, ExamType
 
 
+class SelectRelatedListFilter(admin.RelatedFieldListFilter):
+    """
+    Фильтр по FK, варианты которого загружаются одним запросом.
+
+    `__str__` моделей рубрикатора ходит по FK (ExamType → Exam, Subject), поэтому стандартный
+    фильтр делает по запросу на каждый вариант.
+    """
+
+    select_related: tuple[str, ...] = ()
+
+    def field_choices(self, field, request, model_admin):
+        queryset = field.related_model._default_manager.select_related(*self.select_related)
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return [(obj.pk, str(obj)) for obj in queryset]
+
+
+class ExamTypeListFilter(SelectRelatedListFilter):
+    select_related = ("exam", "subject")
+
+
+class ExamTaskGroupListFilter(SelectRelatedListFilter):
+    select_related = ("exam_type__exam", "exam_type__subject")
+
+
 @admin.register(Exam)
 class ExamAdmin(admin.ModelAdmin):
     list_display = ("id", "title")
@@ -21,7 +47,7 @@ class ExamTypeAdmin(admin.ModelAdmin):
 @admin.register(ExamTaskGroup)
 class ExamTaskGroupAdmin(admin.ModelAdmin):
     list_display = ("id", "exam_type", "num", "title", "max_score", "is_active")
-    list_filter = ("is_active", "exam_type")
+    list_filter = ("is_active", ("exam_type", ExamTypeListFilter))
     search_fields = ("title", "exam_type__exam__title", "exam_type__subject__title")
     ordering = ("exam_type", "num", "id")
 
@@ -29,6 +55,6 @@ class ExamTaskGroupAdmin(admin.ModelAdmin):
 @admin.register(ExamTaskType)
 class ExamTaskTypeAdmin(admin.ModelAdmin):
     list_display = ("id", "exam_task_group", "title", "is_active")
-    list_filter = ("is_active", "exam_task_group")
+    list_filter = ("is_active", ("exam_task_group", ExamTaskGroupListFilter))
     search_fields = ("title", "exam_task_group__title")
     ordering = ("id",)
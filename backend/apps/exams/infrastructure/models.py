@@ -40,6 +40,9 @@ class ExamType(models.Model):
     subject = models.ForeignKey("graph.Subject", on_delete=models.PROTECT, related_name="exam_types")
     is_active = models.BooleanField(default=True)
 
+    # Exam duration; copied to generated variants (`training.Test.time_limit_minutes`).
+    time_limit_minutes = models.PositiveIntegerField(null=True, blank=True)
+
     class Meta:
         verbose_name = "Экзамен по предмету"
         verbose_name_plural = "Экзамены по предметам"
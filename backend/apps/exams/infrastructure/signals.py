@@ -0,0 +1,30 @@
+"""
+Инвалидация кеша дерева рубрикатора при изменении его моделей.
+
+Подключается в `ExamsConfig.ready()`.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.exams.application.tree import bump_exam_tree_version
+
+# Subject titles and task counts are part of the tree as well.
+EXAM_TREE_SENDERS = (
+    "exams.Exam",
+    "exams.ExamType",
+    "exams.ExamTaskGroup",
+    "exams.ExamTaskType",
+    "graph.Subject",
+    "tasks.Task",
+)
+
+
+def invalidate_exam_tree(sender, **kwargs):
+    # After commit: otherwise another worker may rebuild the new version from the old rows.
+    transaction.on_commit(bump_exam_tree_version)
+
+
+for sender in EXAM_TREE_SENDERS:
+    post_save.connect(invalidate_exam_tree, sender=sender, dispatch_uid=f"exam-tree-save:{sender}")
+    post_delete.connect(invalidate_exam_tree, sender=sender, dispatch_uid=f"exam-tree-delete:{sender}")
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0002_alter_exam_options_alter_examtaskgroup_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examtype',
+            name='time_limit_minutes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import RouteStatsView
+
+urlpatterns = [
+    path("routes/", RouteStatsView.as_view()),
+]
@@ -0,0 +1,63 @@
+import os
+
+from django.http import HttpResponse
+from django.views import View
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.monitoring.application.profiling import get_route_stats
+
+
+class RouteStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Профиль маршрутов текущего рабочего процесса (накоплен `ProfilingMiddleware`) — только для staff.
+
+        Каждый процесс отдает свои замеры; маршруты отсортированы по суммарному времени.
+
+        Пример ответа:
+            {
+              "routes": [
+                {
+                  "method": "POST",
+                  "route": "api/training/submit/",
+                  "count": 120,
+                  "avg_ms": 31.4,
+                  "p50_ms": 25,
+                  "p95_ms": 100,
+                  "p99_ms": 250,
+                  "avg_sql_queries": 7.0,
+                  "avg_sql_ms": 9.8,
+                  "avg_response_bytes": 310,
+                  "budget_exceeded": 0,
+                  "histogram": [0, 4, 80, 30, 5, 1, 0, 0, 0, 0, 0, 0]
+                }
+              ]
+            }
+        """
+        return Response({"routes": get_route_stats()})
+
+
+class MetricsView(View):
+    def get(self, request):
+        """
+        Метрики в текстовом формате Prometheus.
+
+        При `PROMETHEUS_MULTIPROC_DIR` значения собираются из файлов всех рабочих процессов,
+        иначе отдаются метрики текущего процесса. Доступ ограничивается на уровне прокси.
+
+        Пример ответа:
+            # HELP adaptaki_test_attempts_total TestAttempt transitions by resulting status ...
+            # TYPE adaptaki_test_attempts_total counter
+            adaptaki_test_attempts_total{status="started"} 42.0
+        """
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
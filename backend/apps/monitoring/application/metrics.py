@@ -0,0 +1,89 @@
+"""
+Метрики Prometheus для горячих путей.
+
+Метрики регистрируются при импорте модуля. Если задан `PROMETHEUS_MULTIPROC_DIR`,
+prometheus_client пишет значения в mmap-файлы каталога и `/metrics` собирает их со всех
+рабочих процессов (см. README приложения).
+"""
+
+from __future__ import annotations
+
+from prometheus_client import Counter, Histogram
+
+# Seconds; matches LATENCY_BUCKETS_MS of the profiling histograms.
+REQUEST_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Answer checks are pure Python and far below a millisecond.
+ANSWER_CHECK_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+REQUEST_LATENCY = Histogram(
+    "adaptaki_http_request_duration_seconds",
+    "Wall time of profiled API requests.",
+    ["method", "route"],
+    buckets=REQUEST_LATENCY_BUCKETS,
+)
+ANSWER_CHECK_DURATION = Histogram(
+    "adaptaki_answer_check_duration_seconds",
+    "Time spent in check_task_answer by task type and outcome.",
+    ["task_type", "outcome"],
+    buckets=ANSWER_CHECK_BUCKETS,
+)
+RANDOM_TASK_SELECTION_DURATION = Histogram(
+    "adaptaki_random_task_selection_duration_seconds",
+    "Time to pick a random task (including the database query).",
+    buckets=REQUEST_LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "adaptaki_cache_lookups",
+    "Application cache lookups by cache and result (hit / miss).",
+    ["cache", "result"],
+)
+TEST_ATTEMPT_TRANSITIONS = Counter(
+    "adaptaki_test_attempts",
+    "TestAttempt transitions by resulting status (started, finished, abandoned, expired).",
+    ["status"],
+)
+
+
+def observe_request(*, method: str, route: str, duration_seconds: float) -> None:
+    """
+    Пример:
+        observe_request(method="POST", route="api/training/submit-answer/", duration_seconds=0.042)
+    """
+    REQUEST_LATENCY.labels(method, route).observe(duration_seconds)
+
+
+def observe_answer_check(*, task_type: str, is_correct: bool, duration_seconds: float) -> None:
+    """
+    Пример:
+        observe_answer_check(task_type="number", is_correct=True, duration_seconds=0.00002)
+    """
+    ANSWER_CHECK_DURATION.labels(task_type, "correct" if is_correct else "incorrect").observe(duration_seconds)
+
+
+def time_random_task_selection():
+    """
+    Контекстный менеджер: замеряет выбор случайного задания.
+
+    Пример:
+        with time_random_task_selection():
+            task = tasks.order_by("?").first()
+    """
+    return RANDOM_TASK_SELECTION_DURATION.time()
+
+
+def record_cache_lookup(cache_name: str, *, hit: bool) -> None:
+    """
+    Пример:
+        record_cache_lookup("test_items", hit=items is not None)
+    """
+    CACHE_LOOKUPS.labels(cache_name, "hit" if hit else "miss").inc()
+
+
+def count_test_attempts(status: str, count: int = 1) -> None:
+    """
+    Пример:
+        count_test_attempts("started")
+        count_test_attempts("expired", count=12)
+    """
+    if count:
+        TEST_ATTEMPT_TRANSITIONS.labels(status).inc(count)
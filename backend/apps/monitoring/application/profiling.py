@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from apps.monitoring.application.metrics import observe_request
+from apps.monitoring.domain.histogram import LatencyHistogram
+
+DEFAULT_PROFILING = {
+    # Profiled URL prefixes; other requests pass through the middleware untouched.
+    "PATH_PREFIXES": ("/api/training/",),
+    # Emit the `Server-Timing` header (app, db) on profiled responses.
+    "SERVER_TIMING": True,
+    # Requests slower than this are logged.
+    "SLOW_REQUEST_MS": 500,
+    # Share of requests whose SQL text is captured for the slow log (0 — off, 1 — all).
+    "QUERY_SAMPLE_RATE": 0.0,
+    # Default per-request query budget (None — no budget) and per-route overrides.
+    "QUERY_BUDGET": None,
+    "ROUTE_QUERY_BUDGETS": {},
+}
+
+
+@dataclass
+class RouteStats:
+    """
+    Накопленные замеры по маршруту (в пределах процесса).
+    """
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    sql_queries: int = 0
+    sql_ms: float = 0.0
+    response_bytes: int = 0
+    budget_exceeded: int = 0
+
+
+# Per-process registry: (method, route) -> RouteStats.
+_route_stats: dict[tuple[str, str], RouteStats] = {}
+_route_stats_lock = threading.Lock()
+
+
+def get_profiling_settings() -> dict:
+    """
+    Настройки профилирования: `settings.PROFILING` поверх значений по умолчанию.
+
+    Пример:
+        get_profiling_settings()["SLOW_REQUEST_MS"] -> 500
+    """
+    return {**DEFAULT_PROFILING, **getattr(settings, "PROFILING", {})}
+
+
+def get_query_budget(route: str, *, config: dict) -> int | None:
+    """
+    Бюджет SQL-запросов для маршрута (переопределение маршрута важнее общего бюджета).
+
+    Пример:
+        get_query_budget("api/training/submit/", config=get_profiling_settings()) -> 12
+    """
+    return config["ROUTE_QUERY_BUDGETS"].get(route, config["QUERY_BUDGET"])
+
+
+def record_request(
+    *,
+    method: str,
+    route: str,
+    wall_ms: float,
+    sql_queries: int,
+    sql_ms: float,
+    response_bytes: int,
+    budget_exceeded: bool,
+) -> None:
+    """
+    Добавляет замер запроса в гистограмму маршрута (и в метрику Prometheus).
+
+    Пример:
+        record_request(method="POST", route="api/training/submit/", wall_ms=42.0, sql_queries=7,
+                       sql_ms=12.5, response_bytes=310, budget_exceeded=False)
+    """
+    key = (method, route)
+    with _route_stats_lock:
+        stats = _route_stats.get(key)
+        if stats is None:
+            stats = _route_stats[key] = RouteStats()
+        stats.latency.observe(wall_ms)
+        stats.sql_queries += sql_queries
+        stats.sql_ms += sql_ms
+        stats.response_bytes += response_bytes
+        stats.budget_exceeded += budget_exceeded
+    observe_request(method=method, route=route, duration_seconds=wall_ms / 1000)
+
+
+def get_route_stats() -> list[dict]:
+    """
+    Сводка по маршрутам текущего процесса: число запросов, квантили, средние SQL и размер ответа.
+
+    Пример:
+        get_route_stats()
+        # [{"method": "POST", "route": "api/training/submit/", "count": 120, "p50_ms": 25, ...}]
+    """
+    results = []
+    with _route_stats_lock:
+        for (method, route), stats in _route_stats.items():
+            count = stats.latency.count
+            results.append(
+                {
+                    "method": method,
+                    "route": route,
+                    "count": count,
+                    "avg_ms": round(stats.latency.total_ms / count, 2),
+                    "p50_ms": stats.latency.quantile(0.5),
+                    "p95_ms": stats.latency.quantile(0.95),
+                    "p99_ms": stats.latency.quantile(0.99),
+                    "avg_sql_queries": round(stats.sql_queries / count, 2),
+                    "avg_sql_ms": round(stats.sql_ms / count, 2),
+                    "avg_response_bytes": stats.response_bytes // count,
+                    "budget_exceeded": stats.budget_exceeded,
+                    "histogram": list(stats.latency.counts),
+                }
+            )
+    results.sort(key=lambda row: row["count"] * row["avg_ms"], reverse=True)
+    return results
+
+
+def reset_route_stats() -> None:
+    """
+    Очищает накопленные замеры процесса.
+
+    Пример:
+        reset_route_stats()
+    """
+    with _route_stats_lock:
+        _route_stats.clear()
@@ -0,0 +1,54 @@
+"""
+Гистограмма длительностей запросов (без Django).
+
+Фиксированные корзины сливаются и экспортируются без хранения отдельных замеров;
+квантили оцениваются с точностью до корзины.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+# Upper bounds (ms) of latency buckets; the last bucket is open-ended.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000)
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Счетчики по корзинам `LATENCY_BUCKETS_MS` плюс суммы для средних.
+
+    Пример:
+        histogram = LatencyHistogram()
+        histogram.observe(42.0)
+        histogram.quantile(0.95) -> 50
+    """
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+
+    def observe(self, duration_ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Верхняя граница корзины, в которую попадает квантиль `q` (None, если замеров нет).
+
+        Для открытой последней корзины возвращает последнюю конечную границу.
+
+        Пример:
+            histogram.quantile(0.5) -> 25
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return LATENCY_BUCKETS_MS[min(index, len(LATENCY_BUCKETS_MS) - 1)]
+        return LATENCY_BUCKETS_MS[-1]  # pragma: no cover
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from apps.monitoring.application.profiling import get_profiling_settings, get_query_budget, record_request
+
+logger = logging.getLogger("apps.monitoring.profiling")
+
+UNRESOLVED_ROUTE = "<unresolved>"
+
+
+class QueryRecorder:
+    """
+    `execute_wrapper` для всех соединений: считает запросы и время SQL, по запросу сохраняет текст.
+
+    Пример:
+        recorder = QueryRecorder(capture_sql=True)
+        with connection.execute_wrapper(recorder):
+            ...
+        recorder.count, recorder.duration_ms, recorder.queries
+    """
+
+    def __init__(self, *, capture_sql: bool = False):
+        self.capture_sql = capture_sql
+        self.count = 0
+        self.duration_ms = 0.0
+        self.queries: list[tuple[float, str]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.duration_ms += elapsed_ms
+            if self.capture_sql:
+                self.queries.append((elapsed_ms, sql))
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует запросы к `PROFILING["PATH_PREFIXES"]`: время ответа, число и время SQL, размер ответа.
+
+    - заголовок `Server-Timing: app;dur=…, db;dur=…;desc="N queries"`;
+    - гистограммы по маршруту (`resolver_match.route`) в памяти процесса;
+    - медленные запросы — в лог `apps.monitoring.profiling` (с текстом SQL для семплированных);
+    - превышение бюджета запросов — предупреждение в тот же лог.
+
+    Текст SQL сохраняется только для доли `QUERY_SAMPLE_RATE`; без семплирования на запрос
+    остаются счетчик и `perf_counter` на каждый SQL.
+
+    Работает и в async-цепочке (ASGI): иначе Django выполнял бы под ней каждый запрос в потоке.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_profiling_settings()
+        self.path_prefixes = tuple(self.config["PATH_PREFIXES"])
+        if not self.path_prefixes:
+            raise MiddlewareNotUsed
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith(self.path_prefixes):
+            return self.get_response(request)
+
+        recorder = self._new_recorder()
+        started = time.perf_counter()
+        with _record_queries(recorder):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        self._report(request, response, recorder=recorder, wall_ms=wall_ms)
+        return response
+
+    async def __acall__(self, request):
+        if not request.path.startswith(self.path_prefixes):
+            return await self.get_response(request)
+
+        recorder = self._new_recorder()
+        started = time.perf_counter()
+        # Async ORM and sync views run SQL in the request's thread-sensitive worker thread, on that thread's
+        # connections: the recorder is attached there, not in the event loop thread.
+        recording = await sync_to_async(_start_recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.close)()
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        self._report(request, response, recorder=recorder, wall_ms=wall_ms)
+        return response
+
+    def _new_recorder(self) -> QueryRecorder:
+        sample_rate = self.config["QUERY_SAMPLE_RATE"]
+        return QueryRecorder(capture_sql=sample_rate > 0 and random.random() < sample_rate)
+
+    def _report(self, request, response, *, recorder: QueryRecorder, wall_ms: float) -> None:
+        resolver_match = getattr(request, "resolver_match", None)
+        route = resolver_match.route if resolver_match is not None else UNRESOLVED_ROUTE
+        # Streaming bodies are not buffered; their size is unknown here.
+        response_bytes = 0 if response.streaming else len(response.content)
+
+        budget = get_query_budget(route, config=self.config)
+        budget_exceeded = budget is not None and recorder.count > budget
+        if budget_exceeded:
+            logger.warning(
+                "Query budget exceeded: %s %s — %d queries (budget %d).",
+                request.method,
+                route,
+                recorder.count,
+                budget,
+            )
+
+        if wall_ms >= self.config["SLOW_REQUEST_MS"]:
+            logger.warning(
+                "Slow request: %s %s — %.1f ms, %d queries, %.1f ms SQL, %d bytes.%s",
+                request.method,
+                request.get_full_path(),
+                wall_ms,
+                recorder.count,
+                recorder.duration_ms,
+                response_bytes,
+                "".join(f"\n  [{elapsed:.1f} ms] {sql}" for elapsed, sql in recorder.queries),
+            )
+
+        record_request(
+            method=request.method,
+            route=route,
+            wall_ms=wall_ms,
+            sql_queries=recorder.count,
+            sql_ms=recorder.duration_ms,
+            response_bytes=response_bytes,
+            budget_exceeded=budget_exceeded,
+        )
+
+        if self.config["SERVER_TIMING"]:
+            timing = f'app;dur={wall_ms:.1f}, db;dur={recorder.duration_ms:.1f};desc="{recorder.count} queries"'
+            existing = response.get("Server-Timing")
+            response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+
+def _record_queries(recorder: QueryRecorder) -> ExitStack:
+    """
+    Подключает `recorder` ко всем соединениям текущего потока до выхода из блока.
+
+    Пример:
+        with _record_queries(recorder):
+            response = get_response(request)
+    """
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(recorder))
+    return stack
+
+
+def _start_recording(recorder: QueryRecorder) -> ExitStack:
+    # Entered here, closed by a later call in the same thread.
+    with _record_queries(recorder) as stack:
+        return stack.pop_all()
@@ -1,7 +1,10 @@
 from django.urls import path
 
-from .views import TaskTypesView
+from .views import ExportTasksView, ImportTasksView, TaskStatsView, TaskTypesView
 
 urlpatterns = [
     path("task-types/", TaskTypesView.as_view()),
+    path("stats/", TaskStatsView.as_view()),
+    path("import/", ImportTasksView.as_view()),
+    path("export/", ExportTasksView.as_view()),
 ]
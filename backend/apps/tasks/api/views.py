@@ -1,8 +1,15 @@
-from rest_framework.permissions import IsAuthenticated
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.tasks.application.exports import iter_task_export, ndjson_streaming_response
+from apps.tasks.application.stats import TASK_STATS_ORDERINGS, list_task_stats
+from apps.tasks.application.task_import import import_tasks, iter_bundle_records
 from apps.tasks.domain.enums import TaskType
+from config.replica import ReplicaReadMixin, iter_on_read_alias
 
 
 class TaskTypesView(APIView):
@@ -25,3 +32,163 @@ class TaskTypesView(APIView):
                 ]
             }
         )
+
+
+class TaskStatsView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Статистика заданий (решаемость, число попыток, медиана времени) — только для staff.
+
+        Данные предрасчитаны (`refresh_task_stats`), агрегатов по ответам во время запроса нет.
+
+        Параметры:
+        - `subject_id`, `task_type` — фильтры;
+        - `min_solve_rate` / `max_solve_rate` (0..1) — фильтр по сложности;
+        - `min_attempts` — отсечь задания с малым числом попыток;
+        - `ordering` — `solve_rate`, `attempt_count`, `median_duration_ms` (с `-` — по убыванию);
+        - `limit` (до 100, по умолчанию 50), `offset`.
+
+        Пример запроса:
+            GET /api/tasks/stats/?subject_id=1&max_solve_rate=0.3&min_attempts=20&ordering=solve_rate
+
+        Пример ответа:
+            {
+              "results": [
+                {
+                  "task_id": 123,
+                  "subject_id": 1,
+                  "task_type": "number",
+                  "attempt_count": 540,
+                  "correct_count": 81,
+                  "solve_rate": 0.15,
+                  "median_duration_ms": 75000
+                }
+              ]
+            }
+        """
+        filters = {}
+        for name in ("subject_id", "min_attempts", "limit", "offset"):
+            value = request.query_params.get(name)
+            if value is not None:
+                try:
+                    filters[name] = int(value)
+                except (TypeError, ValueError):
+                    return Response({"error": f"{name} must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        for name in ("min_solve_rate", "max_solve_rate"):
+            value = request.query_params.get(name)
+            if value is not None:
+                try:
+                    filters[name] = float(value)
+                except (TypeError, ValueError):
+                    return Response({"error": f"{name} must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        task_type = request.query_params.get("task_type")
+        if task_type is not None:
+            filters["task_type"] = task_type
+
+        ordering = request.query_params.get("ordering", "solve_rate")
+        if ordering.lstrip("-") not in TASK_STATS_ORDERINGS:
+            return Response(
+                {"error": f"ordering must be one of: {', '.join(TASK_STATS_ORDERINGS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filters["limit"] = max(1, min(filters.get("limit", 50), 100))
+        filters["offset"] = max(0, filters.get("offset", 0))
+
+        rows = list_task_stats(ordering=ordering, **filters)
+        return Response(
+            {
+                "results": [
+                    {
+                        "task_id": row["task_id"],
+                        "subject_id": row["task__subject_id"],
+                        "task_type": row["task__task_type"],
+                        "attempt_count": row["attempt_count"],
+                        "correct_count": row["correct_count"],
+                        "solve_rate": row["solve_rate"],
+                        "median_duration_ms": row["median_duration_ms"],
+                    }
+                    for row in rows
+                ]
+            }
+        )
+
+
+class ImportTasksView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        """
+        Импортирует задания из загруженного JSONL или ZIP-бандла (поле `file`).
+
+        Для очень больших бандлов используйте команду `manage.py import_tasks`.
+
+        Пример запроса:
+            POST /api/tasks/import/  (multipart: file=tasks.jsonl, dry_run=1)
+
+        Пример ответа:
+            { "created": 120, "updated": 3, "failed": 1, "errors": ["tasks.jsonl:17: Unknown subject."] }
+        """
+        bundle = request.FILES.get("file")
+        if bundle is None:
+            return Response({"error": "file is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = import_tasks(
+            iter_bundle_records(bundle, name=bundle.name),
+            dry_run=request.data.get("dry_run") in ("1", "true"),
+        )
+        return Response(
+            {
+                "created": report.created,
+                "updated": report.updated,
+                "failed": report.failed,
+                "errors": report.errors,
+            }
+        )
+
+
+class ExportTasksView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Потоковая выгрузка заданий в NDJSON (только для staff).
+
+        Параметры: `subject_id`, `date_from` / `date_to` (YYYY-MM-DD, по `created_at`), `gzip=1`.
+        Формат строк совместим с импортом (`POST /api/tasks/import/`).
+
+        Пример запроса:
+            GET /api/tasks/export/?subject_id=1&date_from=2025-09-01&gzip=1
+
+        Пример строки ответа:
+            {"id": 123, "external_id": "ege-math-13-0001", "subject_id": 1, "task_type": "number", ..., "node_ids": [10]}
+        """
+        filters = {}
+        subject_id = request.query_params.get("subject_id")
+        if subject_id is not None:
+            try:
+                filters["subject_id"] = int(subject_id)
+            except (TypeError, ValueError):
+                return Response({"error": "subject_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        for name in ("date_from", "date_to"):
+            value = request.query_params.get(name)
+            if value is None:
+                continue
+            try:
+                filters[name] = parse_date(value)
+            except ValueError:
+                filters[name] = None
+            if filters[name] is None:
+                return Response({"error": f"{name} must be a date (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return ndjson_streaming_response(
+            iter_on_read_alias(iter_task_export(**filters)),
+            filename="tasks.ndjson",
+            compress=request.query_params.get("gzip") in ("1", "true"),
+        )
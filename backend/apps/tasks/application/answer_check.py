@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 
+from apps.monitoring.application.metrics import observe_answer_check
 from apps.tasks.domain.enums import TaskType
 
 
@@ -23,6 +25,7 @@ def check_task_answer(task, answer_payload: dict) -> CheckResult:
         # result.is_correct -> True/False
         # result.score -> Decimal("1")
     """
+    started = time.perf_counter()
     task_type = task.task_type
     answer_key = task.answer_key or {}
 
@@ -41,6 +44,7 @@ def check_task_answer(task, answer_payload: dict) -> CheckResult:
 
     max_score = Decimal(str(answer_key.get("max_score", 1)))
     score = max_score if is_correct else Decimal("0")
+    observe_answer_check(task_type=task_type, is_correct=is_correct, duration_seconds=time.perf_counter() - started)
 
     return CheckResult(
         is_correct=is_correct,
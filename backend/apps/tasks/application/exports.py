@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import zlib
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from apps.tasks.models import Task, TaskNode
+
+DEFAULT_EXPORT_BATCH_SIZE = 2000
+
+TASK_EXPORT_FIELDS = (
+    "id",
+    "external_id",
+    "subject_id",
+    "task_type",
+    "prompt",
+    "solution_text",
+    "type_payload",
+    "answer_key",
+    "exam_task_type_id",
+    "irt_difficulty",
+    "irt_discrimination",
+    "created_at",
+    "updated_at",
+)
+
+
+def iter_keyset(
+    queryset: QuerySet, *, fields: Iterable[str], batch_size: int = DEFAULT_EXPORT_BATCH_SIZE
+) -> Iterator[list[dict]]:
+    """
+    Обходит queryset пачками по возрастанию `id` (keyset: `id > last_id`), без OFFSET и без моделей.
+
+    В памяти держится только текущая пачка.
+
+    Пример:
+        for batch in iter_keyset(Task.objects.all(), fields=["id", "prompt"]):
+            ...
+    """
+    fields = list(fields)
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id).order_by("id").values(*fields)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]["id"]
+
+
+def iter_ndjson(batches: Iterable[list[dict]]) -> Iterator[bytes]:
+    """
+    Кодирует пачки строк в NDJSON (один кусок байтов на пачку).
+
+    Пример:
+        b"".join(iter_ndjson([[{"id": 1}]])) -> b'{"id": 1}\\n'
+    """
+    for batch in batches:
+        yield "".join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n" for row in batch).encode()
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Потоково сжимает куски в gzip (без буферизации всего файла).
+
+    Пример:
+        gzip.decompress(b"".join(iter_gzip([b"a", b"b"]))) -> b"ab"
+    """
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def ndjson_streaming_response(batches: Iterable[list[dict]], *, filename: str, compress: bool = False):
+    """
+    Отдает пачки как NDJSON-файл потоком (опционально gzip): ответ не собирается в памяти целиком.
+
+    Пример:
+        return ndjson_streaming_response(iter_task_export(), filename="tasks.ndjson", compress=True)
+    """
+    chunks = iter_ndjson(batches)
+    if compress:
+        chunks = iter_gzip(chunks)
+        filename += ".gz"
+    response = StreamingHttpResponse(chunks, content_type="application/gzip" if compress else "application/x-ndjson")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def date_range_filter(field_name: str, *, date_from: date | None = None, date_to: date | None = None) -> dict:
+    """
+    Фильтр по диапазону дат (обе границы включительно) в виде сравнений по datetime — чтобы работали индексы.
+
+    Пример:
+        TaskAttempt.objects.filter(**date_range_filter("submitted_at", date_from=date(2025, 9, 1)))
+    """
+    lookups = {}
+    if date_from is not None:
+        lookups[f"{field_name}__gte"] = timezone.make_aware(datetime.combine(date_from, time.min))
+    if date_to is not None:
+        lookups[f"{field_name}__lt"] = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+    return lookups
+
+
+def iter_task_export(
+    *,
+    subject_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+) -> Iterator[list[dict]]:
+    """
+    Пачки заданий для выгрузки (фильтры: предмет, дата создания).
+
+    Записи совместимы с форматом импорта (`task_import`): к каждой добавляется `node_ids`
+    (один запрос TaskNode на пачку).
+
+    Пример:
+        for chunk in iter_ndjson(iter_task_export(subject_id=1)):
+            out.write(chunk)
+    """
+    tasks = Task.objects.filter(**date_range_filter("created_at", date_from=date_from, date_to=date_to))
+    if subject_id is not None:
+        tasks = tasks.filter(subject_id=subject_id)
+
+    for batch in iter_keyset(tasks, fields=TASK_EXPORT_FIELDS, batch_size=batch_size):
+        node_ids: dict[int, list[int]] = {}
+        for task_id, node_id in (
+            TaskNode.objects.filter(task_id__in=[row["id"] for row in batch])
+            .order_by("task_id", "node_id")
+            .values_list("task_id", "node_id")
+        ):
+            node_ids.setdefault(task_id, []).append(node_id)
+        for row in batch:
+            row["node_ids"] = node_ids.get(row["id"], [])
+        yield batch
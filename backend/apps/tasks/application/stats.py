@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from apps.tasks.models import TaskStats
+
+TASK_STATS_ORDERINGS = ("solve_rate", "attempt_count", "median_duration_ms")
+
+
+def list_task_stats(
+    *,
+    subject_id: int | None = None,
+    task_type: str | None = None,
+    min_solve_rate: float | None = None,
+    max_solve_rate: float | None = None,
+    min_attempts: int | None = None,
+    ordering: str = "solve_rate",
+    limit: int = 50,
+    offset: int = 0,
+) -> list[dict]:
+    """
+    Статистика заданий из предрасчитанной TaskStats (без агрегатов по ответам).
+
+    `ordering` — одно из TASK_STATS_ORDERINGS, с `-` для убывания.
+
+    Пример:
+        list_task_stats(subject_id=1, max_solve_rate=0.3, min_attempts=20, ordering="solve_rate")
+    """
+    stats = TaskStats.objects.all()
+    if subject_id is not None:
+        stats = stats.filter(task__subject_id=subject_id)
+    if task_type is not None:
+        stats = stats.filter(task__task_type=task_type)
+    if min_solve_rate is not None:
+        stats = stats.filter(solve_rate__gte=min_solve_rate)
+    if max_solve_rate is not None:
+        stats = stats.filter(solve_rate__lte=max_solve_rate)
+    if min_attempts is not None:
+        stats = stats.filter(attempt_count__gte=min_attempts)
+
+    direction = "-" if ordering.startswith("-") else ""
+    return list(
+        stats.order_by(ordering, f"{direction}task_id").values(
+            "task_id",
+            "task__subject_id",
+            "task__task_type",
+            "attempt_count",
+            "correct_count",
+            "solve_rate",
+            "median_duration_ms",
+        )[offset : offset + limit]
+    )
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+from dataclasses import dataclass, field
+from typing import IO, Iterable, Iterator
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.exams.application.tree import bump_exam_tree_version
+from apps.exams.models import ExamTaskType
+from apps.graph.models import Node, Subject
+from apps.tasks.domain.answer_key import validate_answer_key
+from apps.tasks.infrastructure.signals import tasks_bulk_updated
+from apps.tasks.models import Task, TaskNode
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+# Fields overwritten when a record with a known external_id is imported again.
+UPDATABLE_FIELDS = (
+    "subject_id",
+    "task_type",
+    "prompt",
+    "solution_text",
+    "type_payload",
+    "answer_key",
+    "exam_task_type_id",
+    "irt_difficulty",
+    "irt_discrimination",
+    "updated_at",
+)
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def add_failure(self, location: str, messages: list[str]) -> None:
+        self.failed += 1
+        # Keep memory flat on huge broken bundles: only the first errors are reported.
+        for message in messages:
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append(f"{location}: {message}")
+
+
+@dataclass(frozen=True)
+class _Lookups:
+    """
+    Справочники, загруженные один раз на импорт (вместо запросов на каждую строку).
+    """
+
+    subject_ids: frozenset[int]
+    subject_ids_by_title: dict[str, int]
+    node_subject_ids: dict[int, int]
+    exam_task_type_ids: frozenset[int]
+
+
+@dataclass(frozen=True)
+class _Row:
+    external_id: str
+    fields: dict
+    node_ids: tuple[int, ...]
+
+
+def iter_bundle_records(file: IO[bytes], *, name: str = "") -> Iterator[tuple[str, dict | None, str | None]]:
+    """
+    Потоково читает бандл заданий: JSONL или ZIP с *.jsonl внутри.
+
+    Возвращает (location, record, error) — строки с невалидным JSON не прерывают чтение.
+
+    Пример:
+        with open("tasks.zip", "rb") as f:
+            for location, record, error in iter_bundle_records(f, name="tasks.zip"):
+                ...
+    """
+    if name.endswith(".zip") or zipfile.is_zipfile(file):
+        file.seek(0)
+        with zipfile.ZipFile(file) as archive:
+            for member in sorted(archive.namelist()):
+                if member.endswith(".jsonl"):
+                    with archive.open(member) as member_file:
+                        yield from _iter_jsonl(member_file, name=member)
+        return
+
+    file.seek(0)
+    yield from _iter_jsonl(file, name=name or "<stream>")
+
+
+def import_tasks(
+    records: Iterable[tuple[str, dict | None, str | None]],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> ImportReport:
+    """
+    Импортирует задания пачками: валидация → bulk_create / bulk_update в транзакции на пачку.
+
+    - повторный импорт идемпотентен: записи сопоставляются по `external_id`;
+    - предметы, вершины графа и рубрикатор резолвятся по справочникам в памяти;
+    - в памяти держится только текущая пачка.
+
+    Формат записи:
+        {
+          "external_id": "ege-math-13-0001",
+          "subject": "Математика",            # или "subject_id": 1
+          "task_type": "number",
+          "prompt": "...",
+          "solution_text": "...",
+          "type_payload": {},
+          "answer_key": {"correct": [3.14], "tolerance": 0.01},
+          "exam_task_type_id": 7,             # опционально
+          "node_ids": [10, 11]                # опционально
+        }
+
+    Пример:
+        with open("tasks.jsonl", "rb") as f:
+            report = import_tasks(iter_bundle_records(f, name="tasks.jsonl"))
+    """
+    lookups = _load_lookups()
+    report = ImportReport()
+
+    chunk: list[tuple[str, dict]] = []
+    for location, record, error in records:
+        if error is not None:
+            report.add_failure(location, [error])
+            continue
+        chunk.append((location, record))
+        if len(chunk) >= chunk_size:
+            _import_chunk(chunk, lookups=lookups, report=report, dry_run=dry_run)
+            chunk = []
+    if chunk:
+        _import_chunk(chunk, lookups=lookups, report=report, dry_run=dry_run)
+
+    if not dry_run and (report.created or report.updated):
+        # bulk_create/bulk_update do not send model signals.
+        bump_exam_tree_version()
+
+    return report
+
+
+def _iter_jsonl(file: IO[bytes], *, name: str) -> Iterator[tuple[str, dict | None, str | None]]:
+    for line_no, line in enumerate(io.TextIOWrapper(file, encoding="utf-8"), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        location = f"{name}:{line_no}"
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield location, None, f"Invalid JSON: {exc.msg}."
+            continue
+        if not isinstance(record, dict):
+            yield location, None, "Record must be an object."
+            continue
+        yield location, record, None
+
+
+def _load_lookups() -> _Lookups:
+    subjects = list(Subject.objects.values_list("id", "title"))
+    return _Lookups(
+        subject_ids=frozenset(subject_id for subject_id, _ in subjects),
+        subject_ids_by_title={title: subject_id for subject_id, title in subjects},
+        node_subject_ids=dict(Node.objects.values_list("id", "subject_id")),
+        exam_task_type_ids=frozenset(ExamTaskType.objects.values_list("id", flat=True)),
+    )
+
+
+def _parse_record(record: dict, *, lookups: _Lookups) -> tuple[_Row | None, list[str]]:
+    """
+    Валидирует запись и резолвит ссылки по справочникам.
+
+    Пример:
+        row, errors = _parse_record({"external_id": "x", ...}, lookups=lookups)
+    """
+    errors = []
+
+    external_id = record.get("external_id")
+    if not isinstance(external_id, str) or not external_id.strip():
+        errors.append("external_id is required.")
+
+    subject_id = record.get("subject_id")
+    if subject_id is None and record.get("subject") is not None:
+        subject_id = lookups.subject_ids_by_title.get(record["subject"])
+    if subject_id not in lookups.subject_ids:
+        errors.append("Unknown subject.")
+
+    task_type = record.get("task_type")
+    answer_key = record.get("answer_key", {})
+    errors.extend(validate_answer_key(task_type, answer_key))
+
+    prompt = record.get("prompt")
+    if not isinstance(prompt, str) or not prompt.strip():
+        errors.append("prompt is required.")
+
+    type_payload = record.get("type_payload", {})
+    if not isinstance(type_payload, dict):
+        errors.append("type_payload must be an object.")
+
+    exam_task_type_id = record.get("exam_task_type_id")
+    if exam_task_type_id is not None and exam_task_type_id not in lookups.exam_task_type_ids:
+        errors.append(f"Unknown exam_task_type_id: {exam_task_type_id}.")
+
+    node_ids = record.get("node_ids") or []
+    if not isinstance(node_ids, list):
+        errors.append("node_ids must be a list.")
+        node_ids = []
+    for node_id in node_ids:
+        if lookups.node_subject_ids.get(node_id) is None:
+            errors.append(f"Unknown node_id: {node_id}.")
+        elif lookups.node_subject_ids[node_id] != subject_id:
+            errors.append(f"Node {node_id} belongs to another subject.")
+
+    if errors:
+        return None, errors
+
+    return (
+        _Row(
+            external_id=external_id.strip(),
+            fields={
+                "subject_id": subject_id,
+                "task_type": task_type,
+                "prompt": prompt,
+                "solution_text": record.get("solution_text") or "",
+                "type_payload": type_payload,
+                "answer_key": answer_key,
+                "exam_task_type_id": exam_task_type_id,
+                "irt_difficulty": float(record.get("irt_difficulty", 0.0)),
+                "irt_discrimination": float(record.get("irt_discrimination", 1.0)),
+            },
+            node_ids=tuple(dict.fromkeys(node_ids)),
+        ),
+        [],
+    )
+
+
+def _import_chunk(chunk: list[tuple[str, dict]], *, lookups: _Lookups, report: ImportReport, dry_run: bool) -> None:
+    rows: dict[str, _Row] = {}
+    for location, record in chunk:
+        try:
+            row, errors = _parse_record(record, lookups=lookups)
+        except (TypeError, ValueError) as exc:
+            row, errors = None, [str(exc)]
+        if row is None:
+            report.add_failure(location, errors)
+            continue
+        # The last record wins when an external_id repeats inside a chunk.
+        rows[row.external_id] = row
+
+    if not rows:
+        return
+
+    existing_ids = dict(Task.objects.filter(external_id__in=list(rows)).values_list("external_id", "id"))
+    new_rows = [row for external_id, row in rows.items() if external_id not in existing_ids]
+    updated_rows = [row for external_id, row in rows.items() if external_id in existing_ids]
+
+    if not dry_run:
+        now = timezone.now()
+        with transaction.atomic():
+            created_tasks = Task.objects.bulk_create(
+                [Task(external_id=row.external_id, **row.fields) for row in new_rows]
+            )
+            Task.objects.bulk_update(
+                [
+                    Task(id=existing_ids[row.external_id], updated_at=now, **row.fields)
+                    for row in updated_rows
+                ],
+                fields=list(UPDATABLE_FIELDS),
+            )
+
+            task_ids = {task.external_id: task.id for task in created_tasks}
+            task_ids.update(existing_ids)
+            TaskNode.objects.filter(task_id__in=[existing_ids[row.external_id] for row in updated_rows]).delete()
+            TaskNode.objects.bulk_create(
+                [
+                    TaskNode(task_id=task_ids[row.external_id], node_id=node_id)
+                    for row in rows.values()
+                    for node_id in row.node_ids
+                ],
+                ignore_conflicts=True,
+            )
+
+        if updated_rows:
+            tasks_bulk_updated.send(
+                sender=Task,
+                task_ids=[existing_ids[row.external_id] for row in updated_rows],
+            )
+
+    report.created += len(new_rows)
+    report.updated += len(updated_rows)
+
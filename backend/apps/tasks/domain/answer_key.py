@@ -0,0 +1,76 @@
+"""
+Схемы `answer_key` по типам заданий (без Django).
+
+Форматы совпадают с тем, что понимает `apps.tasks.application.answer_check`.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation
+
+from apps.tasks.domain.enums import TaskType
+
+
+def validate_answer_key(task_type: str, answer_key) -> list[str]:
+    """
+    Проверяет `answer_key` для типа задания и возвращает список ошибок (пустой — если все в порядке).
+
+    Пример:
+        validate_answer_key("number", {"correct": [3.14], "tolerance": 0.01}) -> []
+        validate_answer_key("match", {"correct": ["A"]}) -> ["answer_key.correct must be a non-empty object."]
+    """
+    try:
+        task_type = TaskType(task_type)
+    except ValueError:
+        return [f"Unknown task_type: {task_type!r}."]
+
+    if not isinstance(answer_key, dict):
+        return ["answer_key must be an object."]
+
+    errors = []
+    correct = answer_key.get("correct")
+
+    if task_type == TaskType.SHORT_TEXT:
+        values = [correct] if isinstance(correct, str) else correct
+        if not isinstance(values, list) or not values or not all(isinstance(v, str) for v in values):
+            errors.append("answer_key.correct must be a string or a non-empty list of strings.")
+    elif task_type == TaskType.NUMBER:
+        values = correct if isinstance(correct, list) else [correct]
+        if not values or not all(_is_number(v) for v in values):
+            errors.append("answer_key.correct must be a number or a non-empty list of numbers.")
+        if "tolerance" in answer_key and not _is_number(answer_key["tolerance"], min_value=0):
+            errors.append("answer_key.tolerance must be a non-negative number.")
+    elif task_type == TaskType.SINGLE_CHOICE:
+        if not isinstance(correct, (str, int)) or isinstance(correct, bool):
+            errors.append("answer_key.correct must be a string or an integer.")
+    elif task_type == TaskType.MULTI_CHOICE:
+        if not isinstance(correct, list) or not correct:
+            errors.append("answer_key.correct must be a non-empty list.")
+    elif task_type == TaskType.MATCH:
+        if not isinstance(correct, dict) or not correct:
+            errors.append("answer_key.correct must be a non-empty object.")
+
+    if "max_score" in answer_key and not _is_number(answer_key["max_score"], min_value=0):
+        errors.append("answer_key.max_score must be a non-negative number.")
+
+    return errors
+
+
+def _is_number(value, *, min_value: int | None = None) -> bool:
+    """
+    Число (или строка с числом, в том числе с запятой) не меньше `min_value`.
+
+    Пример:
+        _is_number("3,14") -> True
+    """
+    if value is None or isinstance(value, bool):
+        return False
+    if isinstance(value, str):
+        value = value.replace(",", ".").strip()
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return False
+    if not number.is_finite():
+        return False
+    return min_value is None or number >= min_value
@@ -0,0 +1,64 @@
+"""
+Гистограмма времени решения для инкрементальной статистики заданий (без Django).
+
+Медиана по точным значениям требует хранить все длительности; гистограмма с логарифмическими
+корзинами сливается инкрементально и дает медиану с точностью до корзины.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+
+# Upper bounds (ms) of duration buckets; the last bucket is open-ended.
+DURATION_BUCKETS_MS = (
+    1_000,
+    2_000,
+    5_000,
+    10_000,
+    15_000,
+    20_000,
+    30_000,
+    45_000,
+    60_000,
+    90_000,
+    120_000,
+    180_000,
+    300_000,
+    600_000,
+    1_200_000,
+)
+
+
+def empty_histogram() -> list[int]:
+    return [0] * (len(DURATION_BUCKETS_MS) + 1)
+
+
+def duration_bucket(duration_ms: int) -> int:
+    """
+    Индекс корзины для длительности.
+
+    Пример:
+        duration_bucket(1_500) -> 1
+    """
+    return bisect_right(DURATION_BUCKETS_MS, duration_ms - 1) if duration_ms > 0 else 0
+
+
+def histogram_median(histogram: list[int]) -> int | None:
+    """
+    Медиана по гистограмме: середина корзины, в которую попадает медиана (None, если данных нет).
+
+    Пример:
+        histogram_median([0, 3, 1] + [0] * 13) -> 1500
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen * 2 >= total:
+            lower = DURATION_BUCKETS_MS[index - 1] if index > 0 else 0
+            upper = DURATION_BUCKETS_MS[index] if index < len(DURATION_BUCKETS_MS) else lower
+            return (lower + upper) // 2
+    return None  # pragma: no cover
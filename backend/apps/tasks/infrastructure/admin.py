@@ -2,6 +2,28 @@ from django.contrib import admin
 
 from apps.tasks.models import Task, TaskNode
 
+# Solve-rate bands for the admin difficulty filter: value -> (label, lookups).
+DIFFICULTY_BANDS = {
+    "easy": ("Легкие (≥ 70%)", {"stats__solve_rate__gte": 0.7}),
+    "medium": ("Средние (30–70%)", {"stats__solve_rate__gte": 0.3, "stats__solve_rate__lt": 0.7}),
+    "hard": ("Сложные (< 30%)", {"stats__solve_rate__lt": 0.3}),
+    "unknown": ("Нет данных", {"stats__solve_rate__isnull": True}),
+}
+
+
+class DifficultyFilter(admin.SimpleListFilter):
+    title = "сложность"
+    parameter_name = "difficulty"
+
+    def lookups(self, request, model_admin):
+        return [(value, label) for value, (label, _) in DIFFICULTY_BANDS.items()]
+
+    def queryset(self, request, queryset):
+        band = DIFFICULTY_BANDS.get(self.value())
+        if band is None:
+            return queryset
+        return queryset.filter(**band[1])
+
 
 class TaskNodeInline(admin.TabularInline):
     model = TaskNode
@@ -11,10 +33,44 @@ class TaskNodeInline(admin.TabularInline):
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
-    list_display = ("id", "subject", "task_type", "exam_task_type", "created_at", "updated_at")
-    list_filter = ("subject", "task_type")
-    search_fields = ("prompt", "solution_text")
+    list_display = (
+        "id",
+        "subject",
+        "task_type",
+        "exam_task_type",
+        "attempt_count",
+        "solve_rate",
+        "median_duration_ms",
+        "created_at",
+        "updated_at",
+    )
+    list_filter = ("subject", "task_type", DifficultyFilter)
+    list_select_related = (
+        "subject",
+        "exam_task_type__exam_task_group__exam_type__exam",
+        "exam_task_type__exam_task_group__exam_type__subject",
+        "stats",
+    )
+    search_fields = ("external_id", "prompt", "solution_text")
     ordering = ("-id",)
     inlines = (TaskNodeInline,)
 
+    # Stats come from TaskStats (refresh_task_stats), never from aggregates over TaskAttempt.
+    @admin.display(description="Попыток", ordering="stats__attempt_count")
+    def attempt_count(self, obj):
+        stats = getattr(obj, "stats", None)
+        return stats.attempt_count if stats else 0
+
+    @admin.display(description="Решаемость", ordering="stats__solve_rate")
+    def solve_rate(self, obj):
+        stats = getattr(obj, "stats", None)
+        if stats is None or stats.solve_rate is None:
+            return "—"
+        return f"{stats.solve_rate:.0%}"
+
+    @admin.display(description="Медиана, мс", ordering="stats__median_duration_ms")
+    def median_duration_ms(self, obj):
+        stats = getattr(obj, "stats", None)
+        return stats.median_duration_ms if stats and stats.median_duration_ms is not None else "—"
+
     # TaskNode is intentionally not registered as a standalone model in admin.
@@ -56,6 +56,9 @@ class Task(models.Model):
         )
     """
 
+    # Stable ID from the source bundle: makes bulk imports idempotent.
+    external_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
+
     subject = models.ForeignKey("graph.Subject", on_delete=models.PROTECT, related_name="tasks")
     task_type = models.CharField(
         max_length=64,
@@ -79,6 +82,10 @@ class Task(models.Model):
         related_name="tasks",
     )
 
+    # IRT (2PL) calibration used by adaptive diagnostics.
+    irt_difficulty = models.FloatField(default=0.0)
+    irt_discrimination = models.FloatField(default=1.0)
+
     # Educational graph mapping.
     nodes = models.ManyToManyField(
         "graph.Node",
@@ -99,3 +106,41 @@ class Task(models.Model):
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.subject.title} / {self.task_type} / {self.id}"
+
+
+class TaskStats(models.Model):
+    """
+    Предрасчитанная статистика задания по ответам (`training.TaskAttempt`).
+
+    Зачем:
+    - админка и API показывают решаемость/время без агрегатов по TaskAttempt во время запроса;
+    - обновляется периодической инкрементальной задачей (`refresh_task_stats`), которая
+      обрабатывает только ответы новее своего high-water mark.
+
+    Пример:
+        Task.objects.select_related("stats").filter(stats__solve_rate__lt=0.3)
+    """
+
+    task = models.OneToOneField("tasks.Task", on_delete=models.CASCADE, primary_key=True, related_name="stats")
+
+    attempt_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    # correct_count / attempt_count (null while there are no attempts).
+    solve_rate = models.FloatField(null=True, blank=True)
+
+    # Counts per bucket of tasks.domain.stats.DURATION_BUCKETS_MS; the median is derived from it.
+    duration_histogram = models.JSONField(default=list, blank=True)
+    median_duration_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Статистика задания"
+        verbose_name_plural = "Статистика заданий"
+        indexes = [
+            models.Index(fields=["solve_rate"]),
+            models.Index(fields=["attempt_count"]),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Stats {self.task_id}: {self.correct_count}/{self.attempt_count}"
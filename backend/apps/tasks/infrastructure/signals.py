@@ -0,0 +1,10 @@
+"""
+Сигналы банка заданий.
+
+`tasks_bulk_updated` отправляется после массового обновления заданий (bulk_update не шлет post_save).
+Аргументы: `task_ids` — id обновленных заданий.
+"""
+
+from django.dispatch import Signal
+
+tasks_bulk_updated = Signal()
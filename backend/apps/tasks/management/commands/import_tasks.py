@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.application.task_import import DEFAULT_CHUNK_SIZE, import_tasks, iter_bundle_records
+
+
+class Command(BaseCommand):
+    help = "Импортирует задания из JSONL или ZIP-бандла (идемпотентно по external_id)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, do not write.")
+
+    def handle(self, *args, **options):
+        try:
+            bundle = open(options["path"], "rb")
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        with bundle:
+            report = import_tasks(
+                iter_bundle_records(bundle, name=options["path"]),
+                chunk_size=options["chunk_size"],
+                dry_run=options["dry_run"],
+            )
+
+        for error in report.errors:
+            self.stderr.write(error)
+        self.stdout.write(f"Created: {report.created}, updated: {report.updated}, failed: {report.failed}.")
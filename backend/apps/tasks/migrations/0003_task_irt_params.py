@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_tasknode_alter_task_nodes_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'verbose_name': 'Задание', 'verbose_name_plural': 'Задания'},
+        ),
+        migrations.AlterModelOptions(
+            name='tasknode',
+            options={'verbose_name': 'Связь: задание — вершина графа', 'verbose_name_plural': 'Связи: задания — вершины графа'},
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='irt_difficulty',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='irt_discrimination',
+            field=models.FloatField(default=1.0),
+        ),
+    ]
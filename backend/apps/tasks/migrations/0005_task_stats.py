@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStats',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='tasks.task')),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('correct_count', models.PositiveIntegerField(default=0)),
+                ('solve_rate', models.FloatField(blank=True, null=True)),
+                ('duration_histogram', models.JSONField(blank=True, default=list)),
+                ('median_duration_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Статистика задания',
+                'verbose_name_plural': 'Статистика заданий',
+                'indexes': [models.Index(fields=['solve_rate'], name='tasks_tasks_solve_r_16b171_idx'), models.Index(fields=['attempt_count'], name='tasks_tasks_attempt_980c30_idx')],
+            },
+        ),
+    ]
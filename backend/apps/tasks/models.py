@@ -4,6 +4,6 @@ Infrastructure layer: Django ORM models live in apps.tasks.infrastructure.models
 This module re-exports them so Django can auto-discover models via apps.tasks.
 """
 
-from .infrastructure.models import Task, TaskNode
+from .infrastructure.models import Task, TaskNode, TaskStats
 
-__all__ = ["Task", "TaskNode"]
+__all__ = ["Task", "TaskNode", "TaskStats"]
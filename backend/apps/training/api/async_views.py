@@ -0,0 +1,261 @@
+"""
+Async-варианты горячих эндпоинтов тренажера (`/api/training/async/...`) для запуска под ASGI (`config.asgi`).
+
+Контракт (параметры, ответы, ошибки) — тот же, что у одноименных views в `views`. DRF `APIView` синхронный,
+поэтому здесь — Django `View` с async-обработчиками и своим минимальным слоем API: JWT-аутентификация
+(`AsyncAPIView`), JSON-тело запроса, JSON-ответ.
+"""
+
+from __future__ import annotations
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, ParseError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.training.api.payloads import (
+    finished_session_payload,
+    random_task_payload,
+    submitted_attempt_payload,
+    test_attempt_summary_payload,
+    test_attempt_totals,
+)
+from apps.training.application.exceptions import InvalidTestAttempt, RandomTaskNotFound
+from apps.training.application.score_histogram import get_score_percentile
+from apps.training.application.use_cases import (
+    afinish_random_session,
+    aget_random_task_for_session,
+    asubmit_task_answer,
+)
+from apps.training.models import TaskAttemptHistory, TestAttempt
+from config.replica import AsyncReplicaReadMixin, apin_to_primary
+
+
+def json_response(data, *, status: int = status.HTTP_200_OK) -> JsonResponse:
+    return JsonResponse(data, status=status, safe=False, json_dumps_params={"ensure_ascii": False})
+
+
+class AsyncAPIView(View):
+    """
+    Основа async-эндпоинтов: только для авторизованных, аутентификация — DRF `JWTAuthentication`
+    (те же токены и те же ответы 401), тело запроса — JSON в `request.data`.
+
+    Проверка токена читает пользователя sync ORM, поэтому выполняется через `sync_to_async`.
+
+    Пример:
+        class PingView(AsyncAPIView):
+            async def get(self, request):
+                return json_response({"user_id": request.user.id})
+    """
+
+    authentication = JWTAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Bearer tokens, not cookies: no CSRF, as with DRF APIView.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.initial(request)
+        except APIException as exc:
+            return self._api_exception_response(request, exc)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def initial(self, request):
+        authenticated = await sync_to_async(self.authentication.authenticate)(request)
+        if authenticated is None:
+            raise NotAuthenticated()
+        request.user, request.auth = authenticated
+        request.data = _parse_json_body(request)
+
+    def _api_exception_response(self, request, exc: APIException) -> JsonResponse:
+        # Same body and headers as DRF's exception handler.
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = json_response(data, status=exc.status_code)
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response["WWW-Authenticate"] = self.authentication.authenticate_header(request)
+        return response
+
+
+class RandomTaskView(AsyncAPIView):
+    async def get(self, request):
+        """
+        Async-вариант `views.RandomTaskView`.
+
+        Пример запроса:
+            GET /api/training/async/random-task/?subject_id=1&task_type=short_text
+        """
+        subject_id = request.GET.get("subject_id")
+        task_type = request.GET.get("task_type")
+        test_attempt_id = request.GET.get("test_attempt_id")
+
+        if subject_id is not None:
+            try:
+                subject_id = int(subject_id)
+            except (TypeError, ValueError):
+                return json_response({"error": "subject_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            if test_attempt_id is not None:
+                test_attempt_id = int(test_attempt_id)
+            task, test_attempt = await aget_random_task_for_session(
+                user=request.user,
+                subject_id=subject_id,
+                task_type=task_type,
+                test_attempt_id=test_attempt_id,
+            )
+        except RandomTaskNotFound:
+            return json_response({"error": "No tasks available."}, status=status.HTTP_404_NOT_FOUND)
+        except (TypeError, ValueError):
+            return json_response({"error": "test_attempt_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        except InvalidTestAttempt:
+            return json_response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        await apin_to_primary(request.user.id)
+        return json_response(random_task_payload(task, test_attempt))
+
+
+class SubmitAnswerView(AsyncAPIView):
+    async def post(self, request):
+        """
+        Async-вариант `views.SubmitAnswerView`: проверка ответа — вне event loop, запись — одним sync-вызовом.
+
+        Пример запроса:
+            POST /api/training/async/submit-answer/
+            {"task_id": 123, "answer_payload": {"value": "масса"}, "test_attempt_id": 555}
+        """
+        task_id = request.data.get("task_id")
+        answer_payload = request.data.get("answer_payload") or {}
+        duration_ms = request.data.get("duration_ms")
+        test_attempt_id = request.data.get("test_attempt_id")
+
+        if task_id is None:
+            return json_response({"error": "task_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            task_id = int(task_id)
+        except (TypeError, ValueError):
+            return json_response({"error": "task_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if duration_ms is not None:
+            try:
+                duration_ms = int(duration_ms)
+            except (TypeError, ValueError):
+                return json_response({"error": "duration_ms must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if test_attempt_id is not None:
+            try:
+                test_attempt_id = int(test_attempt_id)
+            except (TypeError, ValueError):
+                return json_response(
+                    {"error": "test_attempt_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+        try:
+            attempt = await asubmit_task_answer(
+                user=request.user,
+                task_id=task_id,
+                answer_payload=answer_payload,
+                duration_ms=duration_ms,
+                test_attempt_id=test_attempt_id,
+            )
+        except RandomTaskNotFound:
+            return json_response({"error": "Task not found."}, status=status.HTTP_404_NOT_FOUND)
+        except InvalidTestAttempt:
+            return json_response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        await apin_to_primary(request.user.id)
+        return json_response(submitted_attempt_payload(attempt))
+
+
+class FinishRandomSessionView(AsyncAPIView):
+    async def post(self, request):
+        """
+        Async-вариант `views.FinishRandomSessionView`.
+
+        Пример запроса:
+            POST /api/training/async/random-session/finish/
+            { "test_attempt_id": 555, "status": "finished" }
+        """
+        test_attempt_id = request.data.get("test_attempt_id")
+        status_value = request.data.get("status")
+
+        if test_attempt_id is None:
+            return json_response({"error": "test_attempt_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            test_attempt_id = int(test_attempt_id)
+        except (TypeError, ValueError):
+            return json_response({"error": "test_attempt_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            attempt = await afinish_random_session(
+                user=request.user,
+                test_attempt_id=test_attempt_id,
+                status=status_value,
+            )
+        except InvalidTestAttempt:
+            return json_response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        await apin_to_primary(request.user.id)
+        return json_response(finished_session_payload(attempt))
+
+
+class TestAttemptSummaryView(AsyncReplicaReadMixin, AsyncAPIView):
+    async def get(self, request):
+        """
+        Async-вариант `views.TestAttemptSummaryView` (те же запросы через async ORM).
+
+        Пример запроса:
+            GET /api/training/async/test-attempt/summary/?test_attempt_id=555
+        """
+        test_attempt_id = request.GET.get("test_attempt_id")
+        if test_attempt_id is None:
+            return json_response({"error": "test_attempt_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            test_attempt_id = int(test_attempt_id)
+        except (TypeError, ValueError):
+            return json_response({"error": "test_attempt_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        attempt = await (
+            TestAttempt.objects.select_related("test")
+            .filter(id=test_attempt_id, user=request.user)
+            .afirst()
+        )
+        if attempt is None:
+            return json_response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Old attempts may already be archived: read the whole history.
+        task_attempts = (
+            TaskAttemptHistory.objects.filter(test_attempt=attempt)
+            .select_related("task")
+            .order_by("submitted_at")
+        )
+
+        return json_response(
+            test_attempt_summary_payload(
+                attempt,
+                totals=await task_attempts.aaggregate(**test_attempt_totals()),
+                percentile=await sync_to_async(get_score_percentile)(attempt),
+                items=[item async for item in task_attempts],
+            )
+        )
+
+
+def _parse_json_body(request) -> dict:
+    if not request.body:
+        return {}
+    try:
+        data = json.loads(request.body)
+    except ValueError as exc:
+        raise ParseError(f"JSON parse error - {exc}") from None
+    if not isinstance(data, dict):
+        raise ParseError("JSON body must be an object.")
+    return data
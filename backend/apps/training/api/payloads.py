@@ -0,0 +1,86 @@
+"""
+Тела ответов тренажера, общие для sync (`views`) и async (`async_views`) эндпоинтов.
+"""
+
+from __future__ import annotations
+
+from django.db.models import DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def random_task_payload(task, test_attempt) -> dict:
+    return {
+        "id": task.id,
+        "subject_id": task.subject_id,
+        "task_type": task.task_type,
+        "prompt": task.prompt,
+        "type_payload": task.type_payload,
+        "test_attempt_id": test_attempt.id,
+    }
+
+
+def submitted_attempt_payload(attempt) -> dict:
+    return {
+        "attempt_id": attempt.id,
+        "task_id": attempt.task_id,
+        "is_correct": attempt.is_correct,
+        "score": str(attempt.score),
+        "max_score": str(attempt.applied_max_score or 0),
+        "submitted_at": attempt.submitted_at.isoformat(),
+        "solution_text": attempt.task.solution_text,
+        "answer_key": attempt.task.answer_key,
+    }
+
+
+def finished_session_payload(attempt) -> dict:
+    return {
+        "test_attempt_id": attempt.id,
+        "status": attempt.status,
+        "finished_at": attempt.finished_at.isoformat() if attempt.finished_at else None,
+    }
+
+
+def test_attempt_totals() -> dict:
+    """
+    Агрегаты сводки по ответам попытки (`.aggregate(**test_attempt_totals())`).
+    """
+    return {
+        "total_score": Coalesce(
+            Sum("score"),
+            Value(0),
+            output_field=DecimalField(max_digits=8, decimal_places=2),
+        ),
+        "max_score": Coalesce(
+            Sum(Coalesce("applied_max_score", Value(0))),
+            Value(0),
+            output_field=DecimalField(max_digits=8, decimal_places=2),
+        ),
+    }
+
+
+def test_attempt_summary_payload(attempt, *, totals: dict, percentile: float | None, items) -> dict:
+    return {
+        "test_attempt_id": attempt.id,
+        "status": attempt.status,
+        "started_at": attempt.started_at.isoformat(),
+        "finished_at": attempt.finished_at.isoformat() if attempt.finished_at else None,
+        "total_score": str(totals["total_score"]),
+        "max_score": str(totals["max_score"]),
+        "percentile": percentile,
+        "items": [
+            {
+                "attempt_id": item.id,
+                "task_id": item.task_id,
+                "task_type": item.task.task_type,
+                "prompt": item.task.prompt,
+                "answer_payload": item.answer_payload,
+                "answer_key": item.task.answer_key,
+                "is_correct": item.is_correct,
+                "score": str(item.score),
+                "max_score": str(item.applied_max_score or 0),
+                "submitted_at": item.submitted_at.isoformat(),
+                "solution_text": item.task.solution_text,
+            }
+            for item in items
+        ],
+    }
@@ -1,10 +1,47 @@
 from django.urls import path
 
-from .views import RandomTaskView, SubmitAnswerView, FinishRandomSessionView, TestAttemptSummaryView
+from . import async_views
+from .views import (
+    RandomTaskView,
+    SubmitAnswerView,
+    FinishRandomSessionView,
+    TestAttemptSummaryView,
+    DiagnosticStartView,
+    DiagnosticNextTaskView,
+    ReviewQueueView,
+    ClaimExamVariantView,
+    StartTestAttemptView,
+    NextTestItemView,
+    FinishTestAttemptView,
+    ExportAttemptsView,
+    UsageDashboardView,
+    UserProgressView,
+    ChildrenProgressView,
+    LeaderboardView,
+    ClassReportView,
+)
 
 urlpatterns = [
     path("random-task/", RandomTaskView.as_view()),
     path("submit-answer/", SubmitAnswerView.as_view()),
     path("random-session/finish/", FinishRandomSessionView.as_view()),
     path("test-attempt/summary/", TestAttemptSummaryView.as_view()),
+    path("test-attempt/start/", StartTestAttemptView.as_view()),
+    path("test-attempt/next-item/", NextTestItemView.as_view()),
+    path("test-attempt/finish/", FinishTestAttemptView.as_view()),
+    path("diagnostic/start/", DiagnosticStartView.as_view()),
+    path("diagnostic/next-task/", DiagnosticNextTaskView.as_view()),
+    path("review-queue/", ReviewQueueView.as_view()),
+    path("exam-variants/claim/", ClaimExamVariantView.as_view()),
+    path("attempts/export/", ExportAttemptsView.as_view()),
+    path("dashboard/", UsageDashboardView.as_view()),
+    path("progress/", UserProgressView.as_view()),
+    path("children-progress/", ChildrenProgressView.as_view()),
+    path("leaderboard/", LeaderboardView.as_view()),
+    path("class-report/", ClassReportView.as_view()),
+    # Async variants for ASGI deployments (same contract as above).
+    path("async/random-task/", async_views.RandomTaskView.as_view()),
+    path("async/submit-answer/", async_views.SubmitAnswerView.as_view()),
+    path("async/random-session/finish/", async_views.FinishRandomSessionView.as_view()),
+    path("async/test-attempt/summary/", async_views.TestAttemptSummaryView.as_view()),
 ]
@@ -1,19 +1,45 @@
-from rest_framework.permissions import IsAuthenticated
+from datetime import timedelta
+
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
-from django.db.models import DecimalField, Sum, Value
-from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
+from apps.tasks.application.exports import ndjson_streaming_response
 from apps.training.application.use_cases import (
     get_random_task_for_session,
     submit_task_answer,
     finish_random_session,
-    close_last_random_session,
     RandomTaskNotFound,
     InvalidTestAttempt,
 )
-from apps.training.models import TestAttempt
+from apps.training.application.diagnostic import get_next_diagnostic_task, start_diagnostic
+from apps.training.application.exam_variants import claim_exam_variant
+from apps.training.application.dashboard import get_usage_dashboard
+from apps.training.application.exports import iter_attempt_export
+from apps.training.application.class_report import get_class_report
+from apps.training.application.exceptions import ExamVariantNotAvailable, StudyGroupNotFound, TestNotFound
+from apps.training.application.test_runner import (
+    finish_test_attempt,
+    get_next_test_item,
+    get_test_items,
+    start_test_attempt,
+)
+from apps.training.application.leaderboard import LEADERBOARD_PERIODS, get_leaderboard
+from apps.training.application.progress import get_children_progress, get_user_progress
+from apps.training.application.review import get_review_queue
+from apps.training.application.score_histogram import get_score_percentile
+from apps.training.models import TaskAttemptHistory, TestAttempt
+from apps.training.api.payloads import (
+    finished_session_payload,
+    random_task_payload,
+    submitted_attempt_payload,
+    test_attempt_summary_payload,
+    test_attempt_totals,
+)
+from config.replica import ReplicaReadMixin, iter_on_read_alias, pin_to_primary, reads_from_replica
 
 
 class RandomTaskView(APIView):
@@ -46,9 +72,6 @@ class RandomTaskView(APIView):
             except (TypeError, ValueError):
                 return Response({"error": "subject_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
 
-        if test_attempt_id is None:
-            close_last_random_session(user=request.user)
-
         try:
             if test_attempt_id is not None:
                 test_attempt_id = int(test_attempt_id)
@@ -65,16 +88,8 @@ class RandomTaskView(APIView):
         except InvalidTestAttempt:
             return Response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(
-            {
-                "id": task.id,
-                "subject_id": task.subject_id,
-                "task_type": task.task_type,
-                "prompt": task.prompt,
-                "type_payload": task.type_payload,
-                "test_attempt_id": test_attempt.id,
-            }
-        )
+        pin_to_primary(request.user.id)
+        return Response(random_task_payload(task, test_attempt))
 
 
 class SubmitAnswerView(APIView):
@@ -141,18 +156,8 @@ class SubmitAnswerView(APIView):
         except InvalidTestAttempt:
             return Response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(
-            {
-                "attempt_id": attempt.id,
-                "task_id": attempt.task_id,
-                "is_correct": attempt.is_correct,
-                "score": str(attempt.score),
-                "max_score": str(attempt.applied_max_score or 0),
-                "submitted_at": attempt.submitted_at.isoformat(),
-                "solution_text": attempt.task.solution_text,
-                "answer_key": attempt.task.answer_key,
-            }
-        )
+        pin_to_primary(request.user.id)
+        return Response(submitted_attempt_payload(attempt))
 
 
 class FinishRandomSessionView(APIView):
@@ -189,22 +194,20 @@ class FinishRandomSessionView(APIView):
         except InvalidTestAttempt:
             return Response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(
-            {
-                "test_attempt_id": attempt.id,
-                "status": attempt.status,
-                "finished_at": attempt.finished_at.isoformat() if attempt.finished_at else None,
-            }
-        )
+        pin_to_primary(request.user.id)
+        return Response(finished_session_payload(attempt))
 
 
-class TestAttemptSummaryView(APIView):
+class TestAttemptSummaryView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         """
         Возвращает сводку по попытке теста.
 
+        `percentile` — доля завершенных попыток этого теста с результатом ниже (из гистограммы теста);
+        null, если попытка не завершена или тест не подготовленный.
+
         Пример запроса:
             GET /api/training/test-attempt/summary/?test_attempt_id=555
 
@@ -216,6 +219,7 @@ class TestAttemptSummaryView(APIView):
               "finished_at": "...",
               "total_score": "3",
               "max_score": "5",
+              "percentile": 72.5,
               "items": [
                 {
                   "attempt_id": 999,
@@ -249,47 +253,640 @@ class TestAttemptSummaryView(APIView):
         if attempt is None:
             return Response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Old attempts may already be archived: read the whole history.
         task_attempts = (
-            attempt.task_attempts.select_related("task")
+            TaskAttemptHistory.objects.filter(test_attempt=attempt)
+            .select_related("task")
             .order_by("submitted_at")
         )
 
-        totals = task_attempts.aggregate(
-            total_score=Coalesce(
-                Sum("score"),
-                Value(0),
-                output_field=DecimalField(max_digits=8, decimal_places=2),
-            ),
-            max_score=Coalesce(
-                Sum(Coalesce("applied_max_score", Value(0))),
-                Value(0),
-                output_field=DecimalField(max_digits=8, decimal_places=2),
-            ),
+        return Response(
+            test_attempt_summary_payload(
+                attempt,
+                totals=task_attempts.aggregate(**test_attempt_totals()),
+                percentile=get_score_percentile(attempt),
+                items=task_attempts,
+            )
         )
 
+
+class DiagnosticStartView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Начинает адаптивную диагностику по предмету и возвращает первое задание.
+
+        Пример запроса:
+            POST /api/training/diagnostic/start/
+            { "subject_id": 1 }
+
+        Пример ответа:
+            {
+              "id": 123,
+              "subject_id": 1,
+              "task_type": "short_text",
+              "prompt": "...",
+              "type_payload": {},
+              "test_attempt_id": 555,
+              "ability": 0.0,
+              "ability_se": 1.0
+            }
+        """
+        subject_id = request.data.get("subject_id")
+        if subject_id is None:
+            return Response({"error": "subject_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            subject_id = int(subject_id)
+        except (TypeError, ValueError):
+            return Response({"error": "subject_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            task, test_attempt = start_diagnostic(user=request.user, subject_id=subject_id)
+        except RandomTaskNotFound:
+            return Response({"error": "No tasks available."}, status=status.HTTP_404_NOT_FOUND)
+
+        pin_to_primary(request.user.id)
+        return Response(
+            {
+                "id": task.id,
+                "subject_id": task.subject_id,
+                "task_type": task.task_type,
+                "prompt": task.prompt,
+                "type_payload": task.type_payload,
+                "test_attempt_id": test_attempt.id,
+                "ability": test_attempt.ability,
+                "ability_se": test_attempt.ability_se,
+            }
+        )
+
+
+class DiagnosticNextTaskView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Возвращает следующее задание диагностики или итог, если диагностика завершена.
+
+        Пример запроса:
+            GET /api/training/diagnostic/next-task/?test_attempt_id=555
+
+        Пример ответа (диагностика продолжается):
+            {
+              "finished": false,
+              "test_attempt_id": 555,
+              "ability": 0.42,
+              "ability_se": 0.51,
+              "task": {"id": 124, "subject_id": 1, "task_type": "number", "prompt": "...", "type_payload": {}}
+            }
+
+        Пример ответа (диагностика завершена):
+            { "finished": true, "test_attempt_id": 555, "ability": 0.61, "ability_se": 0.38, "task": null }
+        """
+        test_attempt_id = request.query_params.get("test_attempt_id")
+        if test_attempt_id is None:
+            return Response({"error": "test_attempt_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            test_attempt_id = int(test_attempt_id)
+        except (TypeError, ValueError):
+            return Response({"error": "test_attempt_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            task, test_attempt = get_next_diagnostic_task(user=request.user, test_attempt_id=test_attempt_id)
+        except InvalidTestAttempt:
+            return Response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "finished": task is None,
+                "test_attempt_id": test_attempt.id,
+                "ability": test_attempt.ability,
+                "ability_se": test_attempt.ability_se,
+                "task": (
+                    {
+                        "id": task.id,
+                        "subject_id": task.subject_id,
+                        "task_type": task.task_type,
+                        "prompt": task.prompt,
+                        "type_payload": task.type_payload,
+                    }
+                    if task is not None
+                    else None
+                ),
+            }
+        )
+
+
+class ReviewQueueView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Возвращает задания, которые пора повторить (интервальные повторения, SM-2).
+
+        Пример запроса:
+            GET /api/training/review-queue/?subject_id=1&limit=20
+
+        Пример ответа:
+            {
+              "items": [
+                {
+                  "task_id": 123,
+                  "subject_id": 1,
+                  "task_type": "short_text",
+                  "prompt": "...",
+                  "type_payload": {},
+                  "due_at": "...",
+                  "interval_days": 6,
+                  "repetitions": 2
+                }
+              ]
+            }
+        """
+        subject_id = request.query_params.get("subject_id")
+        limit = request.query_params.get("limit", 20)
+
+        if subject_id is not None:
+            try:
+                subject_id = int(subject_id)
+            except (TypeError, ValueError):
+                return Response({"error": "subject_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(max(int(limit), 1), 100)
+        except (TypeError, ValueError):
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        schedules = get_review_queue(user=request.user, limit=limit, subject_id=subject_id)
+
         return Response(
             {
-                "test_attempt_id": attempt.id,
-                "status": attempt.status,
-                "started_at": attempt.started_at.isoformat(),
-                "finished_at": attempt.finished_at.isoformat() if attempt.finished_at else None,
-                "total_score": str(totals["total_score"]),
-                "max_score": str(totals["max_score"]),
                 "items": [
                     {
-                        "attempt_id": item.id,
-                        "task_id": item.task_id,
-                        "task_type": item.task.task_type,
-                        "prompt": item.task.prompt,
-                        "answer_payload": item.answer_payload,
-                        "answer_key": item.task.answer_key,
-                        "is_correct": item.is_correct,
-                        "score": str(item.score),
-                        "max_score": str(item.applied_max_score or 0),
-                        "submitted_at": item.submitted_at.isoformat(),
-                        "solution_text": item.task.solution_text,
+                        "task_id": schedule.task_id,
+                        "subject_id": schedule.task.subject_id,
+                        "task_type": schedule.task.task_type,
+                        "prompt": schedule.task.prompt,
+                        "type_payload": schedule.task.type_payload,
+                        "due_at": schedule.due_at.isoformat(),
+                        "interval_days": schedule.interval_days,
+                        "repetitions": schedule.repetitions,
+                    }
+                    for schedule in schedules
+                ]
+            }
+        )
+
+
+class ClaimExamVariantView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Выдает готовый экзаменационный вариант (Test) из пула для трека ExamType.
+
+        Пример запроса:
+            POST /api/training/exam-variants/claim/
+            { "exam_type_id": 3 }
+
+        Пример ответа:
+            { "test_id": 777, "title": "Exam variant — ЕГЭ / Математика", "exam_type_id": 3 }
+        """
+        exam_type_id = request.data.get("exam_type_id")
+        if exam_type_id is None:
+            return Response({"error": "exam_type_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            exam_type_id = int(exam_type_id)
+        except (TypeError, ValueError):
+            return Response({"error": "exam_type_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            test = claim_exam_variant(exam_type_id=exam_type_id)
+        except ExamVariantNotAvailable:
+            return Response({"error": "Exam variant is not available."}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(
+            {
+                "test_id": test.id,
+                "title": test.title,
+                "exam_type_id": test.exam_type_id,
+            }
+        )
+
+
+class StartTestAttemptView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Начинает прохождение заранее подготовленного теста (например, экзаменационного варианта).
+
+        Пример запроса:
+            POST /api/training/test-attempt/start/
+            { "test_id": 777 }
+
+        Пример ответа:
+            {
+              "test_attempt_id": 555,
+              "test_id": 777,
+              "title": "...",
+              "items_count": 27,
+              "max_score": "32",
+              "deadline": "2026-06-01T12:55:00+00:00"
+            }
+        """
+        test_id = request.data.get("test_id")
+        if test_id is None:
+            return Response({"error": "test_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            test_id = int(test_id)
+        except (TypeError, ValueError):
+            return Response({"error": "test_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            attempt = start_test_attempt(user=request.user, test_id=test_id)
+        except TestNotFound:
+            return Response({"error": "Test not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        pin_to_primary(request.user.id)
+        items = get_test_items(attempt.test_id)
+        return Response(
+            {
+                "test_attempt_id": attempt.id,
+                "test_id": attempt.test_id,
+                "title": attempt.test.title,
+                "items_count": len(items),
+                "max_score": str(sum(item["max_score"] for item in items)),
+                "deadline": attempt.deadline.isoformat() if attempt.deadline else None,
+            }
+        )
+
+
+class NextTestItemView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Возвращает следующее по порядку задание теста.
+
+        Пример запроса:
+            GET /api/training/test-attempt/next-item/?test_attempt_id=555
+
+        Пример ответа:
+            {
+              "test_attempt_id": 555,
+              "finished": false,
+              "answered_count": 3,
+              "items_count": 27,
+              "deadline": "2026-06-01T12:55:00+00:00",
+              "item": {
+                "order": 4,
+                "max_score": "1",
+                "task": {"id": 123, "subject_id": 1, "task_type": "number", "prompt": "...", "type_payload": {}}
+              }
+            }
+        """
+        test_attempt_id = request.query_params.get("test_attempt_id")
+        if test_attempt_id is None:
+            return Response({"error": "test_attempt_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            test_attempt_id = int(test_attempt_id)
+        except (TypeError, ValueError):
+            return Response({"error": "test_attempt_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            item, attempt, items = get_next_test_item(user=request.user, test_attempt_id=test_attempt_id)
+        except InvalidTestAttempt:
+            return Response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "test_attempt_id": attempt.id,
+                "finished": item is None,
+                "answered_count": attempt.answered_count,
+                "items_count": len(items),
+                "deadline": attempt.deadline.isoformat() if attempt.deadline else None,
+                "item": (
+                    {
+                        "order": item["order"],
+                        "max_score": str(item["max_score"]),
+                        "task": {
+                            "id": item["task"]["id"],
+                            "subject_id": item["task"]["subject_id"],
+                            "task_type": item["task"]["task_type"],
+                            "prompt": item["task"]["prompt"],
+                            "type_payload": item["task"]["type_payload"],
+                        },
                     }
-                    for item in task_attempts
-                ],
+                    if item is not None
+                    else None
+                ),
             }
         )
+
+
+class FinishTestAttemptView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Завершает прохождение теста и возвращает итоговые баллы.
+
+        Пример запроса:
+            POST /api/training/test-attempt/finish/
+            { "test_attempt_id": 555 }
+
+        Пример ответа:
+            { "test_attempt_id": 555, "status": "finished", "finished_at": "...", "total_score": "21", "max_score": "32" }
+        """
+        test_attempt_id = request.data.get("test_attempt_id")
+        if test_attempt_id is None:
+            return Response({"error": "test_attempt_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            test_attempt_id = int(test_attempt_id)
+        except (TypeError, ValueError):
+            return Response({"error": "test_attempt_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            attempt = finish_test_attempt(user=request.user, test_attempt_id=test_attempt_id)
+        except InvalidTestAttempt:
+            return Response({"error": "Invalid test_attempt_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        pin_to_primary(request.user.id)
+        return Response(
+            {
+                "test_attempt_id": attempt.id,
+                "status": attempt.status,
+                "finished_at": attempt.finished_at.isoformat() if attempt.finished_at else None,
+                "total_score": str(attempt.total_score),
+                "max_score": str(attempt.max_score),
+            }
+        )
+
+
+class ExportAttemptsView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Потоковая выгрузка ответов (TaskAttempt) в NDJSON (только для staff).
+
+        Параметры: `subject_id`, `user_id`, `date_from` / `date_to` (YYYY-MM-DD, по `submitted_at`), `gzip=1`.
+
+        Пример запроса:
+            GET /api/training/attempts/export/?user_id=42&date_from=2025-09-01&date_to=2025-09-30
+
+        Пример строки ответа:
+            {"id": 9001, "user_id": 42, "task_id": 123, "subject_id": 1, "score": "1.00", "is_correct": true, ...}
+        """
+        filters = {}
+        for name in ("subject_id", "user_id"):
+            value = request.query_params.get(name)
+            if value is not None:
+                try:
+                    filters[name] = int(value)
+                except (TypeError, ValueError):
+                    return Response({"error": f"{name} must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        for name in ("date_from", "date_to"):
+            value = request.query_params.get(name)
+            if value is None:
+                continue
+            try:
+                filters[name] = parse_date(value)
+            except ValueError:
+                filters[name] = None
+            if filters[name] is None:
+                return Response({"error": f"{name} must be a date (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return ndjson_streaming_response(
+            iter_on_read_alias(iter_attempt_export(**filters)),
+            filename="attempts.ndjson",
+            compress=request.query_params.get("gzip") in ("1", "true"),
+        )
+
+
+class UsageDashboardView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Дашборд активности за период (только для staff) — читает только дневные сводки.
+
+        Параметры: `date_from` / `date_to` (YYYY-MM-DD, по умолчанию последние 30 дней, не больше 366 дней),
+        `subject_id`, `task_type`.
+
+        Пример запроса:
+            GET /api/training/dashboard/?date_from=2025-09-01&date_to=2025-09-30&subject_id=1
+
+        Пример ответа:
+            {
+              "days": [
+                {"date": "2025-09-01", "attempt_count": 1200, "correct_count": 800,
+                 "total_score": "820.00", "total_duration_ms": 54000000, "active_users": 150}
+              ],
+              "by_subject": [
+                {"subject_id": 1, "subject__title": "Математика", "task_type": "number",
+                 "attempt_count": 30000, "correct_count": 21000, "total_score": "21500.00", "total_duration_ms": 900000000}
+              ],
+              "active_users": 640
+            }
+        """
+        filters = {}
+        subject_id = request.query_params.get("subject_id")
+        if subject_id is not None:
+            try:
+                filters["subject_id"] = int(subject_id)
+            except (TypeError, ValueError):
+                return Response({"error": "subject_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        task_type = request.query_params.get("task_type")
+        if task_type is not None:
+            filters["task_type"] = task_type
+
+        today = timezone.localdate()
+        dates = {"date_from": today - timedelta(days=29), "date_to": today}
+        for name in ("date_from", "date_to"):
+            value = request.query_params.get(name)
+            if value is None:
+                continue
+            try:
+                dates[name] = parse_date(value)
+            except ValueError:
+                dates[name] = None
+            if dates[name] is None:
+                return Response({"error": f"{name} must be a date (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if dates["date_from"] > dates["date_to"]:
+            return Response({"error": "date_from must not be after date_to."}, status=status.HTTP_400_BAD_REQUEST)
+        if (dates["date_to"] - dates["date_from"]).days >= 366:
+            return Response({"error": "Date range must not exceed 366 days."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(get_usage_dashboard(**dates, **filters))
+
+
+class UserProgressView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Прогресс текущего ученика: решенные задания, точность по предметам, серии дней, недавняя активность.
+
+        Читает предрасчитанные агрегаты (обновляются при каждом ответе) через кеш.
+
+        Пример запроса:
+            GET /api/training/progress/
+
+        Пример ответа:
+            {
+              "attempt_count": 120,
+              "correct_count": 90,
+              "accuracy": 0.75,
+              "solved_task_count": 64,
+              "current_streak_days": 4,
+              "longest_streak_days": 11,
+              "last_active_date": "2025-09-14",
+              "subjects": [
+                {
+                  "subject_id": 1,
+                  "subject_title": "Математика",
+                  "attempt_count": 80,
+                  "correct_count": 60,
+                  "accuracy": 0.75,
+                  "solved_task_count": 41,
+                  "total_score": "61.00",
+                  "last_attempt_at": "2025-09-14T10:00:00Z"
+                }
+              ],
+              "recent_activity": [{"date": "2025-09-14", "attempts": 12, "correct": 9}]
+            }
+        """
+        return Response(get_user_progress(user=request.user, fill_cache=not reads_from_replica()))
+
+
+class ChildrenProgressView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Сводки прогресса всех учеников, привязанных к текущему пользователю-родителю.
+
+        Пример запроса:
+            GET /api/training/children-progress/
+
+        Пример ответа:
+            {
+              "children": [
+                {
+                  "user_id": 42,
+                  "username": "ivan",
+                  "attempt_count": 120,
+                  "correct_count": 90,
+                  "accuracy": 0.75,
+                  "solved_task_count": 64,
+                  "current_streak_days": 4,
+                  "longest_streak_days": 11,
+                  "last_active_date": "2025-09-14",
+                  "recent_activity": [{"date": "2025-09-14", "attempts": 12, "correct": 9}]
+                }
+              ]
+            }
+        """
+        return Response({"children": get_children_progress(parent=request.user, fill_cache=not reads_from_replica())})
+
+
+class LeaderboardView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Рейтинг предмета (топ-N) и позиция текущего пользователя.
+
+        Параметры: `subject_id` (обязательный), `period` — `week` (текущая неделя, по умолчанию) или `all`,
+        `limit` (до 100, по умолчанию 10).
+
+        Пример запроса:
+            GET /api/training/leaderboard/?subject_id=1&period=week&limit=10
+
+        Пример ответа:
+            {
+              "period": "2025-W37",
+              "top": [{"rank": 1, "user_id": 7, "username": "ivan", "score": "42.00"}],
+              "me": {"rank": 15, "score": "18.00"}
+            }
+        """
+        subject_id = request.query_params.get("subject_id")
+        if subject_id is None:
+            return Response({"error": "subject_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            subject_id = int(subject_id)
+        except (TypeError, ValueError):
+            return Response({"error": "subject_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        period = request.query_params.get("period", "week")
+        if period not in LEADERBOARD_PERIODS:
+            return Response(
+                {"error": f"period must be one of: {', '.join(LEADERBOARD_PERIODS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        limit = request.query_params.get("limit", 10)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, 100))
+
+        return Response(get_leaderboard(subject_id=subject_id, period=period, user=request.user, limit=limit))
+
+
+class ClassReportView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Отчет учителя по классу: точность каждого ученика и по каждой теме предмета.
+
+        Доступен учителю группы и staff. Строится из агрегатов прогресса и кешируется до нового ответа
+        любого ученика класса (отчет, собранный с реплики, не кешируется).
+
+        Пример запроса:
+            GET /api/training/class-report/?group_id=5&subject_id=1
+
+        Пример ответа:
+            {
+              "group_id": 5,
+              "title": "9А",
+              "subject_id": 1,
+              "students": [
+                {"user_id": 42, "username": "ivan", "attempt_count": 80, "correct_count": 60,
+                 "accuracy": 0.75, "solved_task_count": 41, "last_attempt_at": "2025-09-14T10:00:00Z"}
+              ],
+              "nodes": [
+                {"node_id": 10, "title": "Теорема Виета", "attempt_count": 240, "correct_count": 150,
+                 "accuracy": 0.625, "student_count": 27}
+              ]
+            }
+        """
+        params = {}
+        for name in ("group_id", "subject_id"):
+            value = request.query_params.get(name)
+            if value is None:
+                return Response({"error": f"{name} is required."}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                params[name] = int(value)
+            except (TypeError, ValueError):
+                return Response({"error": f"{name} must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = get_class_report(user=request.user, **params, fill_cache=not reads_from_replica())
+        except StudyGroupNotFound:
+            return Response({"error": "Study group not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(report)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Callable, Iterable
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.training.models import AggregateCursor, TaskAttempt
+
+DEFAULT_AGGREGATION_BATCH_SIZE = 10_000
+DEFAULT_AGGREGATION_LAG_MINUTES = 5
+
+
+def process_new_attempts(
+    cursor_name: str,
+    handler: Callable[[list[tuple]], None],
+    *,
+    fields: Iterable[str],
+    batch_size: int = DEFAULT_AGGREGATION_BATCH_SIZE,
+    lag_minutes: int = DEFAULT_AGGREGATION_LAG_MINUTES,
+) -> int:
+    """
+    Скармливает `handler` новые TaskAttempt (id > high-water mark курсора) пачками по возрастанию id.
+
+    Каждая пачка обрабатывается в одной транзакции вместе со сдвигом курсора: агрегаты и курсор
+    либо обновляются вместе, либо не обновляются вовсе. Первое поле в каждой строке — `id`.
+    Ответы моложе `lag_minutes` ждут следующего запуска: транзакция с меньшим id может быть еще не закоммичена.
+    Пачка обрывается на первом таком ответе (а не пропускает его): `submitted_at` выставляется до INSERT,
+    поэтому у меньшего id время может быть больше, и фильтр по времени сдвинул бы курсор мимо него навсегда.
+
+    Возвращает число обработанных ответов.
+
+    Пример:
+        process_new_attempts("task_stats", apply_batch, fields=["task_id", "is_correct"])
+    """
+    fields = ["id", *fields]
+    cutoff = timezone.now() - timedelta(minutes=lag_minutes)
+
+    processed = 0
+    while True:
+        with transaction.atomic():
+            cursor, _ = AggregateCursor.objects.select_for_update().get_or_create(name=cursor_name)
+            rows = list(
+                TaskAttempt.hot_objects.filter(id__gt=cursor.last_id)
+                .order_by("id")
+                .values_list(*fields, "submitted_at")[:batch_size]
+            )
+            ready = next((index for index, row in enumerate(rows) if row[-1] >= cutoff), len(rows))
+            if not ready:
+                return processed
+
+            handler([row[:-1] for row in rows[:ready]])
+
+            cursor.last_id = rows[ready - 1][0]
+            cursor.save(update_fields=["last_id", "updated_at"])
+        processed += ready
+        if ready < len(rows):
+            return processed
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.training.application.rollups import DAILY_ROLLUPS_CURSOR
+from apps.training.application.task_stats import TASK_STATS_CURSOR
+from apps.training.domain.enums import AttemptStatus
+from apps.training.models import AggregateCursor, ArchivedTaskAttempt, TaskAttempt
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 180
+DEFAULT_ARCHIVE_BATCH_SIZE = 5_000
+
+# Incremental aggregates read new rows from the hot table by id: a row leaves it only once all of them have seen it.
+ARCHIVE_AFTER_CURSORS = (TASK_STATS_CURSOR, DAILY_ROLLUPS_CURSOR)
+
+ARCHIVED_FIELDS = [field.attname for field in ArchivedTaskAttempt._meta.concrete_fields]
+
+
+def archive_task_attempts(
+    *,
+    older_than_days: int = DEFAULT_ARCHIVE_AFTER_DAYS,
+    batch_size: int = DEFAULT_ARCHIVE_BATCH_SIZE,
+) -> int:
+    """
+    Переносит ответы старше `older_than_days` из горячей `TaskAttempt` в `ArchivedTaskAttempt` (пачками по id).
+
+    Не переносятся:
+    - ответы, которые еще не обработали инкрементальные агрегаты (`ARCHIVE_AFTER_CURSORS`);
+    - ответы незавершенных попыток тестов (их читают раннер теста и диагностика).
+
+    Каждая пачка — одна транзакция (копия + удаление): ответ всегда ровно в одной из таблиц,
+    `TaskAttemptHistory` видит его на всем протяжении переноса. Повторный запуск безопасен.
+
+    Возвращает число перенесенных ответов.
+
+    Пример:
+        archive_task_attempts(older_than_days=180)  # -> 125000
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    high_water = _aggregated_high_water()
+
+    moved = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                TaskAttempt.hot_objects.filter(id__lte=high_water, submitted_at__lt=cutoff)
+                .exclude(test_attempt__status=AttemptStatus.STARTED)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return moved
+
+            ArchivedTaskAttempt.objects.bulk_create(
+                [
+                    ArchivedTaskAttempt(**row)
+                    for row in TaskAttempt.hot_objects.filter(id__in=ids).values(*ARCHIVED_FIELDS)
+                ]
+            )
+            TaskAttempt.hot_objects.filter(id__in=ids).delete()
+        moved += len(ids)
+
+
+def _aggregated_high_water() -> int:
+    """
+    Наибольший id, который обработали все инкрементальные агрегаты (0 — если какой-то еще не запускался).
+    """
+    last_ids = list(AggregateCursor.objects.filter(name__in=ARCHIVE_AFTER_CURSORS).values_list("last_id", flat=True))
+    if len(last_ids) < len(ARCHIVE_AFTER_CURSORS):
+        return 0
+    return min(last_ids)
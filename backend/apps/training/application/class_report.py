@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from apps.monitoring.application.metrics import record_cache_lookup
+from apps.training.application.exceptions import StudyGroupNotFound
+from apps.training.application.progress import get_progress_versions
+from apps.training.models import UserNodeProgress, UserSubjectProgress
+from apps.users.models import StudyGroup, StudyGroupMembership
+
+CLASS_REPORT_CACHE_TTL_SECONDS = 10 * 60
+
+
+def get_class_report(*, user, group_id: int, subject_id: int, fill_cache: bool = True) -> dict:
+    """
+    Отчет по классу и предмету: точность по каждому ученику и по каждой теме (вершине графа).
+
+    Считается из агрегатов прогресса (UserSubjectProgress, UserNodeProgress) — по одному запросу
+    на весь класс, без циклов по ученикам. Кешируется; ключ включает версии прогресса учеников,
+    поэтому новый ответ любого ученика класса делает отчет неактуальным.
+    `fill_cache=False` — отчет собран с реплики и в кеш не кладется (он мог не увидеть этот ответ).
+
+    Доступ: учитель группы или staff.
+
+    Пример:
+        report = get_class_report(user=request.user, group_id=5, subject_id=1)
+    """
+    group = StudyGroup.objects.filter(id=group_id).first()
+    if group is None or (group.teacher_id != user.id and not user.is_staff):
+        raise StudyGroupNotFound("Study group not found.")
+
+    students = list(
+        StudyGroupMembership.objects.filter(group_id=group_id)
+        .order_by("student__username")
+        .values_list("student_id", "student__username")
+    )
+    student_ids = [student_id for student_id, _ in students]
+
+    versions = get_progress_versions(student_ids)
+    digest = hashlib.sha1(
+        ",".join(f"{student_id}:{versions[student_id]}" for student_id in student_ids).encode()
+    ).hexdigest()
+    cache_key = f"training:class-report:{group_id}:{subject_id}:{digest}"
+    report = cache.get(cache_key)
+    record_cache_lookup("class_report", hit=report is not None)
+    if report is not None:
+        return report
+
+    progress_by_student = {
+        row["user_id"]: row
+        for row in UserSubjectProgress.objects.filter(user_id__in=student_ids, subject_id=subject_id).values(
+            "user_id", "attempt_count", "correct_count", "solved_task_count", "last_attempt_at"
+        )
+    }
+    nodes = (
+        UserNodeProgress.objects.filter(user_id__in=student_ids, node__subject_id=subject_id)
+        .values("node_id", "node__title")
+        .annotate(
+            attempt_count=Sum("attempt_count"),
+            correct_count=Sum("correct_count"),
+            student_count=Count("user_id"),
+        )
+        .order_by("node_id")
+    )
+
+    report = {
+        "group_id": group.id,
+        "title": group.title,
+        "subject_id": subject_id,
+        "students": [
+            _student_row(student_id, username, progress_by_student.get(student_id)) for student_id, username in students
+        ],
+        "nodes": [
+            {
+                "node_id": row["node_id"],
+                "title": row["node__title"],
+                "attempt_count": row["attempt_count"],
+                "correct_count": row["correct_count"],
+                "accuracy": _accuracy(row["correct_count"], row["attempt_count"]),
+                "student_count": row["student_count"],
+            }
+            for row in nodes
+        ],
+    }
+    if fill_cache:
+        cache.set(cache_key, report, CLASS_REPORT_CACHE_TTL_SECONDS)
+    return report
+
+
+def _student_row(student_id: int, username: str, progress: dict | None) -> dict:
+    progress = progress or {"attempt_count": 0, "correct_count": 0, "solved_task_count": 0, "last_attempt_at": None}
+    return {
+        "user_id": student_id,
+        "username": username,
+        "attempt_count": progress["attempt_count"],
+        "correct_count": progress["correct_count"],
+        "accuracy": _accuracy(progress["correct_count"], progress["attempt_count"]),
+        "solved_task_count": progress["solved_task_count"],
+        "last_attempt_at": progress["last_attempt_at"],
+    }
+
+
+def _accuracy(correct: int, total: int) -> float | None:
+    return round(correct / total, 4) if total else None
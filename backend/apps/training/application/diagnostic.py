@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import heapq
+import random
+import time
+from dataclasses import dataclass
+
+from django.db.models import DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.graph.models import Subject
+from apps.monitoring.application.metrics import count_test_attempts, record_cache_lookup
+from apps.tasks.models import Task
+from apps.training.application.exceptions import InvalidTestAttempt, RandomTaskNotFound
+from apps.training.domain import irt
+from apps.training.domain.enums import AttemptStatus, TestMode
+from apps.training.models import TestAttempt
+
+# Stopping rule: finish once the estimate is precise enough (or the budget is spent).
+DIAGNOSTIC_SE_THRESHOLD = 0.4
+DIAGNOSTIC_MIN_ITEMS = 5
+DIAGNOSTIC_MAX_ITEMS = 15
+
+# Exposure control: the next task is drawn among the top-K most informative ones.
+DIAGNOSTIC_TOP_K = 3
+
+# How many most informative tasks are kept per theta grid point.
+ITEM_BANK_DEPTH = 64
+ITEM_BANK_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class ItemBank:
+    """
+    Предрасчитанная таблица информативности заданий одного предмета.
+
+    - `params` — task_id -> (irt_difficulty, irt_discrimination);
+    - `ranking[i]` — id самых информативных заданий в точке THETA_GRID[i] (по убыванию).
+    """
+
+    params: dict[int, tuple[float, float]]
+    ranking: tuple[tuple[int, ...], ...]
+    built_at: float
+
+
+# Per-process cache: subject_id -> ItemBank.
+_item_banks: dict[int, ItemBank] = {}
+
+
+def get_item_bank(subject_id: int) -> ItemBank:
+    """
+    Возвращает таблицу информативности для предмета (строится раз в ITEM_BANK_TTL_SECONDS).
+
+    Пример:
+        bank = get_item_bank(subject_id=1)
+    """
+    bank = _item_banks.get(subject_id)
+    is_fresh = bank is not None and time.monotonic() - bank.built_at <= ITEM_BANK_TTL_SECONDS
+    record_cache_lookup("item_bank", hit=is_fresh)
+    if not is_fresh:
+        bank = _build_item_bank(subject_id)
+        _item_banks[subject_id] = bank
+    return bank
+
+
+def start_diagnostic(*, user, subject_id: int) -> tuple[Task, TestAttempt]:
+    """
+    Начинает диагностику по предмету: создает TestAttempt и выбирает первое задание.
+
+    Пример:
+        task, attempt = start_diagnostic(user=request.user, subject_id=1)
+    """
+    subject = Subject.objects.filter(id=subject_id).first()
+    if subject is None:
+        raise RandomTaskNotFound("Subject not found.")
+
+    bank = get_item_bank(subject.id)
+    theta, se = irt.estimate_ability([])
+    task_id = _select_next_task_id(bank, theta=theta, answered=set())
+    if task_id is None:
+        raise RandomTaskNotFound("No tasks available for the given filters.")
+
+    test = _get_or_create_diagnostic_test(subject)
+    attempt = TestAttempt.objects.create(user=user, test=test, ability=theta, ability_se=se, current_task_id=task_id)
+    count_test_attempts(AttemptStatus.STARTED.value)
+    return Task.objects.get(id=task_id), attempt
+
+
+def _get_or_create_diagnostic_test(subject: Subject):
+    """
+    Получает или создает служебный тест "Diagnostic — <Subject>".
+
+    Пример:
+        test = _get_or_create_diagnostic_test(subject=math_subject)
+    """
+    title = f"Diagnostic — {subject.title}"
+    # No unique constraint on tests: concurrent first starts may each create one, the oldest is used
+    # (`get_or_create` would raise MultipleObjectsReturned from then on).
+    test = subject.tests.filter(title=title, mode=TestMode.DIAGNOSTIC.value).order_by("id").first()
+    if test is None:
+        test = subject.tests.create(title=title, mode=TestMode.DIAGNOSTIC.value)
+    return test
+
+
+def get_next_diagnostic_task(*, user, test_attempt_id: int) -> tuple[Task | None, TestAttempt]:
+    """
+    Возвращает следующее самое информативное задание или None, если диагностика завершена.
+
+    Диагностика завершается, когда стандартная ошибка оценки опустилась ниже порога
+    (после DIAGNOSTIC_MIN_ITEMS заданий) или исчерпан лимит DIAGNOSTIC_MAX_ITEMS.
+
+    Пример:
+        task, attempt = get_next_diagnostic_task(user=request.user, test_attempt_id=555)
+        if task is None:
+            # attempt.ability, attempt.ability_se — итог диагностики
+            ...
+    """
+    attempt = (
+        TestAttempt.objects.select_related("test")
+        .filter(id=test_attempt_id, user=user, test__mode=TestMode.DIAGNOSTIC.value)
+        .first()
+    )
+    if attempt is None:
+        raise InvalidTestAttempt("Test attempt does not belong to user or is not diagnostic.")
+    if attempt.status != AttemptStatus.STARTED.value:
+        return None, attempt
+
+    answered = set(attempt.task_attempts.values_list("task_id", flat=True))
+    if _should_stop(len(answered), attempt.ability_se):
+        _finish_diagnostic(attempt)
+        return None, attempt
+
+    bank = get_item_bank(attempt.test.subject_id)
+    theta = attempt.ability if attempt.ability is not None else 0.0
+    task_id = _select_next_task_id(bank, theta=theta, answered=answered)
+    if task_id is None:
+        _finish_diagnostic(attempt)
+        return None, attempt
+
+    attempt.current_task_id = task_id
+    attempt.save(update_fields=["current_task"])
+    return Task.objects.get(id=task_id), attempt
+
+
+def claim_diagnostic_task(test_attempt: TestAttempt, *, task_id: int) -> None:
+    """
+    Принимает ответ диагностики только на последнее выданное задание незавершенной попытки.
+
+    Задание снимается условным UPDATE: повторный (или параллельный) ответ на него же отклоняется,
+    пока `get_next_diagnostic_task` не выдаст следующее.
+
+    Пример:
+        claim_diagnostic_task(attempt, task_id=123)
+    """
+    claimed = TestAttempt.objects.filter(
+        id=test_attempt.id, status=AttemptStatus.STARTED.value, current_task_id=task_id
+    ).update(current_task=None)
+    if not claimed:
+        raise InvalidTestAttempt("Task is not the current task of the diagnostic.")
+    test_attempt.current_task_id = None
+
+
+def update_diagnostic_estimate(test_attempt: TestAttempt) -> None:
+    """
+    Пересчитывает оценку способности по всем ответам диагностической попытки.
+
+    Вызывается из `submit_task_answer` после сохранения TaskAttempt.
+
+    Пример:
+        update_diagnostic_estimate(test_attempt)
+    """
+    bank = get_item_bank(test_attempt.test.subject_id)
+    responses = [
+        (*bank.params[task_id], is_correct)
+        for task_id, is_correct in test_attempt.task_attempts.values_list("task_id", "is_correct")
+        if task_id in bank.params
+    ]
+    test_attempt.ability, test_attempt.ability_se = irt.estimate_ability(responses)
+    test_attempt.save(update_fields=["ability", "ability_se"])
+
+
+def _build_item_bank(subject_id: int) -> ItemBank:
+    """
+    Строит таблицу: для каждой точки сетки theta — ITEM_BANK_DEPTH самых информативных заданий.
+
+    Пример:
+        bank = _build_item_bank(subject_id=1)
+    """
+    params = {
+        task_id: (difficulty, discrimination)
+        for task_id, difficulty, discrimination in Task.objects.filter(subject_id=subject_id).values_list(
+            "id", "irt_difficulty", "irt_discrimination"
+        )
+    }
+    ranking = tuple(
+        tuple(
+            heapq.nlargest(
+                ITEM_BANK_DEPTH,
+                params,
+                key=lambda task_id: irt.information(theta, *params[task_id]),
+            )
+        )
+        for theta in irt.THETA_GRID
+    )
+    return ItemBank(params=params, ranking=ranking, built_at=time.monotonic())
+
+
+def _select_next_task_id(bank: ItemBank, *, theta: float, answered: set[int]) -> int | None:
+    """
+    Выбирает задание среди DIAGNOSTIC_TOP_K самых информативных в точке theta.
+
+    Пример:
+        task_id = _select_next_task_id(bank, theta=0.3, answered={1, 2})
+    """
+    candidates = []
+    for task_id in bank.ranking[irt.grid_index(theta)]:
+        if task_id not in answered:
+            candidates.append(task_id)
+            if len(candidates) == DIAGNOSTIC_TOP_K:
+                break
+    return random.choice(candidates) if candidates else None
+
+
+def _should_stop(items_count: int, ability_se: float | None) -> bool:
+    """
+    Правило остановки диагностики.
+
+    Пример:
+        _should_stop(12, 0.35) -> True
+    """
+    if items_count >= DIAGNOSTIC_MAX_ITEMS:
+        return True
+    return items_count >= DIAGNOSTIC_MIN_ITEMS and ability_se is not None and ability_se <= DIAGNOSTIC_SE_THRESHOLD
+
+
+def _finish_diagnostic(attempt: TestAttempt) -> None:
+    """
+    Завершает диагностическую попытку и фиксирует итоговые баллы.
+
+    Пример:
+        _finish_diagnostic(attempt)
+    """
+    totals = attempt.task_attempts.aggregate(
+        total_score=Coalesce(
+            Sum("score"),
+            Value(0),
+            output_field=DecimalField(max_digits=8, decimal_places=2),
+        ),
+        max_score=Coalesce(
+            Sum(Coalesce("applied_max_score", Value(0))),
+            Value(0),
+            output_field=DecimalField(max_digits=8, decimal_places=2),
+        ),
+    )
+    attempt.status = AttemptStatus.FINISHED.value
+    attempt.finished_at = timezone.now()
+    attempt.total_score = totals["total_score"]
+    attempt.max_score = totals["max_score"]
+    attempt.current_task_id = None
+    attempt.save(update_fields=["status", "finished_at", "total_score", "max_score", "current_task"])
+    count_test_attempts(attempt.status)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+
+from apps.exams.models import ExamTaskGroup, ExamType
+from apps.monitoring.application.metrics import record_cache_lookup
+from apps.tasks.models import Task
+from apps.training.application.exceptions import ExamVariantNotAvailable
+from apps.training.domain.enums import TestMode
+from apps.training.models import Test, TestItem
+
+VARIANT_INDEX_TTL_SECONDS = 300
+CLAIM_RETRIES = 3
+# Without SKIP LOCKED a claimer picks a random one of this many oldest pooled variants.
+CLAIM_SPREAD = 32
+
+
+@dataclass(frozen=True)
+class ExamVariantIndex:
+    """
+    Индекс заданий экзаменационного трека для сборки вариантов.
+
+    - `groups` — активные группы по порядку `num`: (group_id, num, max_score);
+    - `task_ids_by_group` — group_id -> id заданий (через `exam_task_type__exam_task_group`).
+    """
+
+    exam_type_id: int
+    subject_id: int
+    title: str
+    time_limit_minutes: int | None
+    groups: tuple[tuple[int, int, int], ...]
+    task_ids_by_group: dict[int, tuple[int, ...]]
+    built_at: float
+
+
+# Per-process cache: exam_type_id -> ExamVariantIndex.
+_variant_indexes: dict[int, ExamVariantIndex] = {}
+
+
+def get_exam_variant_index(exam_type_id: int) -> ExamVariantIndex:
+    """
+    Возвращает индекс заданий по группам трека (строится раз в VARIANT_INDEX_TTL_SECONDS).
+
+    Пример:
+        index = get_exam_variant_index(exam_type_id=3)
+    """
+    index = _variant_indexes.get(exam_type_id)
+    is_fresh = index is not None and time.monotonic() - index.built_at <= VARIANT_INDEX_TTL_SECONDS
+    record_cache_lookup("exam_variant_index", hit=is_fresh)
+    if not is_fresh:
+        index = _build_exam_variant_index(exam_type_id)
+        _variant_indexes[exam_type_id] = index
+    return index
+
+
+def build_exam_variants(*, exam_type_id: int, count: int = 1, pooled: bool = False) -> list[Test]:
+    """
+    Собирает `count` вариантов: по одному случайному заданию на каждую активную группу.
+
+    Выборка идет за один проход по индексу трека; в БД — только bulk-вставки Test и TestItem.
+
+    Пример:
+        [variant] = build_exam_variants(exam_type_id=3)
+    """
+    index = get_exam_variant_index(exam_type_id)
+    if not index.groups:
+        raise ExamVariantNotAvailable("Exam type has no active task groups.")
+
+    missing = [num for group_id, num, _ in index.groups if not index.task_ids_by_group.get(group_id)]
+    if missing:
+        raise ExamVariantNotAvailable(f"No tasks for task groups: {missing}.")
+
+    with transaction.atomic():
+        tests = Test.objects.bulk_create(
+            [
+                Test(
+                    title=f"Exam variant — {index.title}",
+                    subject_id=index.subject_id,
+                    mode=TestMode.EXAM.value,
+                    exam_type_id=exam_type_id,
+                    is_pooled=pooled,
+                    time_limit_minutes=index.time_limit_minutes,
+                )
+                for _ in range(count)
+            ]
+        )
+        TestItem.objects.bulk_create(
+            [
+                TestItem(
+                    test=test,
+                    task_id=random.choice(index.task_ids_by_group[group_id]),
+                    order=order,
+                    max_score=max_score,
+                )
+                for test in tests
+                for order, (group_id, _, max_score) in enumerate(index.groups, start=1)
+            ]
+        )
+    return tests
+
+
+def claim_exam_variant(*, exam_type_id: int) -> Test:
+    """
+    Забирает готовый вариант из пула; если пул пуст — собирает вариант на лету.
+
+    Параллельные запросы не конкурируют за одну строку: с `SKIP LOCKED` (PostgreSQL) каждый берет первый
+    не заблокированный вариант, без него — случайный из CLAIM_SPREAD старейших с compare-and-set.
+
+    Пример:
+        test = claim_exam_variant(exam_type_id=3)
+    """
+    pool = Test.objects.filter(exam_type_id=exam_type_id, is_pooled=True).order_by("id")
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            test = pool.select_for_update(skip_locked=True).first()
+            if test is not None:
+                test.is_pooled = False
+                test.save(update_fields=["is_pooled"])
+                return test
+    else:
+        for _ in range(CLAIM_RETRIES):
+            test_ids = list(pool.values_list("id", flat=True)[:CLAIM_SPREAD])
+            if not test_ids:
+                break
+            # Compare-and-set: only one concurrent request wins a given variant.
+            test_id = random.choice(test_ids)
+            if Test.objects.filter(id=test_id, is_pooled=True).update(is_pooled=False):
+                return Test.objects.get(id=test_id)
+
+    [test] = build_exam_variants(exam_type_id=exam_type_id)
+    return test
+
+
+def fill_exam_variant_pool(*, exam_type_id: int | None = None, target_size: int = 50) -> dict[int, int]:
+    """
+    Досоздает варианты в пул до `target_size` для трека (или всех активных треков).
+
+    Возвращает exam_type_id -> сколько вариантов создано.
+
+    Пример:
+        fill_exam_variant_pool(target_size=100)
+    """
+    exam_types = ExamType.objects.filter(is_active=True)
+    if exam_type_id is not None:
+        exam_types = exam_types.filter(id=exam_type_id)
+
+    created = {}
+    for current_id in exam_types.values_list("id", flat=True):
+        pooled = Test.objects.filter(exam_type_id=current_id, is_pooled=True).count()
+        missing = max(target_size - pooled, 0)
+        if missing:
+            try:
+                build_exam_variants(exam_type_id=current_id, count=missing, pooled=True)
+            except ExamVariantNotAvailable:
+                missing = 0
+        created[current_id] = missing
+    return created
+
+
+def _build_exam_variant_index(exam_type_id: int) -> ExamVariantIndex:
+    """
+    Строит индекс трека: группы (1 запрос) и задания, сгруппированные по группам (1 запрос).
+
+    Пример:
+        index = _build_exam_variant_index(exam_type_id=3)
+    """
+    exam_type = ExamType.objects.select_related("exam", "subject").filter(id=exam_type_id).first()
+    if exam_type is None:
+        raise ExamVariantNotAvailable("Exam type not found.")
+
+    groups = tuple(
+        ExamTaskGroup.objects.filter(exam_type_id=exam_type_id, is_active=True)
+        .order_by("num")
+        .values_list("id", "num", "max_score")
+    )
+
+    task_ids_by_group: dict[int, list[int]] = {}
+    rows = Task.objects.filter(
+        exam_task_type__exam_task_group__exam_type_id=exam_type_id,
+        exam_task_type__is_active=True,
+    ).values_list("exam_task_type__exam_task_group_id", "id")
+    for group_id, task_id in rows:
+        task_ids_by_group.setdefault(group_id, []).append(task_id)
+
+    return ExamVariantIndex(
+        exam_type_id=exam_type_id,
+        subject_id=exam_type.subject_id,
+        title=f"{exam_type.exam.title} / {exam_type.subject.title}",
+        time_limit_minutes=exam_type.time_limit_minutes,
+        groups=groups,
+        task_ids_by_group={group_id: tuple(ids) for group_id, ids in task_ids_by_group.items()},
+        built_at=time.monotonic(),
+    )
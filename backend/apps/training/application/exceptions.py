@@ -0,0 +1,18 @@
+class RandomTaskNotFound(Exception):
+    pass
+
+
+class InvalidTestAttempt(Exception):
+    pass
+
+
+class ExamVariantNotAvailable(Exception):
+    pass
+
+
+class TestNotFound(Exception):
+    pass
+
+
+class StudyGroupNotFound(Exception):
+    pass
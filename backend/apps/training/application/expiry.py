@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import DecimalField, Exists, OuterRef, QuerySet, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.monitoring.application.metrics import count_test_attempts
+from apps.training.domain.enums import AttemptStatus
+from apps.training.models import TaskAttempt, TestAttempt, TestItem
+
+DEFAULT_IDLE_MINUTES = 60
+DEFAULT_BATCH_SIZE = 500
+
+
+def expire_test_attempts(
+    *,
+    now: datetime | None = None,
+    idle_minutes: int = DEFAULT_IDLE_MINUTES,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, int]:
+    """
+    Финализирует зависшие попытки пачками `UPDATE` (обработчики запросов уборкой не занимаются).
+
+    - просроченные (`deadline` прошел) → `expired`;
+    - без дедлайна и без ответов дольше `idle_minutes` (рандомная практика, диагностика) → `abandoned`.
+
+    Итоговые баллы считаются в том же `UPDATE` подзапросами.
+
+    Пример:
+        expire_test_attempts(idle_minutes=30)
+        # {"expired": 12, "abandoned": 340}
+    """
+    now = now or timezone.now()
+    idle_cutoff = now - timedelta(minutes=idle_minutes)
+
+    overdue = TestAttempt.objects.filter(status=AttemptStatus.STARTED.value, deadline__lt=now)
+    idle = TestAttempt.objects.filter(
+        status=AttemptStatus.STARTED.value,
+        deadline__isnull=True,
+        started_at__lt=idle_cutoff,
+    ).exclude(
+        Exists(TaskAttempt.objects.filter(test_attempt=OuterRef("pk"), submitted_at__gte=idle_cutoff))
+    )
+
+    return {
+        AttemptStatus.EXPIRED.value: _finalize_in_batches(
+            overdue, status=AttemptStatus.EXPIRED.value, now=now, batch_size=batch_size
+        ),
+        AttemptStatus.ABANDONED.value: _finalize_in_batches(
+            idle, status=AttemptStatus.ABANDONED.value, now=now, batch_size=batch_size
+        ),
+    }
+
+
+def _finalize_in_batches(candidates: QuerySet[TestAttempt], *, status: str, now: datetime, batch_size: int) -> int:
+    """
+    Выбирает id пачками (по индексу (status, deadline)) и финализирует их одним UPDATE на пачку.
+
+    Пример:
+        _finalize_in_batches(overdue, status="expired", now=timezone.now(), batch_size=500)
+    """
+    decimal_field = DecimalField(max_digits=8, decimal_places=2)
+    score_sum = (
+        TaskAttempt.objects.filter(test_attempt=OuterRef("pk"))
+        .order_by()
+        .values("test_attempt")
+        .annotate(total=Sum("score"))
+        .values("total")
+    )
+    applied_max_sum = (
+        TaskAttempt.objects.filter(test_attempt=OuterRef("pk"))
+        .order_by()
+        .values("test_attempt")
+        .annotate(total=Sum(Coalesce("applied_max_score", Value(0), output_field=decimal_field)))
+        .values("total")
+    )
+    # Ordered tests are scored out of all their items, other sessions out of answered tasks.
+    items_max_sum = (
+        TestItem.objects.filter(test=OuterRef("test_id"))
+        .order_by()
+        .values("test")
+        .annotate(total=Sum("max_score"))
+        .values("total")
+    )
+
+    finalized = 0
+    while True:
+        batch = list(candidates.order_by().values_list("id", flat=True)[:batch_size])
+        if not batch:
+            count_test_attempts(status, count=finalized)
+            return finalized
+        with transaction.atomic():
+            finalized += TestAttempt.objects.filter(id__in=batch, status=AttemptStatus.STARTED.value).update(
+                status=status,
+                finished_at=now,
+                total_score=Coalesce(Subquery(score_sum), Value(0), output_field=decimal_field),
+                max_score=Coalesce(
+                    Subquery(items_max_sum, output_field=decimal_field),
+                    Subquery(applied_max_sum),
+                    Value(0),
+                    output_field=decimal_field,
+                ),
+            )
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterator
+
+from apps.tasks.application.exports import DEFAULT_EXPORT_BATCH_SIZE, date_range_filter, iter_keyset
+from apps.training.models import TaskAttemptHistory
+
+ATTEMPT_EXPORT_FIELDS = (
+    "id",
+    "user_id",
+    "task_id",
+    "task__subject_id",
+    "test_attempt_id",
+    "answer_payload",
+    "score",
+    "is_correct",
+    "submitted_at",
+    "duration_ms",
+    "applied_max_score",
+)
+
+
+def iter_attempt_export(
+    *,
+    subject_id: int | None = None,
+    user_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+) -> Iterator[list[dict]]:
+    """
+    Пачки ответов (горячие и архивные) для выгрузки (фильтры: предмет, пользователь, дата отправки).
+
+    Пример:
+        for chunk in iter_ndjson(iter_attempt_export(user_id=42, date_from=date(2025, 9, 1))):
+            out.write(chunk)
+    """
+    attempts = TaskAttemptHistory.objects.filter(
+        **date_range_filter("submitted_at", date_from=date_from, date_to=date_to)
+    )
+    if subject_id is not None:
+        attempts = attempts.filter(task__subject_id=subject_id)
+    if user_id is not None:
+        attempts = attempts.filter(user_id=user_id)
+
+    for batch in iter_keyset(attempts, fields=ATTEMPT_EXPORT_FIELDS, batch_size=batch_size):
+        for row in batch:
+            row["subject_id"] = row.pop("task__subject_id")
+        yield batch
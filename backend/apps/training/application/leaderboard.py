@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, Sum, When
+from django.utils import timezone
+
+from apps.training.models import LeaderboardBucket, LeaderboardScore, TaskAttemptHistory
+
+ALL_TIME = "all"
+LEADERBOARD_PERIODS = ("week", ALL_TIME)
+
+
+def week_period(day: date) -> str:
+    """
+    Ключ недельного рейтинга (ISO-неделя).
+
+    Пример:
+        week_period(date(2025, 9, 10)) -> "2025-W37"
+    """
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def record_leaderboard_score(*, user, subject_id: int, score: Decimal, submitted_at: datetime) -> None:
+    """
+    Прибавляет баллы ответа к счетчикам рейтинга предмета: за все время и за текущую неделю.
+
+    Нулевые баллы счетчики не меняют (в рейтинг попадают ученики хотя бы с одним баллом).
+    Вместе со счетчиками обновляются корзины `LeaderboardBucket`, по которым считается позиция.
+
+    Пример:
+        record_leaderboard_score(user=request.user, subject_id=1, score=Decimal("1"), submitted_at=timezone.now())
+    """
+    if not score:
+        return
+    periods = (ALL_TIME, week_period(timezone.localdate(submitted_at)))
+    counters = LeaderboardScore.objects.filter(subject_id=subject_id, user=user, period__in=periods)
+    with transaction.atomic():
+        # Counter rows stay locked until the answer commits: the old score tells which bucket to leave.
+        previous = dict(counters.select_for_update().values_list("period", "score"))
+        for period in periods:
+            if period not in previous:
+                previous[period] = _create_counter(user=user, subject_id=subject_id, period=period, score=score)
+        existing = [period for period, old_score in previous.items() if old_score is not None]
+        if existing:
+            counters.filter(period__in=existing).update(score=F("score") + score)
+
+        moves = {}
+        for period, old_score in previous.items():
+            old_bucket = None if old_score is None else _bucket(old_score)
+            new_bucket = _bucket((old_score or 0) + score)
+            if old_bucket != new_bucket:
+                moves[period] = (old_bucket, new_bucket)
+        if moves:
+            _move_between_buckets(subject_id=subject_id, moves=moves)
+
+
+def get_leaderboard(*, subject_id: int, period: str = "week", user=None, limit: int = 10) -> dict:
+    """
+    Топ-N рейтинга предмета и позиция пользователя.
+
+    Позиция — 1 + число учеников с большим баллом (при равенстве баллов позиции совпадают).
+    Топ-N — по индексу (subject, period, score), O(log n + N). Позиция ученика вне топа — сумма счетчиков
+    `LeaderboardBucket` выше его корзины (O(корзин)) плюс ученики его корзины с большим баллом
+    (поиск по тому же индексу в пределах одной корзины), а не подсчет всех строк выше ученика.
+
+    Пример:
+        get_leaderboard(subject_id=1, period="all", user=request.user, limit=10)
+    """
+    period_key = ALL_TIME if period == ALL_TIME else week_period(timezone.localdate())
+    scores = LeaderboardScore.objects.filter(subject_id=subject_id, period=period_key)
+
+    top = []
+    rank = 0
+    previous_score = None
+    for position, row in enumerate(
+        scores.order_by("-score", "user_id").values("user_id", "user__username", "score")[:limit], start=1
+    ):
+        if row["score"] != previous_score:
+            rank, previous_score = position, row["score"]
+        top.append(
+            {"rank": rank, "user_id": row["user_id"], "username": row["user__username"], "score": str(row["score"])}
+        )
+
+    me = None
+    if user is not None:
+        mine = next((row for row in top if row["user_id"] == user.id), None)
+        if mine is not None:
+            me = {"rank": mine["rank"], "score": mine["score"]}
+        else:
+            my_score = scores.filter(user=user).values_list("score", flat=True).first()
+            if my_score is not None:
+                me = {"rank": _rank(subject_id=subject_id, period=period_key, score=my_score), "score": str(my_score)}
+
+    return {"period": period_key, "top": top, "me": me}
+
+
+def rebuild_leaderboards(*, subject_id: int | None = None) -> int:
+    """
+    Пересчитывает рейтинги за все время и за текущую неделю из всей истории ответов (бэкфилл).
+
+    Возвращает число записанных счетчиков.
+
+    Пример:
+        rebuild_leaderboards(subject_id=1)
+    """
+    today = timezone.localdate()
+    monday = today - timedelta(days=today.weekday())
+    week_start = timezone.make_aware(datetime.combine(monday, time.min))
+
+    attempts = TaskAttemptHistory.objects.filter(score__gt=0)
+    if subject_id is not None:
+        attempts = attempts.filter(task__subject_id=subject_id)
+
+    rows = []
+    for period, period_attempts in (
+        (ALL_TIME, attempts),
+        (week_period(today), attempts.filter(submitted_at__gte=week_start)),
+    ):
+        totals = period_attempts.values("task__subject_id", "user_id").annotate(total=Sum("score")).order_by()
+        rows.extend(
+            LeaderboardScore(subject_id=row["task__subject_id"], user_id=row["user_id"], period=period, score=row["total"])
+            for row in totals
+        )
+
+    bucket_counts: dict[tuple, int] = {}
+    for row in rows:
+        key = (row.subject_id, row.period, _bucket(row.score))
+        bucket_counts[key] = bucket_counts.get(key, 0) + 1
+
+    stale = LeaderboardScore.objects.filter(period__in=[ALL_TIME, week_period(today)])
+    stale_buckets = LeaderboardBucket.objects.filter(period__in=[ALL_TIME, week_period(today)])
+    if subject_id is not None:
+        stale = stale.filter(subject_id=subject_id)
+        stale_buckets = stale_buckets.filter(subject_id=subject_id)
+
+    with transaction.atomic():
+        stale.delete()
+        stale_buckets.delete()
+        LeaderboardScore.objects.bulk_create(rows, batch_size=1000)
+        LeaderboardBucket.objects.bulk_create(
+            [
+                LeaderboardBucket(subject_id=subject, period=period, bucket=bucket, user_count=count)
+                for (subject, period, bucket), count in bucket_counts.items()
+            ],
+            batch_size=1000,
+        )
+    return len(rows)
+
+
+def _rank(*, subject_id: int, period: str, score: Decimal) -> int:
+    """
+    Позиция балла в рейтинге: ученики из корзин выше + ученики той же корзины с большим баллом + 1.
+
+    Пример:
+        _rank(subject_id=1, period="all", score=Decimal("18")) -> 15
+    """
+    bucket = _bucket(score)
+    above = LeaderboardBucket.objects.filter(subject_id=subject_id, period=period, bucket__gt=bucket).aggregate(
+        total=Sum("user_count")
+    )["total"]
+    same_bucket = LeaderboardScore.objects.filter(
+        subject_id=subject_id, period=period, score__gt=score, score__lt=bucket + 1
+    ).count()
+    return (above or 0) + same_bucket + 1
+
+
+def _bucket(score: Decimal) -> int:
+    return max(int(score), 0)
+
+
+def _create_counter(*, user, subject_id: int, period: str, score: Decimal) -> Decimal | None:
+    """
+    Создает счетчик с баллом `score`; None — создан. Если параллельный ответ успел создать его раньше,
+    блокирует его и возвращает текущий балл (к нему еще нужно прибавить `score`).
+    """
+    try:
+        with transaction.atomic():
+            LeaderboardScore.objects.create(subject_id=subject_id, period=period, user=user, score=score)
+    except IntegrityError:
+        # A concurrent submit created the counter first.
+        return (
+            LeaderboardScore.objects.select_for_update()
+            .filter(subject_id=subject_id, period=period, user=user)
+            .values_list("score", flat=True)
+            .get()
+        )
+    return None
+
+
+def _move_between_buckets(*, subject_id: int, moves: dict[str, tuple[int | None, int]]) -> None:
+    """
+    Переносит ученика между корзинами (period -> (старая корзина или None, новая)) двумя запросами:
+    вставка недостающих корзин (`ON CONFLICT DO NOTHING`) и один UPDATE всех затронутых корзин.
+    """
+    LeaderboardBucket.objects.bulk_create(
+        [LeaderboardBucket(subject_id=subject_id, period=period, bucket=new) for period, (_, new) in moves.items()],
+        ignore_conflicts=True,
+    )
+    touched = Q()
+    for period, (old, new) in moves.items():
+        touched |= Q(period=period, bucket__in=[old, new])
+    LeaderboardBucket.objects.filter(touched, subject_id=subject_id).update(
+        user_count=Case(
+            *(When(period=period, bucket=new, then=F("user_count") + 1) for period, (_, new) in moves.items()),
+            default=F("user_count") - 1,
+        )
+    )
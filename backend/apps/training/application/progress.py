@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.monitoring.application.metrics import record_cache_lookup
+from apps.training.domain.progress import (
+    RECENT_ACTIVITY_DAYS,
+    Streak,
+    add_recent_activity,
+    current_streak_days,
+    extend_streak,
+)
+from apps.tasks.models import TaskNode
+from apps.training.models import (
+    TaskAttempt,
+    TaskAttemptHistory,
+    UserNodeProgress,
+    UserProgress,
+    UserSubjectProgress,
+)
+from apps.users.models import ParentChildLink
+
+PROGRESS_CACHE_TTL_SECONDS = 5 * 60
+# Parents refresh the page often; a short TTL absorbs that without explicit invalidation.
+CHILDREN_PROGRESS_CACHE_TTL_SECONDS = 60
+CHILDREN_RECENT_ACTIVITY_DAYS = 7
+
+
+def record_progress(*, user, attempt: TaskAttempt, subject_id: int) -> None:
+    """
+    Учитывает новый ответ в агрегатах прогресса (UserProgress + UserSubjectProgress).
+
+    Строка UserProgress блокируется на время обновления, поэтому параллельные ответы
+    одного ученика не теряют инкременты (это же защищает UserSubjectProgress и UserNodeProgress).
+    Кеш прогресса сбрасывается после коммита.
+
+    Пример:
+        record_progress(user=request.user, attempt=attempt, subject_id=task.subject_id)
+    """
+    day = timezone.localdate(attempt.submitted_at)
+
+    with transaction.atomic():
+        progress, _ = UserProgress.objects.select_for_update().get_or_create(user=user)
+
+        first_solve = (
+            attempt.is_correct
+            and not TaskAttemptHistory.objects.filter(user=user, task_id=attempt.task_id, is_correct=True)
+            .exclude(id=attempt.id)
+            .exists()
+        )
+
+        streak = extend_streak(
+            Streak(progress.current_streak_days, progress.longest_streak_days, progress.last_active_date), day
+        )
+        progress.attempt_count += 1
+        progress.correct_count += int(attempt.is_correct)
+        progress.solved_task_count += int(first_solve)
+        progress.current_streak_days = streak.current_days
+        progress.longest_streak_days = streak.longest_days
+        progress.last_active_date = streak.last_active_date
+        progress.recent_activity = add_recent_activity(progress.recent_activity, day, is_correct=attempt.is_correct)
+        progress.save()
+
+        updated = UserSubjectProgress.objects.filter(user=user, subject_id=subject_id).update(
+            attempt_count=F("attempt_count") + 1,
+            correct_count=F("correct_count") + int(attempt.is_correct),
+            solved_task_count=F("solved_task_count") + int(first_solve),
+            total_score=F("total_score") + attempt.score,
+            last_attempt_at=attempt.submitted_at,
+        )
+        if not updated:
+            UserSubjectProgress.objects.create(
+                user=user,
+                subject_id=subject_id,
+                attempt_count=1,
+                correct_count=int(attempt.is_correct),
+                solved_task_count=int(first_solve),
+                total_score=attempt.score,
+                last_attempt_at=attempt.submitted_at,
+            )
+
+        node_ids = list(TaskNode.objects.filter(task_id=attempt.task_id).values_list("node_id", flat=True))
+        if node_ids:
+            node_progress = UserNodeProgress.objects.filter(user=user, node_id__in=node_ids)
+            updated = node_progress.update(
+                attempt_count=F("attempt_count") + 1,
+                correct_count=F("correct_count") + int(attempt.is_correct),
+                last_attempt_at=attempt.submitted_at,
+            )
+            if updated < len(node_ids):
+                existing = set(node_progress.values_list("node_id", flat=True))
+                UserNodeProgress.objects.bulk_create(
+                    [
+                        UserNodeProgress(
+                            user=user,
+                            node_id=node_id,
+                            attempt_count=1,
+                            correct_count=int(attempt.is_correct),
+                            last_attempt_at=attempt.submitted_at,
+                        )
+                        for node_id in node_ids
+                        if node_id not in existing
+                    ]
+                )
+
+        transaction.on_commit(lambda: invalidate_user_progress(user.id))
+
+
+def get_user_progress(*, user, fill_cache: bool = True) -> dict:
+    """
+    Прогресс ученика для страницы прогресса: из кеша или из агрегатов (2 запроса).
+
+    `fill_cache=False` — агрегаты читаются с реплики, результат в кеш не кладется.
+
+    Пример:
+        get_user_progress(user=request.user)
+        # {"attempt_count": 120, "accuracy": 0.75, "current_streak_days": 4, "subjects": [...], ...}
+    """
+    cache_key = _progress_cache_key(user.id)
+    data = cache.get(cache_key)
+    record_cache_lookup("user_progress", hit=data is not None)
+    if data is None:
+        data = _build_user_progress(user.id)
+        if fill_cache:
+            cache.set(cache_key, data, PROGRESS_CACHE_TTL_SECONDS)
+
+    # The streak depends on today's date, so it is derived on read rather than cached.
+    streak = Streak(data["current_streak_days"], data["longest_streak_days"], data["last_active_date"])
+    return {**data, "current_streak_days": current_streak_days(streak, timezone.localdate())}
+
+
+def get_children_progress(*, parent, fill_cache: bool = True) -> list[dict]:
+    """
+    Сводки прогресса всех учеников, привязанных к родителю (`users.ParentChildLink`).
+
+    Агрегаты детей загружаются одним запросом `user_id IN (...)`; результат кешируется на
+    CHILDREN_PROGRESS_CACHE_TTL_SECONDS (`fill_cache=False` — собраны с реплики, в кеш не кладутся).
+
+    Пример:
+        get_children_progress(parent=request.user)
+        # [{"user_id": 42, "username": "ivan", "attempt_count": 120, "accuracy": 0.75, ...}]
+    """
+    cache_key = f"training:children-progress:{parent.id}"
+    children = cache.get(cache_key)
+    record_cache_lookup("children_progress", hit=children is not None)
+    if children is None:
+        links = list(
+            ParentChildLink.objects.filter(parent=parent)
+            .order_by("child__username")
+            .values_list("child_id", "child__username")
+        )
+        progress_by_child = UserProgress.objects.in_bulk([child_id for child_id, _ in links])
+
+        children = []
+        for child_id, username in links:
+            progress = progress_by_child.get(child_id) or UserProgress(user_id=child_id)
+            children.append(
+                {
+                    "user_id": child_id,
+                    "username": username,
+                    "attempt_count": progress.attempt_count,
+                    "correct_count": progress.correct_count,
+                    "accuracy": _accuracy(progress.correct_count, progress.attempt_count),
+                    "solved_task_count": progress.solved_task_count,
+                    "current_streak_days": progress.current_streak_days,
+                    "longest_streak_days": progress.longest_streak_days,
+                    "last_active_date": progress.last_active_date,
+                    "recent_activity": progress.recent_activity[-CHILDREN_RECENT_ACTIVITY_DAYS:],
+                }
+            )
+        if fill_cache:
+            cache.set(cache_key, children, CHILDREN_PROGRESS_CACHE_TTL_SECONDS)
+
+    today = timezone.localdate()
+    return [
+        {
+            **child,
+            "current_streak_days": current_streak_days(
+                Streak(child["current_streak_days"], child["longest_streak_days"], child["last_active_date"]), today
+            ),
+        }
+        for child in children
+    ]
+
+
+def invalidate_user_progress(user_id: int) -> None:
+    """
+    Сбрасывает кеш прогресса ученика и сдвигает его версию (по версиям инвалидируются отчеты по классам).
+
+    Пример:
+        invalidate_user_progress(user_id=42)
+    """
+    cache.delete(_progress_cache_key(user_id))
+    cache.set(_progress_version_key(user_id), time.time_ns(), None)
+
+
+def get_progress_versions(user_ids: list[int]) -> dict[int, int]:
+    """
+    Версии прогресса учеников (одним обращением к кешу); 0 — версия еще не выставлялась.
+
+    Пример:
+        get_progress_versions([1, 2, 3]) -> {1: 1757..., 2: 0, 3: 1757...}
+    """
+    versions = cache.get_many([_progress_version_key(user_id) for user_id in user_ids])
+    return {user_id: versions.get(_progress_version_key(user_id), 0) for user_id in user_ids}
+
+
+def rebuild_user_progress(user_id: int) -> None:
+    """
+    Пересчитывает агрегаты прогресса ученика из всей истории ответов (бэкфилл / исправление расхождений).
+
+    Пример:
+        rebuild_user_progress(user_id=42)
+    """
+    attempts = TaskAttemptHistory.objects.filter(user_id=user_id)
+
+    with transaction.atomic():
+        progress, _ = UserProgress.objects.select_for_update().get_or_create(user_id=user_id)
+
+        subjects = list(
+            attempts.values("task__subject_id").annotate(
+                attempt_count=Count("id"),
+                correct_count=Count("id", filter=Q(is_correct=True)),
+                solved_task_count=Count("task_id", filter=Q(is_correct=True), distinct=True),
+                total_score=Sum("score"),
+                last_attempt_at=Max("submitted_at"),
+            ).order_by()
+        )
+        days = list(
+            attempts.annotate(day=TruncDate("submitted_at"))
+            .values("day")
+            .annotate(attempts=Count("id"), correct=Count("id", filter=Q(is_correct=True)))
+            .order_by("day")
+        )
+
+        streak = Streak()
+        for row in days:
+            streak = extend_streak(streak, row["day"])
+
+        progress.attempt_count = sum(row["attempt_count"] for row in subjects)
+        progress.correct_count = sum(row["correct_count"] for row in subjects)
+        progress.solved_task_count = attempts.filter(is_correct=True).values("task_id").distinct().count()
+        progress.current_streak_days = streak.current_days
+        progress.longest_streak_days = streak.longest_days
+        progress.last_active_date = streak.last_active_date
+        progress.recent_activity = [
+            {"date": row["day"].isoformat(), "attempts": row["attempts"], "correct": row["correct"]}
+            for row in days[-RECENT_ACTIVITY_DAYS:]
+            if (streak.last_active_date - row["day"]).days < RECENT_ACTIVITY_DAYS
+        ]
+        progress.save()
+
+        nodes = list(
+            attempts.filter(task__task_nodes__isnull=False)
+            .values("task__task_nodes__node_id")
+            .annotate(
+                attempt_count=Count("id"),
+                correct_count=Count("id", filter=Q(is_correct=True)),
+                last_attempt_at=Max("submitted_at"),
+            )
+            .order_by()
+        )
+        UserNodeProgress.objects.filter(user_id=user_id).delete()
+        UserNodeProgress.objects.bulk_create(
+            [
+                UserNodeProgress(
+                    user_id=user_id,
+                    node_id=row["task__task_nodes__node_id"],
+                    attempt_count=row["attempt_count"],
+                    correct_count=row["correct_count"],
+                    last_attempt_at=row["last_attempt_at"],
+                )
+                for row in nodes
+            ]
+        )
+
+        UserSubjectProgress.objects.filter(user_id=user_id).delete()
+        UserSubjectProgress.objects.bulk_create(
+            [
+                UserSubjectProgress(
+                    user_id=user_id,
+                    subject_id=row["task__subject_id"],
+                    attempt_count=row["attempt_count"],
+                    correct_count=row["correct_count"],
+                    solved_task_count=row["solved_task_count"],
+                    total_score=row["total_score"],
+                    last_attempt_at=row["last_attempt_at"],
+                )
+                for row in subjects
+            ]
+        )
+
+        transaction.on_commit(lambda: invalidate_user_progress(user_id))
+
+
+def rebuild_all_user_progress(*, batch_size: int = 1000) -> int:
+    """
+    Пересчитывает прогресс всех пользователей с ответами (обход пользователей по id пачками).
+
+    Пример:
+        rebuild_all_user_progress()  # -> число пересчитанных пользователей
+    """
+    User = get_user_model()
+    rebuilt = 0
+    last_id = 0
+    while True:
+        user_ids = list(
+            User.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+        )
+        if not user_ids:
+            return rebuilt
+        active_ids = set(
+            TaskAttemptHistory.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True).distinct()
+        )
+        for user_id in user_ids:
+            if user_id in active_ids:
+                rebuild_user_progress(user_id)
+                rebuilt += 1
+        last_id = user_ids[-1]
+
+
+def _build_user_progress(user_id: int) -> dict:
+    progress = UserProgress.objects.filter(user_id=user_id).first() or UserProgress(user_id=user_id)
+    subjects = UserSubjectProgress.objects.select_related("subject").filter(user_id=user_id).order_by("subject_id")
+
+    return {
+        "attempt_count": progress.attempt_count,
+        "correct_count": progress.correct_count,
+        "accuracy": _accuracy(progress.correct_count, progress.attempt_count),
+        "solved_task_count": progress.solved_task_count,
+        "current_streak_days": progress.current_streak_days,
+        "longest_streak_days": progress.longest_streak_days,
+        "last_active_date": progress.last_active_date,
+        "subjects": [
+            {
+                "subject_id": subject.subject_id,
+                "subject_title": subject.subject.title,
+                "attempt_count": subject.attempt_count,
+                "correct_count": subject.correct_count,
+                "accuracy": _accuracy(subject.correct_count, subject.attempt_count),
+                "solved_task_count": subject.solved_task_count,
+                "total_score": str(subject.total_score),
+                "last_attempt_at": subject.last_attempt_at,
+            }
+            for subject in subjects
+        ],
+        "recent_activity": progress.recent_activity,
+    }
+
+
+def _accuracy(correct: int, total: int) -> float | None:
+    return round(correct / total, 4) if total else None
+
+
+def _progress_cache_key(user_id: int) -> str:
+    return f"training:progress:{user_id}"
+
+
+def _progress_version_key(user_id: int) -> str:
+    return f"training:progress-version:{user_id}"
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max, QuerySet
+from django.utils import timezone
+
+from apps.training.domain import spaced_repetition
+from apps.training.models import ReviewSchedule
+
+
+def record_review(*, user, task_id: int, is_correct: bool, reviewed_at: datetime) -> ReviewSchedule:
+    """
+    Обновляет расписание повторения задания после ответа пользователя (SM-2).
+
+    Пример:
+        record_review(user=request.user, task_id=123, is_correct=True, reviewed_at=timezone.now())
+    """
+    quality = spaced_repetition.quality_for_answer(is_correct)
+    schedules = ReviewSchedule.objects.select_for_update().filter(user=user, task_id=task_id)
+
+    with transaction.atomic():
+        schedule = schedules.first()
+        if schedule is None:
+            try:
+                with transaction.atomic():
+                    return _save_review(ReviewSchedule(user=user, task_id=task_id), quality, reviewed_at)
+            except IntegrityError:
+                # A concurrent first answer created the row (nothing was locked): review on top of it.
+                schedule = schedules.get()
+        return _save_review(schedule, quality, reviewed_at)
+
+
+def get_review_queue(*, user, limit: int = 20, subject_id: int | None = None) -> QuerySet[ReviewSchedule]:
+    """
+    Возвращает задания, которые пора повторить (по индексу (user, due_at)).
+
+    Пример:
+        queue = get_review_queue(user=request.user, limit=10)
+    """
+    schedules = ReviewSchedule.objects.select_related("task").filter(user=user, due_at__lte=timezone.now())
+    if subject_id is not None:
+        schedules = schedules.filter(task__subject_id=subject_id)
+    return schedules.order_by("due_at")[:limit]
+
+
+def compact_review_schedules(*, inactive_days: int, batch_size: int = 1000) -> int:
+    """
+    Удаляет расписания пользователей, которые не занимались дольше `inactive_days`.
+
+    При возвращении пользователя расписание заново наполнится его новыми ответами.
+
+    Пример:
+        deleted = compact_review_schedules(inactive_days=90)
+    """
+    cutoff = timezone.now() - timedelta(days=inactive_days)
+    inactive_user_ids = list(
+        ReviewSchedule.objects.values("user_id")
+        .annotate(last_reviewed_at=Max("last_reviewed_at"))
+        .filter(last_reviewed_at__lt=cutoff)
+        .values_list("user_id", flat=True)
+    )
+
+    deleted = 0
+    for start in range(0, len(inactive_user_ids), batch_size):
+        batch = inactive_user_ids[start:start + batch_size]
+        count, _ = ReviewSchedule.objects.filter(user_id__in=batch, last_reviewed_at__lt=cutoff).delete()
+        deleted += count
+    return deleted
+
+
+def _save_review(schedule: ReviewSchedule, quality: int, reviewed_at: datetime) -> ReviewSchedule:
+    state = spaced_repetition.review(
+        spaced_repetition.ReviewState(
+            repetitions=schedule.repetitions,
+            interval_days=schedule.interval_days,
+            ease_factor=schedule.ease_factor,
+        ),
+        quality,
+    )
+    schedule.repetitions = state.repetitions
+    schedule.interval_days = state.interval_days
+    schedule.ease_factor = state.ease_factor
+    schedule.last_reviewed_at = reviewed_at
+    schedule.due_at = reviewed_at + timedelta(days=state.interval_days)
+    schedule.save()
+    return schedule
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.training.application.aggregation import (
+    DEFAULT_AGGREGATION_BATCH_SIZE,
+    DEFAULT_AGGREGATION_LAG_MINUTES,
+    process_new_attempts,
+)
+from apps.training.domain.hyperloglog import empty_sketch, sketch_add
+from apps.training.models import DailyActivityRollup, DailySubjectRollup, DailyUserRollup
+
+DAILY_ROLLUPS_CURSOR = "daily_rollups"
+
+ROLLUP_FIELDS = ["attempt_count", "correct_count", "total_score", "total_duration_ms"]
+
+
+def build_daily_rollups(
+    *,
+    batch_size: int = DEFAULT_AGGREGATION_BATCH_SIZE,
+    lag_minutes: int = DEFAULT_AGGREGATION_LAG_MINUTES,
+) -> int:
+    """
+    Инкрементально дописывает новые ответы в дневные сводки (DailySubjectRollup, DailyUserRollup,
+    DailyActivityRollup).
+
+    Повторный запуск безопасен: сводки и курсор обновляются в одной транзакции на пачку,
+    поэтому каждый ответ учитывается ровно один раз.
+
+    Пример:
+        build_daily_rollups()  # -> число обработанных ответов
+    """
+    return process_new_attempts(
+        DAILY_ROLLUPS_CURSOR,
+        _apply_batch,
+        fields=["user_id", "task__subject_id", "task__task_type", "is_correct", "score", "duration_ms", "submitted_at"],
+        batch_size=batch_size,
+        lag_minutes=lag_minutes,
+    )
+
+
+def _apply_batch(rows: list[tuple]) -> None:
+    subject_deltas: dict[tuple, list] = {}
+    user_deltas: dict[tuple, list] = {}
+    for _, user_id, subject_id, task_type, is_correct, score, duration_ms, submitted_at in rows:
+        day = timezone.localdate(submitted_at)
+        for deltas, key in ((subject_deltas, (day, subject_id, task_type)), (user_deltas, (day, user_id))):
+            delta = deltas.get(key)
+            if delta is None:
+                delta = deltas[key] = [0, 0, Decimal(0), 0]
+            delta[0] += 1
+            delta[1] += int(is_correct)
+            delta[2] += score
+            delta[3] += duration_ms or 0
+
+    days = {key[0] for key in subject_deltas}
+    _merge(
+        DailySubjectRollup,
+        DailySubjectRollup.objects.filter(date__in=days, subject_id__in={key[1] for key in subject_deltas}),
+        key=lambda rollup: (rollup.date, rollup.subject_id, rollup.task_type),
+        deltas=subject_deltas,
+        new=lambda key: DailySubjectRollup(date=key[0], subject_id=key[1], task_type=key[2]),
+    )
+    new_user_rollups = _merge(
+        DailyUserRollup,
+        DailyUserRollup.objects.filter(date__in=days, user_id__in={key[1] for key in user_deltas}),
+        key=lambda rollup: (rollup.date, rollup.user_id),
+        deltas=user_deltas,
+        new=lambda key: DailyUserRollup(date=key[0], user_id=key[1]),
+    )
+    _record_active_users(new_user_rollups)
+
+
+def _record_active_users(new_user_rollups: list[DailyUserRollup]) -> None:
+    """
+    Учитывает пользователей, впервые ответивших в этот день, в DailyActivityRollup (счетчик и скетч).
+
+    Пример:
+        _record_active_users([DailyUserRollup(date=date(2025, 9, 1), user_id=42)])
+    """
+    if not new_user_rollups:
+        return
+    existing = {
+        row.date: row
+        for row in DailyActivityRollup.objects.filter(date__in={rollup.date for rollup in new_user_rollups})
+    }
+    created = {}
+    for rollup in new_user_rollups:
+        row = existing.get(rollup.date) or created.get(rollup.date)
+        if row is None:
+            row = created[rollup.date] = DailyActivityRollup(date=rollup.date)
+        if not isinstance(row.users_sketch, bytearray):
+            row.users_sketch = bytearray(row.users_sketch) or empty_sketch()
+        row.active_users += 1
+        sketch_add(row.users_sketch, rollup.user_id)
+
+    DailyActivityRollup.objects.bulk_create(created.values())
+    DailyActivityRollup.objects.bulk_update(existing.values(), fields=["active_users", "users_sketch"])
+
+
+def _merge(model, existing, *, key, deltas: dict[tuple, list], new) -> list:
+    """
+    Прибавляет дельты к существующим строкам сводки (bulk_update) и создает недостающие (bulk_create).
+
+    Возвращает созданные строки.
+
+    Пример:
+        _merge(DailyUserRollup, qs, key=lambda r: (r.date, r.user_id), deltas=deltas, new=make_row)
+    """
+    rollups = {key(rollup): rollup for rollup in existing}
+    created, updated = [], []
+    for rollup_key, (attempts, correct, score, duration) in deltas.items():
+        rollup = rollups.get(rollup_key)
+        if rollup is None:
+            rollup = new(rollup_key)
+            created.append(rollup)
+        else:
+            updated.append(rollup)
+        rollup.attempt_count += attempts
+        rollup.correct_count += correct
+        rollup.total_score += score
+        rollup.total_duration_ms += duration
+
+    model.objects.bulk_create(created)
+    model.objects.bulk_update(updated, fields=ROLLUP_FIELDS)
+    return created
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import transaction
+
+from apps.training.domain.enums import AttemptStatus
+from apps.training.domain.percentile import empty_score_histogram, percentile_from_histogram, score_bucket
+from apps.training.models import ExamTypeScoreHistogram, Test, TestAttempt, TestItem, TestScoreHistogram
+
+
+def record_test_score(*, test: Test, total_score: Decimal, max_score: Decimal) -> None:
+    """
+    Добавляет результат завершенной попытки в гистограмму ее когорты (строка блокируется на время обновления).
+
+    Когорта — тест, а для экзаменационного варианта — его `ExamType` (см. `ExamTypeScoreHistogram`).
+
+    Пример:
+        record_test_score(test=attempt.test, total_score=Decimal("7"), max_score=Decimal("10"))
+    """
+    bucket = score_bucket(float(total_score), float(max_score))
+    model, lookup = _cohort(test)
+    with transaction.atomic():
+        histogram, _ = model.objects.select_for_update().get_or_create(
+            **lookup, defaults={"buckets": empty_score_histogram()}
+        )
+        buckets = list(histogram.buckets) or empty_score_histogram()
+        buckets[bucket] += 1
+        histogram.buckets = buckets
+        histogram.attempt_count += 1
+        histogram.save(update_fields=["buckets", "attempt_count", "updated_at"])
+
+
+def get_score_percentile(test_attempt: TestAttempt) -> float | None:
+    """
+    Процентиль результата завершенной попытки среди остальных завершенных попыток когорты (1 запрос).
+
+    Сама попытка уже в гистограмме и из сравнения исключается; None — сравнивать не с чем.
+
+    Пример:
+        get_score_percentile(attempt) -> 72.5
+    """
+    if test_attempt.status != AttemptStatus.FINISHED.value:
+        return None
+    model, lookup = _cohort(test_attempt.test)
+    buckets = model.objects.filter(**lookup).values_list("buckets", flat=True).first()
+    if not buckets:
+        return None
+    bucket = score_bucket(float(test_attempt.total_score), float(test_attempt.max_score))
+    others = list(buckets)
+    others[bucket] = max(others[bucket] - 1, 0)
+    return percentile_from_histogram(others, bucket)
+
+
+def rebuild_score_histograms(*, test_id: int | None = None) -> int:
+    """
+    Пересчитывает гистограммы подготовленных тестов и экзаменационных треков из завершенных попыток (бэкфилл).
+
+    Для варианта экзамена (`test_id`) пересчитывается гистограмма всего его трека.
+    Возвращает число пересчитанных гистограмм.
+
+    Пример:
+        rebuild_score_histograms(test_id=777)
+    """
+    tests = Test.objects.filter(id__in=TestItem.objects.values("test_id"))
+    if test_id is not None:
+        tests = tests.filter(id=test_id)
+
+    finished = TestAttempt.objects.filter(status=AttemptStatus.FINISHED.value)
+    cohorts = [
+        (TestScoreHistogram, {"test_id": current_id}, finished.filter(test_id=current_id))
+        for current_id in tests.filter(exam_type__isnull=True).values_list("id", flat=True)
+    ] + [
+        (ExamTypeScoreHistogram, {"exam_type_id": exam_type_id}, finished.filter(test__exam_type_id=exam_type_id))
+        for exam_type_id in tests.filter(exam_type__isnull=False).values_list("exam_type_id", flat=True).distinct()
+    ]
+
+    for model, lookup, attempts in cohorts:
+        buckets = empty_score_histogram()
+        for total_score, max_score in attempts.values_list("total_score", "max_score").iterator():
+            buckets[score_bucket(float(total_score), float(max_score))] += 1
+        model.objects.update_or_create(**lookup, defaults={"buckets": buckets, "attempt_count": sum(buckets)})
+    return len(cohorts)
+
+
+def _cohort(test: Test) -> tuple[type, dict]:
+    if test.exam_type_id is not None:
+        return ExamTypeScoreHistogram, {"exam_type_id": test.exam_type_id}
+    return TestScoreHistogram, {"test_id": test.id}
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+from apps.training.infrastructure.npy import append_column
+from apps.training.models import TaskAttemptHistory
+
+DEFAULT_SNAPSHOT_BATCH_SIZE = 50_000
+# Rows younger than this are left for the next run: a transaction that took a lower id
+# may still be in flight, and the id high-water mark would skip it forever.
+DEFAULT_SNAPSHOT_LAG_MINUTES = 5
+MANIFEST_NAME = "manifest.json"
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+@dataclass(frozen=True)
+class SnapshotColumn:
+    name: str
+    descr: str  # NumPy dtype string
+    typecode: str  # array module typecode of the same width
+
+
+COLUMNS = (
+    SnapshotColumn("user_id", "<i8", "q"),
+    SnapshotColumn("task_id", "<i8", "q"),
+    SnapshotColumn("subject_id", "<i8", "q"),
+    SnapshotColumn("is_correct", "|b1", "B"),
+    SnapshotColumn("score", "<f8", "d"),
+    # -1 when duration is unknown.
+    SnapshotColumn("duration_ms", "<i4", "i"),
+    SnapshotColumn("submitted_at", "<M8[us]", "q"),
+)
+
+
+def snapshot_task_attempts(
+    root: str,
+    *,
+    batch_size: int = DEFAULT_SNAPSHOT_BATCH_SIZE,
+    lag_minutes: int = DEFAULT_SNAPSHOT_LAG_MINUTES,
+) -> dict[str, int]:
+    """
+    Дописывает новые TaskAttempt в колоночный снапшот: `<root>/<YYYY-MM>/<column>.npy` + `manifest.json`.
+
+    - каждая колонка — типизированный одномерный массив `.npy` (читается через `numpy.load(..., mmap_mode="r")`);
+    - партиции по месяцу `submitted_at` (UTC);
+    - инкрементально: в манифесте хранится high-water mark `last_id`, читаются только новые строки
+      (keyset по `id`, `.values_list()`); манифест переписывается атомарно после каждой пачки;
+    - читает `TaskAttemptHistory`: строки, перенесенные в архив до очередного запуска, не теряются.
+
+    Возвращает партиция -> сколько строк дописано.
+
+    Пример:
+        snapshot_task_attempts("/data/attempts")
+        # {"2025-09": 120000, "2025-10": 3400}
+    """
+    os.makedirs(root, exist_ok=True)
+    manifest = _read_manifest(root)
+    cutoff = timezone.now() - timedelta(minutes=lag_minutes)
+
+    appended: dict[str, int] = {}
+    while True:
+        rows = list(
+            TaskAttemptHistory.objects.filter(id__gt=manifest["last_id"])
+            .order_by("id")
+            .values_list(
+                "id",
+                "user_id",
+                "task_id",
+                "task__subject_id",
+                "is_correct",
+                "score",
+                "duration_ms",
+                "submitted_at",
+            )[:batch_size]
+        )
+        # Stop at the first row inside the lag window rather than skip it: `submitted_at` is stamped before
+        # the INSERT, so a lower id may carry a later time and the high-water mark would pass it for good.
+        ready = next((index for index, row in enumerate(rows) if row[-1] >= cutoff), len(rows))
+        if not ready:
+            return appended
+        fresh = ready < len(rows)
+        rows = rows[:ready]
+
+        partitions: dict[str, dict[str, array]] = {}
+        for _, user_id, task_id, subject_id, is_correct, score, duration_ms, submitted_at in rows:
+            month = submitted_at.astimezone(dt_timezone.utc).strftime("%Y-%m")
+            columns = partitions.get(month)
+            if columns is None:
+                columns = partitions[month] = {column.name: array(column.typecode) for column in COLUMNS}
+            columns["user_id"].append(user_id)
+            columns["task_id"].append(task_id)
+            columns["subject_id"].append(subject_id)
+            columns["is_correct"].append(int(is_correct))
+            columns["score"].append(float(score))
+            columns["duration_ms"].append(-1 if duration_ms is None else duration_ms)
+            columns["submitted_at"].append((submitted_at - EPOCH) // timedelta(microseconds=1))
+
+        for month, columns in partitions.items():
+            directory = os.path.join(root, month)
+            os.makedirs(directory, exist_ok=True)
+            rows_before = manifest["partitions"].get(month, {}).get("rows", 0)
+            for column in COLUMNS:
+                rows_after = append_column(
+                    os.path.join(directory, f"{column.name}.npy"),
+                    descr=column.descr,
+                    values=columns[column.name],
+                    rows_before=rows_before,
+                )
+            manifest["partitions"][month] = {"rows": rows_after}
+            appended[month] = appended.get(month, 0) + rows_after - rows_before
+
+        manifest["last_id"] = rows[-1][0]
+        manifest["updated_at"] = timezone.now().isoformat()
+        _write_manifest(root, manifest)
+        if fresh:
+            return appended
+
+
+def _read_manifest(root: str) -> dict:
+    path = os.path.join(root, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {
+            "columns": {column.name: column.descr for column in COLUMNS},
+            "last_id": 0,
+            "partitions": {},
+        }
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_manifest(root: str, manifest: dict) -> None:
+    path = os.path.join(root, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
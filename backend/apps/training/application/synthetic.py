@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.graph.domain.enums import NodeType, RelationType
+from apps.graph.models import Concept, Node, Relation, Subject
+from apps.tasks.domain.answer_key import validate_answer_key
+from apps.tasks.domain.enums import TaskType
+from apps.tasks.models import Task, TaskNode
+from apps.training.models import TaskAttempt
+
+DEFAULT_SYNTHETIC_BATCH_SIZE = 10_000
+DEFAULT_SYNTHETIC_PASSWORD = "load-password-1"
+DEFAULT_SYNTHETIC_USER_PREFIX = "load-student-"
+
+NODE_TYPE_WEIGHTS = {
+    NodeType.CONCEPT: 50,
+    NodeType.SKILL: 30,
+    NodeType.LAW: 15,
+    NodeType.CASE: 5,
+}
+TASK_TYPE_WEIGHTS = {
+    TaskType.NUMBER: 35,
+    TaskType.SHORT_TEXT: 25,
+    TaskType.SINGLE_CHOICE: 20,
+    TaskType.MULTI_CHOICE: 10,
+    TaskType.MATCH: 10,
+}
+# Long tails: a few users and tasks get most of the attempts (user weight capped so no one dominates).
+USER_ACTIVITY_PARETO_ALPHA = 1.2
+USER_ACTIVITY_MAX_WEIGHT = 100
+TASK_POPULARITY_ZIPF_EXPONENT = 0.8
+
+
+class SyntheticDataExists(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class SyntheticVolumes:
+    subjects: int = 3
+    concepts_per_subject: int = 20
+    nodes_per_concept: int = 10
+    tasks: int = 100_000
+    users: int = 10_000
+    attempts: int = 1_000_000
+    days: int = 365
+
+
+def seed_synthetic(
+    volumes: SyntheticVolumes,
+    *,
+    seed: int = 1,
+    batch_size: int = DEFAULT_SYNTHETIC_BATCH_SIZE,
+    password: str = DEFAULT_SYNTHETIC_PASSWORD,
+    user_prefix: str = DEFAULT_SYNTHETIC_USER_PREFIX,
+    log: Callable[[str], None] = lambda message: None,
+) -> dict[str, int]:
+    """
+    Генерирует синтетический набор данных для бенчмарков (детерминированно по `seed`).
+
+    - предметы → темы (Concept) → вершины графа с DAG пререквизитов (ребра только к более ранним вершинам,
+      в основном внутри темы и к соседним темам);
+    - задания всех типов с валидными `answer_key`, сложность растет с глубиной вершины в DAG;
+    - ученики (один хеш пароля на всех — можно логиниться нагрузочным драйвером);
+    - ответы: активность учеников по Парето, популярность заданий по Ципфу, верность — по IRT
+      (способность ученика против сложности задания), время — со смещением к последним дням.
+
+    Все вставки пачками по `batch_size`; ответы пишутся `executemany` в обход ORM
+    (`submitted_at` — auto_now_add, bulk_create его перезаписал бы).
+
+    Пример:
+        seed_synthetic(SyntheticVolumes(tasks=200_000, attempts=20_000_000), seed=7)
+        # {"subjects": 3, "concepts": 60, "nodes": 600, "relations": 1140, "tasks": 200000, ...}
+    """
+    rng = random.Random(seed)
+    titles = [f"Synthetic {seed}-{index + 1}" for index in range(volumes.subjects)]
+    if Subject.objects.filter(title__in=titles).exists():
+        raise SyntheticDataExists(f"Synthetic data for seed {seed} already exists.")
+
+    counts = {}
+    with transaction.atomic():
+        subjects = Subject.objects.bulk_create([Subject(title=title) for title in titles])
+        counts["subjects"] = len(subjects)
+        nodes_by_subject, depths, concept_count, relation_count = _seed_graph(
+            subjects, volumes=volumes, rng=rng, batch_size=batch_size
+        )
+        counts["concepts"] = concept_count
+        counts["nodes"] = sum(len(nodes) for nodes in nodes_by_subject.values())
+        counts["relations"] = relation_count
+    log(f"Graph: {counts['concepts']} concepts, {counts['nodes']} nodes, {counts['relations']} relations.")
+
+    task_params = _seed_tasks(
+        nodes_by_subject, depths, volumes=volumes, seed=seed, rng=rng, batch_size=batch_size, log=log
+    )
+    counts["tasks"] = len(task_params)
+
+    user_ids = _seed_users(volumes.users, password=password, user_prefix=user_prefix, seed=seed, batch_size=batch_size)
+    counts["users"] = len(user_ids)
+    log(f"Users: {len(user_ids)}.")
+
+    counts["attempts"] = _seed_attempts(
+        user_ids, task_params, volumes=volumes, rng=rng, batch_size=batch_size, log=log
+    )
+    return counts
+
+
+def _seed_graph(subjects, *, volumes: SyntheticVolumes, rng: random.Random, batch_size: int):
+    """
+    Темы, вершины и ребра DAG. Вершины пронумерованы в топологическом порядке внутри предмета.
+
+    Возвращает вершины по предметам, глубину каждой вершины (длина самой длинной цепочки пререквизитов),
+    число тем и ребер.
+    """
+    concepts = Concept.objects.bulk_create(
+        [
+            Concept(title=f"{subject.title} / тема {index + 1}", subject=subject)
+            for subject in subjects
+            for index in range(volumes.concepts_per_subject)
+        ],
+        batch_size=batch_size,
+    )
+    node_types = list(NODE_TYPE_WEIGHTS)
+    node_type_weights = list(NODE_TYPE_WEIGHTS.values())
+    nodes = Node.objects.bulk_create(
+        [
+            Node(
+                title=f"{concept.title} / вершина {index + 1}",
+                type=rng.choices(node_types, node_type_weights)[0].value,
+                subject_id=concept.subject_id,
+                concept=concept,
+            )
+            for concept in concepts
+            for index in range(volumes.nodes_per_concept)
+        ],
+        batch_size=batch_size,
+    )
+
+    nodes_by_subject: dict[int, list[Node]] = {}
+    for node in nodes:
+        nodes_by_subject.setdefault(node.subject_id, []).append(node)
+
+    depths: dict[int, int] = {}
+    edges: set[tuple[int, int, str]] = set()
+    for subject_nodes in nodes_by_subject.values():
+        for index, node in enumerate(subject_nodes):
+            parents = set()
+            if index:
+                # 1-3 prerequisites, mostly recent nodes (same or neighbouring concept).
+                for _ in range(rng.choice((1, 1, 2, 2, 3))):
+                    distance = min(int(rng.expovariate(1 / volumes.nodes_per_concept)) + 1, index)
+                    parents.add(subject_nodes[index - distance])
+            depths[node.id] = max((depths[parent.id] + 1 for parent in parents), default=0)
+            for parent in parents:
+                relation_type = RelationType.PREREQUISITE if rng.random() < 0.85 else RelationType.DEPENDS_ON
+                edges.add((parent.id, node.id, relation_type.value))
+
+    Relation.objects.bulk_create(
+        [Relation(parent_id=parent_id, child_id=child_id, type=relation_type) for parent_id, child_id, relation_type in edges],
+        batch_size=batch_size,
+    )
+    return nodes_by_subject, depths, len(concepts), len(edges)
+
+
+def _seed_tasks(
+    nodes_by_subject: dict[int, list[Node]],
+    depths: dict[int, int],
+    *,
+    volumes: SyntheticVolumes,
+    seed: int,
+    rng: random.Random,
+    batch_size: int,
+    log: Callable[[str], None],
+) -> list[tuple[int, float, float]]:
+    """
+    Задания пачками; возвращает (task_id, irt_difficulty, irt_discrimination) для генерации ответов.
+    """
+    task_types = list(TASK_TYPE_WEIGHTS)
+    task_type_weights = list(TASK_TYPE_WEIGHTS.values())
+    subject_ids = list(nodes_by_subject)
+    max_depth = max(depths.values(), default=0) or 1
+
+    params = []
+    for start in range(0, volumes.tasks, batch_size):
+        tasks, node_ids = [], []
+        for index in range(start, min(start + batch_size, volumes.tasks)):
+            subject_nodes = nodes_by_subject[subject_ids[index % len(subject_ids)]]
+            nodes = rng.sample(subject_nodes, min(rng.choice((1, 1, 2)), len(subject_nodes)))
+            depth = max(depths[node.id] for node in nodes) / max_depth
+            task_type = rng.choices(task_types, task_type_weights)[0]
+            answer_key, type_payload = _answer_key(task_type, rng)
+            tasks.append(
+                Task(
+                    external_id=f"synthetic-{seed}-{index + 1}",
+                    subject_id=nodes[0].subject_id,
+                    task_type=task_type.value,
+                    prompt=f"Синтетическое задание {index + 1}",
+                    solution_text="",
+                    type_payload=type_payload,
+                    answer_key=answer_key,
+                    irt_difficulty=round(rng.gauss(4 * depth - 2, 0.8), 3),
+                    irt_discrimination=round(rng.lognormvariate(0, 0.3), 3),
+                )
+            )
+            node_ids.append([node.id for node in nodes])
+
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            TaskNode.objects.bulk_create(
+                [TaskNode(task_id=task.id, node_id=node_id) for task, ids in zip(tasks, node_ids) for node_id in ids]
+            )
+        params.extend((task.id, task.irt_difficulty, task.irt_discrimination) for task in tasks)
+        log(f"Tasks: {len(params)}/{volumes.tasks}.")
+    return params
+
+
+def _answer_key(task_type: TaskType, rng: random.Random) -> tuple[dict, dict]:
+    """
+    Валидный `answer_key` и `type_payload` для типа задания.
+
+    Пример:
+        _answer_key(TaskType.NUMBER, random.Random(1)) -> ({"correct": [12.5], "tolerance": 0.01}, {})
+    """
+    options = ["a", "b", "c", "d"]
+    if task_type == TaskType.NUMBER:
+        answer_key = {"correct": [round(rng.uniform(-100, 100), 1)], "tolerance": 0.01}
+        payload = {}
+    elif task_type == TaskType.SHORT_TEXT:
+        answer_key = {"correct": [rng.choice(["масса", "сила", "скорость", "энергия", "импульс"])]}
+        payload = {}
+    elif task_type == TaskType.SINGLE_CHOICE:
+        answer_key = {"correct": rng.choice(options)}
+        payload = {"options": options}
+    elif task_type == TaskType.MULTI_CHOICE:
+        answer_key = {"correct": sorted(rng.sample(options, rng.randint(2, 3)))}
+        payload = {"options": options}
+    else:
+        right = rng.sample(options, 3)
+        answer_key = {"correct": {str(index + 1): value for index, value in enumerate(right)}}
+        payload = {"left": ["1", "2", "3"], "right": options}
+    assert not validate_answer_key(task_type.value, answer_key)
+    return answer_key, payload
+
+
+def _seed_users(count: int, *, password: str, user_prefix: str, seed: int, batch_size: int) -> list[int]:
+    User = get_user_model()
+    if User.objects.filter(username=f"{user_prefix}0").exists():
+        # Users are shared across seeds (the load driver logs in as <prefix><n>): reuse them.
+        return list(User.objects.filter(username__startswith=user_prefix).order_by("id").values_list("id", flat=True)[:count])
+
+    # Hashing once: PBKDF2 per user would dominate the run time.
+    password_hash = make_password(password)
+    users = User.objects.bulk_create(
+        [User(username=f"{user_prefix}{index}", password=password_hash) for index in range(count)],
+        batch_size=batch_size,
+    )
+    return [user.id for user in users]
+
+
+def _seed_attempts(
+    user_ids: list[int],
+    task_params: list[tuple[int, float, float]],
+    *,
+    volumes: SyntheticVolumes,
+    rng: random.Random,
+    batch_size: int,
+    log: Callable[[str], None],
+) -> int:
+    """
+    Ответы пачками через `executemany`: одна транзакция на пачку.
+    """
+    if not user_ids or not task_params:
+        return 0
+
+    abilities = [rng.gauss(0, 1) for _ in user_ids]
+    user_weights = list(
+        accumulate(min(rng.paretovariate(USER_ACTIVITY_PARETO_ALPHA), USER_ACTIVITY_MAX_WEIGHT) for _ in user_ids)
+    )
+    task_order = list(range(len(task_params)))
+    rng.shuffle(task_order)
+    task_weights = list(accumulate(1 / (rank + 1) ** TASK_POPULARITY_ZIPF_EXPONENT for rank in range(len(task_order))))
+
+    ops = connection.ops
+    fields = [
+        "user_id",
+        "task_id",
+        "answer_payload",
+        "score",
+        "is_correct",
+        "submitted_at",
+        "duration_ms",
+        "applied_scoring_policy",
+        "applied_max_score",
+    ]
+    meta = TaskAttempt._meta
+    columns = ", ".join(ops.quote_name(meta.get_field(name).column) for name in fields)
+    sql = f"INSERT INTO {ops.quote_name(meta.db_table)} ({columns}) VALUES ({', '.join(['%s'] * len(fields))})"
+
+    empty_payload = meta.get_field("answer_payload").get_db_prep_save({}, connection)
+    scoring_policy = meta.get_field("applied_scoring_policy").get_db_prep_save({"mode": "binary"}, connection)
+    zero = ops.adapt_decimalfield_value(Decimal("0"), 8, 2)
+    one = ops.adapt_decimalfield_value(Decimal("1"), 8, 2)
+    now = timezone.now()
+    window_seconds = volumes.days * 24 * 60 * 60
+
+    inserted = 0
+    while inserted < volumes.attempts:
+        size = min(batch_size, volumes.attempts - inserted)
+        user_indexes = rng.choices(range(len(user_ids)), cum_weights=user_weights, k=size)
+        task_ranks = rng.choices(range(len(task_order)), cum_weights=task_weights, k=size)
+        rows = []
+        for user_index, task_rank in zip(user_indexes, task_ranks):
+            task_id, difficulty, discrimination = task_params[task_order[task_rank]]
+            is_correct = rng.random() < 1 / (1 + math.exp(-discrimination * (abilities[user_index] - difficulty)))
+            # Squared uniform: recent days are denser, as on a growing platform.
+            age_seconds = window_seconds * rng.random() ** 2
+            rows.append(
+                (
+                    user_ids[user_index],
+                    task_id,
+                    empty_payload,
+                    one if is_correct else zero,
+                    is_correct,
+                    ops.adapt_datetimefield_value(now - timedelta(seconds=age_seconds)),
+                    min(int(rng.lognormvariate(10.3, 0.7)), 3_600_000),
+                    scoring_policy,
+                    one,
+                )
+            )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+        inserted += size
+        if inserted % (batch_size * 10) == 0 or inserted == volumes.attempts:
+            log(f"Attempts: {inserted}/{volumes.attempts}.")
+    return inserted
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from apps.tasks.domain.stats import duration_bucket, empty_histogram, histogram_median
+from apps.tasks.models import TaskStats
+from apps.training.application.aggregation import (
+    DEFAULT_AGGREGATION_BATCH_SIZE,
+    DEFAULT_AGGREGATION_LAG_MINUTES,
+    process_new_attempts,
+)
+
+TASK_STATS_CURSOR = "task_stats"
+
+TASK_STATS_FIELDS = ["attempt_count", "correct_count", "solve_rate", "duration_histogram", "median_duration_ms"]
+
+
+def refresh_task_stats(
+    *,
+    batch_size: int = DEFAULT_AGGREGATION_BATCH_SIZE,
+    lag_minutes: int = DEFAULT_AGGREGATION_LAG_MINUTES,
+) -> int:
+    """
+    Инкрементально обновляет TaskStats по ответам новее high-water mark.
+
+    На пачку: 1 запрос ответов, 1 запрос существующей статистики, bulk_create + bulk_update.
+
+    Пример:
+        refresh_task_stats()  # -> число обработанных ответов
+    """
+    return process_new_attempts(
+        TASK_STATS_CURSOR,
+        _apply_batch,
+        fields=["task_id", "is_correct", "duration_ms"],
+        batch_size=batch_size,
+        lag_minutes=lag_minutes,
+    )
+
+
+def _apply_batch(rows: list[tuple]) -> None:
+    deltas: dict[int, list] = {}
+    for _, task_id, is_correct, duration_ms in rows:
+        delta = deltas.get(task_id)
+        if delta is None:
+            delta = deltas[task_id] = [0, 0, empty_histogram()]
+        delta[0] += 1
+        delta[1] += int(is_correct)
+        if duration_ms is not None:
+            delta[2][duration_bucket(duration_ms)] += 1
+
+    existing = TaskStats.objects.in_bulk(list(deltas))
+    created, updated = [], []
+    for task_id, (attempts, correct, histogram) in deltas.items():
+        stats = existing.get(task_id)
+        if stats is None:
+            stats = TaskStats(task_id=task_id, duration_histogram=empty_histogram())
+            created.append(stats)
+        else:
+            updated.append(stats)
+
+        merged = list(stats.duration_histogram) or empty_histogram()
+        stats.duration_histogram = [old + new for old, new in zip(merged, histogram)]
+        stats.attempt_count += attempts
+        stats.correct_count += correct
+        stats.solve_rate = stats.correct_count / stats.attempt_count
+        stats.median_duration_ms = histogram_median(stats.duration_histogram)
+
+    TaskStats.objects.bulk_create(created)
+    TaskStats.objects.bulk_update(updated, fields=TASK_STATS_FIELDS)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.monitoring.application.metrics import count_test_attempts, record_cache_lookup
+from apps.tasks.models import Task
+from apps.training.application.exceptions import InvalidTestAttempt, TestNotFound
+from apps.training.application.score_histogram import record_test_score
+from apps.training.domain.enums import AttemptStatus
+from apps.training.models import Test, TestAttempt, TestItem
+
+TEST_ITEMS_CACHE_TTL_SECONDS = 60 * 60
+
+
+def get_test_items(test_id: int) -> list[dict]:
+    """
+    Возвращает структуру теста (TestItem по порядку вместе с данными заданий) из кеша.
+
+    Структура загружается одним запросом и дальше не перечитывается на каждом шаге.
+    Для тестов без TestItem (рандомная практика, диагностика) возвращает пустой список.
+    Сброс (`invalidate_test_items`) доходит до всех воркеров только при общем кеше (`config.cache`).
+
+    Пример:
+        items = get_test_items(test_id=777)
+        # items[0] -> {"order": 1, "max_score": 2, "task": {"id": 123, ...}}
+    """
+    cache_key = _test_items_cache_key(test_id)
+    items = cache.get(cache_key)
+    record_cache_lookup("test_items", hit=items is not None)
+    if items is None:
+        items = [
+            {
+                "id": row["id"],
+                "order": row["order"],
+                "max_score": row["max_score"],
+                "task": {
+                    "id": row["task_id"],
+                    "subject_id": row["task__subject_id"],
+                    "task_type": row["task__task_type"],
+                    "prompt": row["task__prompt"],
+                    "type_payload": row["task__type_payload"],
+                    "answer_key": row["task__answer_key"],
+                    "solution_text": row["task__solution_text"],
+                },
+            }
+            for row in TestItem.objects.filter(test_id=test_id)
+            .order_by("order")
+            .values(
+                "id",
+                "order",
+                "max_score",
+                "task_id",
+                "task__subject_id",
+                "task__task_type",
+                "task__prompt",
+                "task__type_payload",
+                "task__answer_key",
+                "task__solution_text",
+            )
+        ]
+        cache.set(cache_key, items, TEST_ITEMS_CACHE_TTL_SECONDS)
+    return items
+
+
+def invalidate_test_items(test_id: int) -> None:
+    """
+    Сбрасывает закешированную структуру теста (после правки TestItem или заданий).
+
+    Пример:
+        invalidate_test_items(test_id=777)
+    """
+    cache.delete(_test_items_cache_key(test_id))
+
+
+def start_test_attempt(*, user, test_id: int) -> TestAttempt:
+    """
+    Начинает прохождение заранее подготовленного теста (с TestItem).
+
+    Пример:
+        attempt = start_test_attempt(user=request.user, test_id=777)
+    """
+    test = Test.objects.filter(id=test_id).first()
+    if test is None:
+        raise TestNotFound("Test not found.")
+    if not get_test_items(test.id):
+        raise TestNotFound("Test has no items.")
+
+    deadline = None
+    if test.time_limit_minutes:
+        deadline = timezone.now() + timedelta(minutes=test.time_limit_minutes)
+
+    attempt = TestAttempt.objects.create(user=user, test=test, deadline=deadline)
+    count_test_attempts(AttemptStatus.STARTED.value)
+    attempt.answered_count = 0
+    return attempt
+
+
+def get_test_attempt_with_progress(*, user, test_attempt_id: int) -> TestAttempt | None:
+    """
+    Загружает попытку вместе с тестом и числом отправленных ответов (`answered_count`) одним запросом.
+
+    Пример:
+        attempt = get_test_attempt_with_progress(user=request.user, test_attempt_id=555)
+    """
+    return _test_attempts_with_progress(user=user, test_attempt_id=test_attempt_id).first()
+
+
+async def aget_test_attempt_with_progress(*, user, test_attempt_id: int) -> TestAttempt | None:
+    """
+    Async-вариант `get_test_attempt_with_progress` (тот же запрос).
+
+    Пример:
+        attempt = await aget_test_attempt_with_progress(user=request.user, test_attempt_id=555)
+    """
+    return await _test_attempts_with_progress(user=user, test_attempt_id=test_attempt_id).afirst()
+
+
+def get_next_test_item(*, user, test_attempt_id: int) -> tuple[dict | None, TestAttempt, list[dict]]:
+    """
+    Возвращает следующий по `order` элемент теста (или None, если все задания отвечены).
+
+    Пример:
+        item, attempt, items = get_next_test_item(user=request.user, test_attempt_id=555)
+    """
+    attempt = get_test_attempt_with_progress(user=user, test_attempt_id=test_attempt_id)
+    if attempt is None:
+        raise InvalidTestAttempt("Test attempt does not belong to user.")
+
+    items = get_test_items(attempt.test_id)
+    if not items:
+        raise InvalidTestAttempt("Test attempt is not an ordered test.")
+
+    if attempt.status != AttemptStatus.STARTED.value or attempt.answered_count >= len(items) or is_overdue(attempt):
+        return None, attempt, items
+    return items[attempt.answered_count], attempt, items
+
+
+def is_overdue(test_attempt: TestAttempt) -> bool:
+    """
+    Истек ли дедлайн попытки (финализацию делает sweeper, а не обработчик запроса).
+
+    Пример:
+        is_overdue(attempt) -> False
+    """
+    return test_attempt.deadline is not None and timezone.now() >= test_attempt.deadline
+
+
+def get_current_test_item(test_attempt: TestAttempt, *, task_id: int) -> dict | None:
+    """
+    Для попытки упорядоченного теста возвращает текущий элемент и проверяет, что ответ на него.
+
+    Для тестов без TestItem возвращает None (обычная проверка без рубрики теста).
+    Ожидает попытку из `get_test_attempt_with_progress`.
+
+    Пример:
+        item = get_current_test_item(attempt, task_id=123)
+    """
+    items = get_test_items(test_attempt.test_id)
+    if not items:
+        return None
+
+    if test_attempt.status != AttemptStatus.STARTED.value or test_attempt.answered_count >= len(items):
+        raise InvalidTestAttempt("Test attempt is already finished.")
+    if is_overdue(test_attempt):
+        raise InvalidTestAttempt("Test attempt deadline has passed.")
+
+    item = items[test_attempt.answered_count]
+    if item["task"]["id"] != task_id:
+        raise InvalidTestAttempt("Task is not the current item of the test.")
+    return item
+
+
+def claim_test_item(test_attempt: TestAttempt) -> None:
+    """
+    Повторяет проверку `get_current_test_item` под блокировкой строки попытки (внутри транзакции ответа).
+
+    Параллельные ответы на один элемент (двойной клик) ждут друг друга: второй видит уже записанный ответ
+    первого и отклоняется, а не засчитывает элемент дважды.
+
+    Пример:
+        with transaction.atomic():
+            claim_test_item(attempt)
+            TaskAttempt.objects.create(...)
+    """
+    locked = TestAttempt.objects.select_for_update().filter(id=test_attempt.id, status=AttemptStatus.STARTED.value)
+    if not locked.exists():
+        raise InvalidTestAttempt("Test attempt is already finished.")
+    if test_attempt.task_attempts.count() != test_attempt.answered_count:
+        raise InvalidTestAttempt("Task is not the current item of the test.")
+
+
+def task_from_test_item(item: dict) -> Task:
+    """
+    Собирает экземпляр Task из закешированного элемента теста (без запроса в БД).
+
+    Пример:
+        task = task_from_test_item(item)
+    """
+    return Task(**item["task"])
+
+
+def finish_test_attempt(*, user, test_attempt_id: int) -> TestAttempt:
+    """
+    Завершает прохождение теста и фиксирует итоговые баллы.
+
+    `max_score` — сумма `TestItem.max_score` по всем заданиям теста (включая неотвеченные).
+    Результат попадает в гистограмму теста или экзаменационного трека (процентиль в сводке попытки).
+
+    Пример:
+        attempt = finish_test_attempt(user=request.user, test_attempt_id=555)
+    """
+    attempt = TestAttempt.objects.select_related("test").filter(id=test_attempt_id, user=user).first()
+    if attempt is None:
+        raise InvalidTestAttempt("Test attempt does not belong to user.")
+
+    items = get_test_items(attempt.test_id)
+    if not items:
+        raise InvalidTestAttempt("Test attempt is not an ordered test.")
+
+    if attempt.status != AttemptStatus.STARTED.value:
+        return attempt
+
+    totals = attempt.task_attempts.aggregate(
+        total_score=Coalesce(
+            Sum("score"),
+            Value(0),
+            output_field=DecimalField(max_digits=8, decimal_places=2),
+        ),
+    )
+    attempt.status = AttemptStatus.FINISHED.value
+    attempt.finished_at = timezone.now()
+    attempt.total_score = totals["total_score"]
+    attempt.max_score = Decimal(sum(item["max_score"] for item in items))
+
+    with transaction.atomic():
+        # Conditional update: a concurrent finish must not add the score to the histogram twice.
+        finished = TestAttempt.objects.filter(id=attempt.id, status=AttemptStatus.STARTED.value).update(
+            status=attempt.status,
+            finished_at=attempt.finished_at,
+            total_score=attempt.total_score,
+            max_score=attempt.max_score,
+        )
+        if finished:
+            record_test_score(test=attempt.test, total_score=attempt.total_score, max_score=attempt.max_score)
+            count_test_attempts(attempt.status)
+    return attempt
+
+
+def _test_items_cache_key(test_id: int) -> str:
+    return f"training:test-items:{test_id}"
+
+
+def _test_attempts_with_progress(*, user, test_attempt_id: int):
+    return (
+        TestAttempt.objects.select_related("test")
+        .annotate(answered_count=Count("task_attempts"))
+        .filter(id=test_attempt_id, user=user)
+    )
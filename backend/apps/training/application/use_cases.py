@@ -1,23 +1,32 @@
 from __future__ import annotations
 
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
 from django.db.models import QuerySet
 from django.utils import timezone
 
 from apps.graph.models import Subject
+from apps.monitoring.application.metrics import count_test_attempts, time_random_task_selection
 from apps.tasks.models import Task
 from apps.training.models import TaskAttempt, TestAttempt
-from apps.tasks.application.answer_check import check_task_answer
+from apps.tasks.application.answer_check import CheckResult, check_task_answer
+from apps.training.application.diagnostic import claim_diagnostic_task, update_diagnostic_estimate
+from apps.training.application.exceptions import InvalidTestAttempt, RandomTaskNotFound
+from apps.training.application.leaderboard import record_leaderboard_score
+from apps.training.application.progress import record_progress
+from apps.training.application.review import record_review
+from apps.training.application.test_runner import (
+    aget_test_attempt_with_progress,
+    claim_test_item,
+    get_current_test_item,
+    get_test_attempt_with_progress,
+    task_from_test_item,
+)
 from apps.training.domain.enums import AttemptStatus, TestMode
 
 
-class RandomTaskNotFound(Exception):
-    pass
-
-
-class InvalidTestAttempt(Exception):
-    pass
-
-
 def get_random_task_for_user(*, user, subject_id: int | None = None, task_type: str | None = None) -> Task:
     """
     Выбирает случайное задание по фильтрам (предмет, тип).
@@ -27,7 +36,8 @@ def get_random_task_for_user(*, user, subject_id: int | None = None, task_type:
     """
     tasks = Task.objects.all()
     tasks = _apply_task_filters(tasks, subject_id=subject_id, task_type=task_type)
-    task = tasks.order_by("?").first()
+    with time_random_task_selection():
+        task = tasks.order_by("?").first()
     if task is None:
         raise RandomTaskNotFound("No tasks available for the given filters.")
     return task
@@ -65,7 +75,8 @@ def get_random_task_for_session(
 
     tasks = Task.objects.all()
     tasks = _apply_task_filters(tasks, subject_id=subject_id, task_type=task_type)
-    task = tasks.order_by("?").first()
+    with time_random_task_selection():
+        task = tasks.order_by("?").first()
     if task is None:
         raise RandomTaskNotFound("No tasks available for the given filters.")
 
@@ -75,6 +86,48 @@ def get_random_task_for_session(
     return task, test_attempt
 
 
+async def aget_random_task_for_session(
+    *,
+    user,
+    subject_id: int | None = None,
+    task_type: str | None = None,
+    test_attempt_id: int | None = None,
+) -> tuple[Task, TestAttempt]:
+    """
+    Async-вариант `get_random_task_for_session` (async ORM, те же запросы и ошибки).
+
+    Пример:
+        task, session = await aget_random_task_for_session(user=request.user, subject_id=1)
+    """
+    test_attempt = None
+    if test_attempt_id is not None:
+        test_attempt = await (
+            TestAttempt.objects.select_related("test__subject")
+            .filter(id=test_attempt_id, user=user, status=AttemptStatus.STARTED.value)
+            .afirst()
+        )
+        if test_attempt is None:
+            raise InvalidTestAttempt("Test attempt does not belong to user or is not started.")
+        if subject_id is not None and subject_id != test_attempt.test.subject_id:
+            raise InvalidTestAttempt("Test attempt subject mismatch.")
+        subject_id = test_attempt.test.subject_id
+
+    tasks = Task.objects.all()
+    tasks = _apply_task_filters(tasks, subject_id=subject_id, task_type=task_type)
+    with time_random_task_selection():
+        task = await tasks.order_by("?").afirst()
+    if task is None:
+        raise RandomTaskNotFound("No tasks available for the given filters.")
+
+    if test_attempt is None:
+        subject = await Subject.objects.aget(id=task.subject_id)
+        test = await _aget_or_create_random_test(subject)
+        test_attempt = await TestAttempt.objects.acreate(user=user, test=test)
+        count_test_attempts(AttemptStatus.STARTED.value)
+
+    return task, test_attempt
+
+
 def submit_task_answer(
     *,
     user,
@@ -94,35 +147,145 @@ def submit_task_answer(
             duration_ms=4200,
         )
     """
-    task = Task.objects.select_related("subject").filter(id=task_id).first()
-    if task is None:
-        raise RandomTaskNotFound("Task not found.")
-
     test_attempt = None
+    test_item = None
     if test_attempt_id is not None:
-        test_attempt = TestAttempt.objects.filter(id=test_attempt_id, user=user).first()
+        test_attempt = get_test_attempt_with_progress(user=user, test_attempt_id=test_attempt_id)
         if test_attempt is None:
             raise InvalidTestAttempt("Test attempt does not belong to user.")
+        test_item = get_current_test_item(test_attempt, task_id=task_id)
 
-    if answer_payload is None:
-        answer_payload = {}
-    if not isinstance(answer_payload, dict):
-        answer_payload = {"value": answer_payload}
+    if test_item is not None:
+        # Ordered test: the task comes from the cached test structure.
+        task = task_from_test_item(test_item)
+    else:
+        task = Task.objects.select_related("subject").filter(id=task_id).first()
+        if task is None:
+            raise RandomTaskNotFound("Task not found.")
 
+    answer_payload = _normalize_answer_payload(answer_payload)
     check_result = check_task_answer(task, answer_payload)
+    return _record_task_attempt(
+        user=user,
+        task=task,
+        test_attempt=test_attempt,
+        test_item=test_item,
+        answer_payload=answer_payload,
+        check_result=check_result,
+        duration_ms=duration_ms,
+    )
+
+
+async def asubmit_task_answer(
+    *,
+    user,
+    task_id: int,
+    answer_payload: dict | None,
+    duration_ms: int | None = None,
+    test_attempt_id: int | None = None,
+) -> TaskAttempt:
+    """
+    Async-вариант `submit_task_answer`.
+
+    - попытка теста и задание читаются async ORM;
+    - проверка ответа (CPU) — в пуле потоков (`thread_sensitive=False`), не в event loop;
+    - запись ответа и обновление агрегатов — одна транзакция, которой нет в async ORM, поэтому одним sync-вызовом.
 
-    attempt = TaskAttempt.objects.create(
+    Пример:
+        attempt = await asubmit_task_answer(user=request.user, task_id=123, answer_payload={"value": "масса"})
+    """
+    test_attempt = None
+    test_item = None
+    if test_attempt_id is not None:
+        test_attempt = await aget_test_attempt_with_progress(user=user, test_attempt_id=test_attempt_id)
+        if test_attempt is None:
+            raise InvalidTestAttempt("Test attempt does not belong to user.")
+        # Cached test structure (one query on a cache miss).
+        test_item = await sync_to_async(get_current_test_item)(test_attempt, task_id=task_id)
+
+    if test_item is not None:
+        task = task_from_test_item(test_item)
+    else:
+        task = await Task.objects.select_related("subject").filter(id=task_id).afirst()
+        if task is None:
+            raise RandomTaskNotFound("Task not found.")
+
+    answer_payload = _normalize_answer_payload(answer_payload)
+    check_result = await sync_to_async(check_task_answer, thread_sensitive=False)(task, answer_payload)
+    return await sync_to_async(_record_task_attempt)(
         user=user,
         task=task,
         test_attempt=test_attempt,
-        answer_payload=answer_payload or {},
-        score=check_result.score,
-        is_correct=check_result.is_correct,
+        test_item=test_item,
+        answer_payload=answer_payload,
+        check_result=check_result,
         duration_ms=duration_ms,
-        applied_scoring_policy=check_result.applied_scoring_policy,
-        applied_max_score=check_result.max_score,
     )
 
+
+def _normalize_answer_payload(answer_payload) -> dict:
+    if answer_payload is None:
+        return {}
+    if not isinstance(answer_payload, dict):
+        return {"value": answer_payload}
+    return answer_payload
+
+
+def _record_task_attempt(
+    *,
+    user,
+    task: Task,
+    test_attempt: TestAttempt | None,
+    test_item: dict | None,
+    answer_payload: dict,
+    check_result: CheckResult,
+    duration_ms: int | None,
+) -> TaskAttempt:
+    """
+    Сохраняет проверенный ответ и обновляет все, что от него зависит (диагностика, повторения, прогресс, рейтинг).
+
+    Все — одной транзакцией: при ошибке любого шага не остается ни ответа, ни части агрегатов.
+
+    Пример:
+        attempt = _record_task_attempt(user=user, task=task, test_attempt=None, test_item=None,
+                                       answer_payload={"value": "масса"}, check_result=result, duration_ms=4200)
+    """
+    score = check_result.score
+    max_score = check_result.max_score
+    if test_item is not None and max_score:
+        # TestItem.max_score defines the scale of the task within the test.
+        score = score / max_score * test_item["max_score"]
+        max_score = Decimal(test_item["max_score"])
+
+    is_diagnostic = test_attempt is not None and test_attempt.test.mode == TestMode.DIAGNOSTIC.value
+
+    with transaction.atomic():
+        if is_diagnostic:
+            claim_diagnostic_task(test_attempt, task_id=task.id)
+        if test_item is not None:
+            claim_test_item(test_attempt)
+
+        attempt = TaskAttempt.objects.create(
+            user=user,
+            task=task,
+            test_attempt=test_attempt,
+            answer_payload=answer_payload or {},
+            score=score,
+            is_correct=check_result.is_correct,
+            duration_ms=duration_ms,
+            applied_scoring_policy=check_result.applied_scoring_policy,
+            applied_max_score=max_score,
+        )
+
+        if is_diagnostic:
+            update_diagnostic_estimate(test_attempt)
+
+        record_review(user=user, task_id=task.id, is_correct=attempt.is_correct, reviewed_at=attempt.submitted_at)
+        record_progress(user=user, attempt=attempt, subject_id=task.subject_id)
+        record_leaderboard_score(
+            user=user, subject_id=task.subject_id, score=attempt.score, submitted_at=attempt.submitted_at
+        )
+
     return attempt
 
 
@@ -153,7 +316,9 @@ def _create_random_test_attempt(*, user, subject: Subject) -> TestAttempt:
         attempt = _create_random_test_attempt(user=request.user, subject=math_subject)
     """
     test = _get_or_create_random_test(subject)
-    return TestAttempt.objects.create(user=user, test=test)
+    attempt = TestAttempt.objects.create(user=user, test=test)
+    count_test_attempts(AttemptStatus.STARTED.value)
+    return attempt
 
 
 def _get_or_create_random_test(subject: Subject):
@@ -163,14 +328,31 @@ def _get_or_create_random_test(subject: Subject):
     Пример:
         test = _get_or_create_random_test(subject=math_subject)
     """
-    title = f"Random practice — {subject.title}"
-    test, _ = subject.tests.get_or_create(
-        title=title,
-        mode=TestMode.SIMPLE.value,
-    )
+    tests = _random_tests(subject)
+    test = tests.first()
+    if test is None:
+        test = subject.tests.create(title=_random_test_title(subject), mode=TestMode.SIMPLE.value)
+    return test
+
+
+async def _aget_or_create_random_test(subject: Subject):
+    tests = _random_tests(subject)
+    test = await tests.afirst()
+    if test is None:
+        test = await subject.tests.acreate(title=_random_test_title(subject), mode=TestMode.SIMPLE.value)
     return test
 
 
+def _random_tests(subject: Subject) -> QuerySet:
+    # No unique constraint on tests: concurrent first sessions may each create one, the oldest is used
+    # (`get_or_create` would raise MultipleObjectsReturned from then on).
+    return subject.tests.filter(title=_random_test_title(subject), mode=TestMode.SIMPLE.value).order_by("id")
+
+
+def _random_test_title(subject: Subject) -> str:
+    return f"Random practice — {subject.title}"
+
+
 def finish_random_session(*, user, test_attempt_id: int, status: str | None = None) -> TestAttempt:
     """
     Завершает рандомную сессию, выставляя статус и время окончания.
@@ -182,39 +364,39 @@ def finish_random_session(*, user, test_attempt_id: int, status: str | None = No
     if attempt is None:
         raise InvalidTestAttempt("Test attempt does not belong to user.")
 
-    if attempt.status != AttemptStatus.STARTED.value:
-        return attempt
-
-    if status is not None and status not in {s.value for s in AttemptStatus}:
-        raise InvalidTestAttempt("Invalid status.")
-
-    attempt.status = status or AttemptStatus.FINISHED.value
-    attempt.finished_at = timezone.now()
-    attempt.save(update_fields=["status", "finished_at"])
+    if _close_random_session(attempt, status=status):
+        attempt.save(update_fields=["status", "finished_at"])
+        count_test_attempts(attempt.status)
     return attempt
 
 
-def close_last_random_session(*, user) -> TestAttempt | None:
+async def afinish_random_session(*, user, test_attempt_id: int, status: str | None = None) -> TestAttempt:
     """
-    Закрывает последнюю незавершенную рандомную сессию пользователя (если есть).
+    Async-вариант `finish_random_session`.
 
     Пример:
-        close_last_random_session(user=request.user)
+        await afinish_random_session(user=request.user, test_attempt_id=555, status="finished")
     """
-    attempt = (
-        TestAttempt.objects.select_related("test")
-        .filter(
-            user=user,
-            status=AttemptStatus.STARTED.value,
-            test__title__startswith="Random practice — ",
-        )
-        .order_by("-started_at")
-        .first()
-    )
+    attempt = await TestAttempt.objects.filter(id=test_attempt_id, user=user).afirst()
     if attempt is None:
-        return None
+        raise InvalidTestAttempt("Test attempt does not belong to user.")
 
-    attempt.status = AttemptStatus.ABANDONED.value
-    attempt.finished_at = timezone.now()
-    attempt.save(update_fields=["status", "finished_at"])
+    if _close_random_session(attempt, status=status):
+        await attempt.asave(update_fields=["status", "finished_at"])
+        count_test_attempts(attempt.status)
     return attempt
+
+
+def _close_random_session(attempt: TestAttempt, *, status: str | None) -> bool:
+    """
+    Выставляет статус и время окончания незавершенной сессии; False — сессия уже закрыта (сохранять нечего).
+    """
+    if attempt.status != AttemptStatus.STARTED.value:
+        return False
+
+    if status is not None and status not in {s.value for s in AttemptStatus}:
+        raise InvalidTestAttempt("Invalid status.")
+
+    attempt.status = status or AttemptStatus.FINISHED.value
+    attempt.finished_at = timezone.now()
+    return True
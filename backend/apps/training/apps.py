@@ -5,3 +5,6 @@ class TrainingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.training"
     verbose_name = "Тренажер"
+
+    def ready(self):
+        from .infrastructure import signals  # noqa: F401
@@ -4,10 +4,12 @@ from enum import StrEnum
 class TestMode(StrEnum):
     SIMPLE = "simple"
     EXAM = "exam"
+    DIAGNOSTIC = "diagnostic"
 
 
 class AttemptStatus(StrEnum):
     STARTED = "started"
     FINISHED = "finished"
     ABANDONED = "abandoned"
+    EXPIRED = "expired"
 
@@ -0,0 +1,73 @@
+"""
+Оценка числа уникальных значений по скетчу HyperLogLog — чистая логика без Django.
+
+Скетч — HLL_REGISTERS байт независимо от числа значений; объединение скетчей — поэлементный максимум,
+поэтому уникальных пользователей за период можно оценить по дневным скетчам за O(дней × HLL_REGISTERS).
+Стандартная ошибка ≈ 1.04 / sqrt(HLL_REGISTERS) (~2.3%); на малых множествах оценка почти точная.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import Iterable
+
+HLL_PRECISION = 11
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+_VALUE_BITS = 64 - HLL_PRECISION
+_ALPHA = 0.7213 / (1 + 1.079 / HLL_REGISTERS)
+_HIGH_BITS = int.from_bytes(b"\x80" * HLL_REGISTERS, "big")
+_ALL_BITS = (1 << (8 * HLL_REGISTERS)) - 1
+
+
+def empty_sketch() -> bytearray:
+    return bytearray(HLL_REGISTERS)
+
+
+def sketch_add(sketch: bytearray, value: int) -> None:
+    """
+    Добавляет значение в скетч (повторное добавление ничего не меняет).
+
+    Пример:
+        sketch = empty_sketch()
+        sketch_add(sketch, 42)
+    """
+    # Stable across processes (unlike `hash()`): sketches are stored and merged later.
+    hashed = int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+    register = hashed >> _VALUE_BITS
+    rank = _VALUE_BITS - (hashed & ((1 << _VALUE_BITS) - 1)).bit_length() + 1
+    if rank > sketch[register]:
+        sketch[register] = rank
+
+
+def sketch_union(sketches: Iterable[bytes]) -> bytearray:
+    """
+    Скетч объединения множеств (поэлементный максимум).
+
+    Пример:
+        sketch_union([monday, tuesday])
+    """
+    # Byte-wise max on big ints (SWAR): registers are < 0x80, so `(a | 0x80..) - b` never borrows
+    # across bytes and its high bit per byte says whether a >= b. Merging a year of days takes milliseconds.
+    union = 0
+    for sketch in sketches:
+        other = int.from_bytes(sketch, "big")
+        mask = ((((union | _HIGH_BITS) - other) & _HIGH_BITS) >> 7) * 0xFF
+        union = (union & mask) | (other & ~mask & _ALL_BITS)
+    return bytearray(union.to_bytes(HLL_REGISTERS, "big"))
+
+
+def sketch_estimate(sketch: bytes) -> int:
+    """
+    Оценка числа уникальных значений в скетче.
+
+    Пример:
+        sketch_estimate(sketch_union(daily_sketches)) -> 640
+    """
+    estimate = _ALPHA * HLL_REGISTERS**2 / sum(2.0**-rank for rank in sketch)
+    zeros = sketch.count(0)
+    if zeros and estimate <= 2.5 * HLL_REGISTERS:
+        # Small range: linear counting over empty registers is much more precise.
+        estimate = HLL_REGISTERS * math.log(HLL_REGISTERS / zeros)
+    return round(estimate)
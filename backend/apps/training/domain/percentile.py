@@ -0,0 +1,42 @@
+"""
+Процентиль результата теста по гистограмме баллов — чистая логика без Django.
+
+Результат нормируется в долю от максимума (0..1) и попадает в одну из SCORE_BUCKETS корзин.
+"""
+
+from __future__ import annotations
+
+SCORE_BUCKETS = 20
+
+
+def empty_score_histogram() -> list[int]:
+    return [0] * SCORE_BUCKETS
+
+
+def score_bucket(total_score: float, max_score: float) -> int:
+    """
+    Корзина для результата (доля от максимума, шаг 1 / SCORE_BUCKETS).
+
+    Пример:
+        score_bucket(7, 10) -> 14
+    """
+    if max_score <= 0:
+        return 0
+    ratio = min(max(total_score / max_score, 0.0), 1.0)
+    return min(int(ratio * SCORE_BUCKETS), SCORE_BUCKETS - 1)
+
+
+def percentile_from_histogram(histogram: list[int], bucket: int) -> float | None:
+    """
+    Доля результатов ниже данного (в процентах), за O(число корзин).
+
+    Результаты из той же корзины считаются наполовину (середина корзины).
+
+    Пример:
+        percentile_from_histogram([2, 0, 1, 1] + [0] * 16, 2) -> 62.5
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    below = sum(histogram[:bucket])
+    return round((below + histogram[bucket] / 2) / total * 100, 1)
@@ -0,0 +1,70 @@
+"""
+Серии дней и лента недавней активности для прогресса ученика — чистая логика без Django.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+RECENT_ACTIVITY_DAYS = 30
+
+
+@dataclass(frozen=True)
+class Streak:
+    current_days: int = 0
+    longest_days: int = 0
+    last_active_date: date | None = None
+
+
+def extend_streak(streak: Streak, day: date) -> Streak:
+    """
+    Учитывает активность в день `day` (ответы приходят в порядке времени).
+
+    Пример:
+        extend_streak(Streak(3, 5, date(2025, 9, 1)), date(2025, 9, 2)) -> Streak(4, 5, date(2025, 9, 2))
+    """
+    if streak.last_active_date is not None and day <= streak.last_active_date:
+        return streak
+
+    if streak.last_active_date is not None and day - streak.last_active_date == timedelta(days=1):
+        current = streak.current_days + 1
+    else:
+        current = 1
+    return Streak(current_days=current, longest_days=max(streak.longest_days, current), last_active_date=day)
+
+
+def current_streak_days(streak: Streak, today: date) -> int:
+    """
+    Текущая серия на сегодня: серия обрывается, если вчера и сегодня активности не было.
+
+    Пример:
+        current_streak_days(Streak(4, 5, date(2025, 9, 2)), date(2025, 9, 5)) -> 0
+    """
+    if streak.last_active_date is None or today - streak.last_active_date > timedelta(days=1):
+        return 0
+    return streak.current_days
+
+
+def add_recent_activity(activity: list[dict], day: date, *, is_correct: bool) -> list[dict]:
+    """
+    Добавляет ответ в ленту по дням (`[{"date": "2025-09-01", "attempts": 3, "correct": 2}, ...]`),
+    оставляя последние RECENT_ACTIVITY_DAYS дней.
+
+    Пример:
+        add_recent_activity([], date(2025, 9, 1), is_correct=True)
+        # [{"date": "2025-09-01", "attempts": 1, "correct": 1}]
+    """
+    day_key = day.isoformat()
+    activity = [dict(entry) for entry in activity]
+    if activity and activity[-1]["date"] == day_key:
+        entry = activity[-1]
+    else:
+        entry = {"date": day_key, "attempts": 0, "correct": 0}
+        activity.append(entry)
+        activity.sort(key=lambda item: item["date"])
+    entry["attempts"] += 1
+    entry["correct"] += int(is_correct)
+
+    cutoff = (day - timedelta(days=RECENT_ACTIVITY_DAYS - 1)).isoformat()
+    return [entry for entry in activity if entry["date"] >= cutoff]
@@ -0,0 +1,58 @@
+"""
+Интервальные повторения по алгоритму SM-2 — чистая логика без Django.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+MIN_EASE_FACTOR = 1.3
+DEFAULT_EASE_FACTOR = 2.5
+
+# Quality grades (0..5) assigned to an automatically checked answer.
+QUALITY_CORRECT = 4
+QUALITY_INCORRECT = 1
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    repetitions: int = 0
+    interval_days: int = 0
+    ease_factor: float = DEFAULT_EASE_FACTOR
+
+
+def quality_for_answer(is_correct: bool) -> int:
+    """
+    Оценка качества ответа для SM-2 (0..5).
+
+    Пример:
+        quality_for_answer(True) -> 4
+    """
+    return QUALITY_CORRECT if is_correct else QUALITY_INCORRECT
+
+
+def review(state: ReviewState, quality: int) -> ReviewState:
+    """
+    Следующее состояние карточки по SM-2.
+
+    - quality < 3: повторения сбрасываются, интервал — 1 день;
+    - иначе интервал растет: 1 → 6 → interval * ease_factor.
+
+    Пример:
+        state = review(ReviewState(), quality=4)
+        # state.interval_days -> 1
+    """
+    ease_factor = state.ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    ease_factor = max(MIN_EASE_FACTOR, ease_factor)
+
+    if quality < 3:
+        return ReviewState(repetitions=0, interval_days=1, ease_factor=ease_factor)
+
+    repetitions = state.repetitions + 1
+    if repetitions == 1:
+        interval_days = 1
+    elif repetitions == 2:
+        interval_days = 6
+    else:
+        interval_days = max(1, round(state.interval_days * state.ease_factor))
+    return ReviewState(repetitions=repetitions, interval_days=interval_days, ease_factor=ease_factor)
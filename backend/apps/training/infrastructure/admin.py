@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from apps.training.models import TaskAttempt, Test, TestAttempt, TestItem
+from apps.training.models import AggregateCursor, ReviewSchedule, TaskAttempt, Test, TestAttempt, TestItem
 
 
 class TestItemInline(admin.TabularInline):
@@ -11,8 +11,9 @@ class TestItemInline(admin.TabularInline):
 
 @admin.register(Test)
 class TestAdmin(admin.ModelAdmin):
-    list_display = ("id", "title", "subject", "mode")
-    list_filter = ("mode", "subject")
+    list_display = ("id", "title", "subject", "mode", "exam_type", "is_pooled")
+    list_filter = ("mode", "subject", "is_pooled")
+    list_select_related = ("subject", "exam_type__exam", "exam_type__subject")
     search_fields = ("title",)
     ordering = ("-id",)
     inlines = (TestItemInline,)
@@ -36,3 +37,24 @@ class TaskAttemptAdmin(admin.ModelAdmin):
     search_fields = ("user__username", "task__id")
     ordering = ("-id",)
     autocomplete_fields = ("user", "task", "test_attempt")
+
+    # The changelist reads the full history; archived answers are shown but read-only.
+    def has_change_permission(self, request, obj=None):
+        return super().has_change_permission(request, obj) and not (obj is not None and obj.is_archived())
+
+    def has_delete_permission(self, request, obj=None):
+        return super().has_delete_permission(request, obj) and not (obj is not None and obj.is_archived())
+
+
+@admin.register(ReviewSchedule)
+class ReviewScheduleAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "task", "repetitions", "interval_days", "ease_factor", "due_at", "last_reviewed_at")
+    search_fields = ("user__username", "task__id")
+    ordering = ("-id",)
+    autocomplete_fields = ("user", "task")
+
+
+@admin.register(AggregateCursor)
+class AggregateCursorAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_id", "updated_at")
+    readonly_fields = ("updated_at",)
@@ -1,5 +1,7 @@
 from django.conf import settings
 from django.db import models
+from django.db.models.sql import Query
+from django.db.models.sql.datastructures import BaseTable
 
 from apps.training.domain.enums import AttemptStatus, TestMode
 
@@ -10,7 +12,9 @@ class Test(models.Model):
 
     Важное:
     - сами задания живут в `tasks.Task`;
-    - список заданий в тесте хранится в `TestItem` (order + max_score).
+    - список заданий в тесте хранится в `TestItem` (order + max_score);
+    - экзаменационные варианты ссылаются на `exams.ExamType`; готовые, но еще не выданные
+      варианты лежат в пуле (`is_pooled=True`).
 
     Пример:
         Test.objects.create(
@@ -28,11 +32,25 @@ class Test(models.Model):
         default=TestMode.SIMPLE.value,
     )
 
+    # Exam variants: rubric track + "ready in pool, not claimed yet" flag.
+    exam_type = models.ForeignKey(
+        "exams.ExamType",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="tests",
+    )
+    is_pooled = models.BooleanField(default=False)
+
+    # Time limit for an attempt; null means unlimited.
+    time_limit_minutes = models.PositiveIntegerField(null=True, blank=True)
+
     class Meta:
         verbose_name = "Тест"
         verbose_name_plural = "Тесты"
         indexes = [
             models.Index(fields=["subject", "mode"]),
+            models.Index(fields=["exam_type", "is_pooled"]),
         ]
 
     def __str__(self) -> str:  # pragma: no cover
@@ -101,22 +119,61 @@ class TestAttempt(models.Model):
     started_at = models.DateTimeField(auto_now_add=True)
     finished_at = models.DateTimeField(null=True, blank=True)
 
+    # Server-side deadline (started_at + test.time_limit_minutes); overdue attempts are expired by a sweeper.
+    deadline = models.DateTimeField(null=True, blank=True)
+
     # Snapshot totals at finish time (can also be computed from task_attempts).
     total_score = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     max_score = models.DecimalField(max_digits=8, decimal_places=2, default=0)
 
+    # Diagnostic mode: current ability estimate (theta) and its standard error.
+    ability = models.FloatField(null=True, blank=True)
+    ability_se = models.FloatField(null=True, blank=True)
+    # Diagnostic mode: the task served last and not answered yet (the only one `submit_task_answer` accepts).
+    current_task = models.ForeignKey("tasks.Task", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+
     class Meta:
         verbose_name = "Попытка теста"
         verbose_name_plural = "Попытки тестов"
         indexes = [
             models.Index(fields=["user", "status", "started_at"]),
             models.Index(fields=["test", "status", "started_at"]),
+            models.Index(fields=["status", "deadline"]),
         ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"Attempt {self.id} / {self.user_id} / {self.test_id}"
 
 
+class _HistoryTable(BaseTable):
+    """
+    FROM для чтений `TaskAttempt`: view полной истории под именем горячей таблицы
+    (`"training_taskattempt_history" "training_taskattempt"`).
+
+    Алиас остается именем горячей таблицы, поэтому UPDATE/DELETE того же QuerySet адресуют ее.
+    """
+
+    def as_sql(self, compiler, connection):
+        quote = connection.ops.quote_name
+        return f"{quote(TaskAttemptHistory._meta.db_table)} {quote(self.table_alias)}", []
+
+
+class _HistoryQuery(Query):
+    base_table_class = _HistoryTable
+
+
+class TaskAttemptQuerySet(models.QuerySet):
+    """
+    Чтения — из `TaskAttemptHistory` (горячие + архивные ответы), записи — в горячую таблицу.
+
+    Пример:
+        TaskAttempt.objects.filter(user_id=42).count()  # including archived answers
+    """
+
+    def __init__(self, model=None, query=None, using=None, hints=None):
+        super().__init__(model, query if query is not None else _HistoryQuery(model), using, hints)
+
+
 class TaskAttempt(models.Model):
     """
     Попытка решения задания — атомарный факт "пользователь отправил ответ".
@@ -129,6 +186,12 @@ class TaskAttempt(models.Model):
     Поля `applied_scoring_policy` и `applied_max_score` — снапшот,
     чтобы результат был воспроизводим при изменении rubric/правил в будущем.
 
+    Это горячая таблица: ответы старше окна архивации переносит `archive_task_attempts` в `ArchivedTaskAttempt`.
+    - `objects` (менеджер по умолчанию, связи `user.task_attempts` / `test_attempt.task_attempts`, админка)
+      читает всю историю (`TaskAttemptHistory`); create/update/delete идут в горячую таблицу;
+    - `hot_objects` — только горячая таблица: перенос в архив, курсоры агрегатов, `select_for_update`.
+    Архивный ответ только для чтения: `save()` его экземпляра не найдет строку в горячей таблице и вставит копию.
+
     Пример (short_text):
         TaskAttempt.objects.create(
             user=user,
@@ -143,7 +206,11 @@ class TaskAttempt(models.Model):
     """
 
     task = models.ForeignKey("tasks.Task", on_delete=models.PROTECT, related_name="attempts")
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="task_attempts")
+    # Lookups by user / test attempt use the composite indexes below: single-column FK indexes would only
+    # add write cost to the hottest insert.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="task_attempts", db_index=False
+    )
 
     # Nullable to support solving tasks outside tests (practice mode).
     test_attempt = models.ForeignKey(
@@ -152,6 +219,7 @@ class TaskAttempt(models.Model):
         null=True,
         blank=True,
         related_name="task_attempts",
+        db_index=False,
     )
 
     answer_payload = models.JSONField(default=dict, blank=True)
@@ -165,6 +233,9 @@ class TaskAttempt(models.Model):
     applied_scoring_policy = models.JSONField(null=True, blank=True)
     applied_max_score = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
 
+    objects = TaskAttemptQuerySet.as_manager()
+    hot_objects = models.Manager()
+
     class Meta:
         verbose_name = "Попытка задания"
         verbose_name_plural = "Попытки заданий"
@@ -175,3 +246,460 @@ class TaskAttempt(models.Model):
 
     def __str__(self) -> str:  # pragma: no cover
         return f"TaskAttempt {self.id} / {self.user_id} / {self.task_id}"
+
+    def is_archived(self) -> bool:
+        return ArchivedTaskAttempt.objects.filter(id=self.id).exists()
+
+
+class TaskAttemptRecord(models.Model):
+    """
+    Поля ответа для архива и полной истории: те же, что у `TaskAttempt`, `id` сохраняется при переносе.
+
+    Обратных связей нет (`related_name="+"`): история читается запросами к самим моделям.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    answer_payload = models.JSONField(default=dict, blank=True)
+    score = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    is_correct = models.BooleanField(default=False)
+    submitted_at = models.DateTimeField()
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    applied_scoring_policy = models.JSONField(null=True, blank=True)
+    applied_max_score = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{type(self).__name__} {self.id} / {self.user_id} / {self.task_id}"
+
+
+class ArchivedTaskAttempt(TaskAttemptRecord):
+    """
+    Архив ответов: строки `TaskAttempt` старше окна архивации (переносит `archive_task_attempts`).
+
+    Пишется только пачками переносчика, поэтому индексы те же, что у горячей таблицы, без потерь на вставке ответа.
+
+    Пример:
+        ArchivedTaskAttempt.objects.filter(user_id=42, submitted_at__year=2024).count()
+    """
+
+    task = models.ForeignKey("tasks.Task", on_delete=models.PROTECT, related_name="+")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    test_attempt = models.ForeignKey(
+        "training.TestAttempt", on_delete=models.SET_NULL, null=True, blank=True, related_name="+", db_index=False
+    )
+
+    class Meta:
+        verbose_name = "Архивная попытка задания"
+        verbose_name_plural = "Архивные попытки заданий"
+        indexes = [
+            models.Index(fields=["user", "task", "submitted_at"]),
+            models.Index(fields=["test_attempt", "submitted_at"]),
+        ]
+
+
+class TaskAttemptHistory(TaskAttemptRecord):
+    """
+    Все ответы — горячие и архивные (SQL view `UNION ALL` над `TaskAttempt` и `ArchivedTaskAttempt`). Только чтение.
+
+    Запросы пишутся так же, как к `TaskAttempt` (те же поля и FK, включая join'ы `task__...`); условия
+    проталкиваются в обе ветки view и используют их индексы.
+
+    Миграции, меняющие колонки исходных таблиц, пересоздают view (DROP VIEW в начале, CREATE VIEW в конце).
+
+    Пример:
+        TaskAttemptHistory.objects.filter(user_id=42, is_correct=True).values("task__subject_id").distinct()
+    """
+
+    # DO_NOTHING: a view is not deletable, related rows are removed from the underlying tables.
+    task = models.ForeignKey("tasks.Task", on_delete=models.DO_NOTHING, related_name="+", db_constraint=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, related_name="+", db_constraint=False
+    )
+    test_attempt = models.ForeignKey(
+        "training.TestAttempt",
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_constraint=False,
+    )
+
+    class Meta:
+        managed = False
+        db_table = "training_taskattempt_history"
+        verbose_name = "Попытка задания (вся история)"
+        verbose_name_plural = "Попытки заданий (вся история)"
+
+
+class ReviewSchedule(models.Model):
+    """
+    Расписание интервального повторения (SM-2) задания для пользователя.
+
+    Зачем:
+    - очередь повторений строится по индексу (user, due_at), без сканирования истории попыток;
+    - строка обновляется при каждом ответе (`submit_task_answer`).
+
+    Пример:
+        ReviewSchedule.objects.filter(user=user, due_at__lte=timezone.now()).order_by("due_at")[:20]
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="review_schedules")
+    task = models.ForeignKey("tasks.Task", on_delete=models.CASCADE, related_name="review_schedules")
+
+    repetitions = models.PositiveIntegerField(default=0)
+    interval_days = models.PositiveIntegerField(default=0)
+    ease_factor = models.FloatField(default=2.5)
+
+    due_at = models.DateTimeField()
+    last_reviewed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Расписание повторения"
+        verbose_name_plural = "Расписания повторений"
+        unique_together = [("user", "task")]
+        indexes = [
+            models.Index(fields=["user", "due_at"]),
+            models.Index(fields=["last_reviewed_at"]),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Review {self.user_id} / {self.task_id} / {self.due_at:%Y-%m-%d}"
+
+
+class AggregateCursor(models.Model):
+    """
+    High-water mark инкрементальной агрегации по TaskAttempt.
+
+    Зачем:
+    - периодические задачи (статистика заданий, дневные сводки) обрабатывают только ответы с `id > last_id`;
+    - курсор обновляется в той же транзакции, что и агрегаты, поэтому пачка не учитывается дважды.
+
+    Пример:
+        AggregateCursor.objects.select_for_update().get_or_create(name="task_stats")
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Курсор агрегации"
+        verbose_name_plural = "Курсоры агрегации"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.name}: {self.last_id}"
+
+
+class DailySubjectRollup(models.Model):
+    """
+    Дневная сводка ответов по (дата, предмет, тип задания).
+
+    Зачем:
+    - дашборды строят временные ряды по этой таблице, а не `GROUP BY` по TaskAttempt;
+    - строится инкрементально (`build_daily_rollups`) по high-water mark `AggregateCursor`.
+
+    `date` — локальная дата ответа (TIME_ZONE).
+
+    Пример:
+        DailySubjectRollup.objects.filter(subject_id=1, date__gte=date(2025, 9, 1)).order_by("date")
+    """
+
+    date = models.DateField()
+    subject = models.ForeignKey("graph.Subject", on_delete=models.CASCADE, related_name="daily_rollups")
+    task_type = models.CharField(max_length=64)
+
+    attempt_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    total_score = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_duration_ms = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Дневная сводка по предмету"
+        verbose_name_plural = "Дневные сводки по предметам"
+        unique_together = [("date", "subject", "task_type")]
+        indexes = [
+            models.Index(fields=["subject", "date"]),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.date} / {self.subject_id} / {self.task_type}: {self.attempt_count}"
+
+
+class DailyUserRollup(models.Model):
+    """
+    Дневная сводка ответов пользователя: одна строка на (дата, пользователь), у кого были ответы.
+
+    Зачем:
+    - временной ряд активности конкретного ученика;
+    - новая строка (первый ответ пользователя за день) учитывается в `DailyActivityRollup`.
+
+    Число активных за период по этой таблице не считается: это DAU × дней строк (см. `DailyActivityRollup`).
+
+    Пример:
+        DailyUserRollup.objects.filter(user_id=42, date__gte=date(2025, 9, 1)).order_by("date")
+    """
+
+    date = models.DateField()
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="daily_rollups")
+
+    attempt_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    total_score = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_duration_ms = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Дневная сводка пользователя"
+        verbose_name_plural = "Дневные сводки пользователей"
+        unique_together = [("date", "user")]
+        indexes = [
+            models.Index(fields=["user", "date"]),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.date} / {self.user_id}: {self.attempt_count}"
+
+
+class DailyActivityRollup(models.Model):
+    """
+    Активные пользователи за день: одна строка на дату.
+
+    Зачем:
+    - ряд «активные по дням» за год — 365 строк, а не DAU × 365 строк `DailyUserRollup`;
+    - `users_sketch` — HyperLogLog-скетч пользователей дня (`training.domain.hyperloglog`): уникальные за период
+      оцениваются объединением дневных скетчей, без `DISTINCT` по пользователям.
+
+    Обновляется в `build_daily_rollups` при создании строки `DailyUserRollup`.
+
+    Пример:
+        DailyActivityRollup.objects.filter(date__range=(monday, sunday)).values_list("date", "active_users")
+    """
+
+    date = models.DateField(primary_key=True)
+    active_users = models.PositiveIntegerField(default=0)
+    users_sketch = models.BinaryField(default=bytes)
+
+    class Meta:
+        verbose_name = "Дневная активность"
+        verbose_name_plural = "Дневная активность"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.date}: {self.active_users}"
+
+
+class UserProgress(models.Model):
+    """
+    Сводный прогресс ученика: одна строка на пользователя.
+
+    Зачем:
+    - страница прогресса читает одну строку (+ строки по предметам), без сканирования истории ответов;
+    - строка обновляется атомарно при каждом ответе (`submit_task_answer`);
+    - `rebuild_user_progress` пересчитывает ее из TaskAttempt (бэкфилл).
+
+    Пример:
+        UserProgress.objects.get(user=user).solved_task_count
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="progress"
+    )
+
+    attempt_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    # Distinct tasks answered correctly at least once.
+    solved_task_count = models.PositiveIntegerField(default=0)
+
+    current_streak_days = models.PositiveIntegerField(default=0)
+    longest_streak_days = models.PositiveIntegerField(default=0)
+    last_active_date = models.DateField(null=True, blank=True)
+
+    # Last days of activity: [{"date": "2025-09-01", "attempts": 3, "correct": 2}, ...].
+    recent_activity = models.JSONField(default=list, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Прогресс ученика"
+        verbose_name_plural = "Прогресс учеников"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Progress {self.user_id}: {self.correct_count}/{self.attempt_count}"
+
+
+class UserSubjectProgress(models.Model):
+    """
+    Прогресс ученика по предмету (точность, решенные задания, баллы).
+
+    Пример:
+        UserSubjectProgress.objects.filter(user=user).select_related("subject")
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="subject_progress")
+    subject = models.ForeignKey("graph.Subject", on_delete=models.CASCADE, related_name="user_progress")
+
+    attempt_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    solved_task_count = models.PositiveIntegerField(default=0)
+    total_score = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Прогресс по предмету"
+        verbose_name_plural = "Прогресс по предметам"
+        unique_together = [("user", "subject")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Progress {self.user_id} / {self.subject_id}: {self.correct_count}/{self.attempt_count}"
+
+
+class UserNodeProgress(models.Model):
+    """
+    Прогресс ученика по вершине графа знаний (через связи заданий `TaskNode`).
+
+    Зачем:
+    - отчет учителя по классу показывает точность по темам одним сгруппированным запросом;
+    - строка обновляется при каждом ответе вместе с UserProgress.
+
+    Пример:
+        UserNodeProgress.objects.filter(user_id__in=class_ids, node__subject_id=1)
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="node_progress")
+    node = models.ForeignKey("graph.Node", on_delete=models.CASCADE, related_name="user_progress")
+
+    attempt_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Прогресс по вершине графа"
+        verbose_name_plural = "Прогресс по вершинам графа"
+        unique_together = [("user", "node")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Progress {self.user_id} / node {self.node_id}: {self.correct_count}/{self.attempt_count}"
+
+
+class ScoreHistogram(models.Model):
+    """
+    Гистограмма результатов завершенных попыток одной когорты (общие поля).
+
+    Зачем:
+    - процентиль «вы справились лучше X%» читается из одной строки за O(корзин),
+      без подсчета остальных попыток на запросе;
+    - обновляется при завершении попытки (`finish_test_attempt`).
+
+    `buckets` — счетчики по корзинам доли от максимума (`training.domain.percentile`).
+    """
+
+    buckets = models.JSONField(default=list, blank=True)
+    attempt_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class TestScoreHistogram(ScoreHistogram):
+    """
+    Гистограмма результатов подготовленного теста (не экзаменационного варианта).
+
+    Пример:
+        TestScoreHistogram.objects.get(test_id=777).buckets
+    """
+
+    test = models.OneToOneField(
+        "training.Test", on_delete=models.CASCADE, primary_key=True, related_name="score_histogram"
+    )
+
+    class Meta:
+        verbose_name = "Гистограмма результатов теста"
+        verbose_name_plural = "Гистограммы результатов тестов"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Histogram {self.test_id}: {self.attempt_count}"
+
+
+class ExamTypeScoreHistogram(ScoreHistogram):
+    """
+    Гистограмма результатов всех вариантов экзаменационного трека.
+
+    Каждый выданный вариант — отдельный `Test` с одним учеником, поэтому когорта варианта — его `ExamType`
+    (результаты сравнимы: корзины — доля от максимума).
+
+    Пример:
+        ExamTypeScoreHistogram.objects.get(exam_type_id=3).buckets
+    """
+
+    exam_type = models.OneToOneField(
+        "exams.ExamType", on_delete=models.CASCADE, primary_key=True, related_name="score_histogram"
+    )
+
+    class Meta:
+        verbose_name = "Гистограмма результатов экзамена"
+        verbose_name_plural = "Гистограммы результатов экзаменов"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Histogram exam type {self.exam_type_id}: {self.attempt_count}"
+
+
+class LeaderboardScore(models.Model):
+    """
+    Счетчик баллов ученика в рейтинге предмета за период.
+
+    Зачем:
+    - рейтинг не считается через `SUM(score)` по TaskAttempt: счетчик увеличивается при каждом ответе;
+    - индекс (subject, period, score) отдает топ-N поиском по B-дереву (O(log n + N));
+    - позиция ученика — из счетчиков `LeaderboardBucket` (O(корзин)), без подсчета всех строк выше ученика.
+
+    `period` — `"all"` (за все время) или ISO-неделя вида `"2025-W37"`.
+
+    Пример:
+        LeaderboardScore.objects.filter(subject_id=1, period="all").order_by("-score", "user_id")[:10]
+    """
+
+    subject = models.ForeignKey("graph.Subject", on_delete=models.CASCADE, related_name="leaderboard_scores")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="leaderboard_scores")
+    period = models.CharField(max_length=16)
+
+    score = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Баллы в рейтинге"
+        verbose_name_plural = "Баллы в рейтингах"
+        unique_together = [("subject", "period", "user")]
+        indexes = [
+            models.Index(fields=["subject", "period", "-score", "user"]),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.subject_id} / {self.period} / {self.user_id}: {self.score}"
+
+
+class LeaderboardBucket(models.Model):
+    """
+    Число учеников рейтинга предмета за период, чей балл попадает в корзину `bucket` (целая часть балла).
+
+    Зачем:
+    - позиция ученика — сумма счетчиков корзин выше его корзины плюс ученики его корзины с большим баллом;
+      стоимость — O(непустых корзин выше), а не O(позиции): не зависит от числа учеников;
+    - обновляется вместе с `LeaderboardScore`, когда балл ученика переходит в другую корзину.
+
+    Пример:
+        LeaderboardBucket.objects.filter(subject_id=1, period="all", bucket__gt=18).aggregate(Sum("user_count"))
+    """
+
+    subject = models.ForeignKey("graph.Subject", on_delete=models.CASCADE, related_name="leaderboard_buckets")
+    period = models.CharField(max_length=16)
+    bucket = models.PositiveIntegerField()
+    user_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Корзина рейтинга"
+        verbose_name_plural = "Корзины рейтингов"
+        unique_together = [("subject", "period", "bucket")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.subject_id} / {self.period} / {self.bucket}: {self.user_count}"
@@ -0,0 +1,57 @@
+"""
+Минимальная запись файлов формата NumPy `.npy` (v1.0) без зависимости от numpy.
+
+Файлы одномерные, с заголовком фиксированной длины: при дозаписи строк в конец
+заголовок (shape) переписывается на месте, а данные не копируются.
+Читаются через `numpy.load(path, mmap_mode="r")`.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"\x93NUMPY\x01\x00"
+# Total header size (magic + length + dict), a multiple of 64 as the format requires.
+HEADER_SIZE = 128
+
+
+def encode_header(descr: str, rows: int) -> bytes:
+    """
+    Заголовок .npy фиксированной длины HEADER_SIZE.
+
+    Пример:
+        encode_header("<i8", 10)[:8] -> b"\\x93NUMPY\\x01\\x00"
+    """
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({rows},), }}".encode("latin1")
+    padding = HEADER_SIZE - len(MAGIC) - 2 - len(header) - 1
+    if padding < 0:
+        raise ValueError("NPY header does not fit into the fixed header size.")
+    return MAGIC + struct.pack("<H", HEADER_SIZE - len(MAGIC) - 2) + header + b" " * padding + b"\n"
+
+
+def append_column(path: str, *, descr: str, values: array, rows_before: int) -> int:
+    """
+    Дописывает значения в конец .npy-файла (создает файл при отсутствии) и обновляет shape.
+
+    `rows_before` — сколько строк зафиксировано в манифесте: хвост после них (от прерванного запуска)
+    отбрасывается, поэтому повторный запуск не дублирует данные.
+
+    Пример:
+        rows = append_column("2025-09/user_id.npy", descr="<i8", values=array("q", [1, 2]), rows_before=0)
+    """
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    mode = "r+b" if os.path.exists(path) else "w+b"
+    with open(path, mode) as file:
+        file.truncate(HEADER_SIZE + rows_before * values.itemsize)
+        file.seek(0, os.SEEK_END)
+        values.tofile(file)
+        rows = rows_before + len(values)
+        file.seek(0)
+        file.write(encode_header(descr, rows))
+    return rows
@@ -0,0 +1,41 @@
+"""
+Инвалидация закешированной структуры тестов (`get_test_items`).
+
+Подключается в `TrainingConfig.ready()`.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.tasks.infrastructure.signals import tasks_bulk_updated
+from apps.training.application.test_runner import invalidate_test_items
+from apps.training.models import TestItem
+
+
+@receiver([post_save, post_delete], sender=TestItem, dispatch_uid="test-items:test-item")
+def invalidate_test_items_on_item_change(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.test_id])
+
+
+@receiver(post_save, sender="tasks.Task", dispatch_uid="test-items:task")
+def invalidate_test_items_on_task_change(sender, instance, created, **kwargs):
+    if created:
+        return
+    _invalidate_on_commit(TestItem.objects.filter(task_id=instance.id).values_list("test_id", flat=True).distinct())
+
+
+@receiver(tasks_bulk_updated, dispatch_uid="test-items:tasks-bulk")
+def invalidate_test_items_on_tasks_bulk_update(sender, task_ids, **kwargs):
+    _invalidate_on_commit(TestItem.objects.filter(task_id__in=task_ids).values_list("test_id", flat=True).distinct())
+
+
+def _invalidate_on_commit(test_ids) -> None:
+    # After commit: otherwise another worker may cache the old structure again before the change is visible.
+    test_ids = list(test_ids)
+
+    def invalidate():
+        for test_id in test_ids:
+            invalidate_test_items(test_id)
+
+    transaction.on_commit(invalidate)
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.training.application.archive import (
+    DEFAULT_ARCHIVE_AFTER_DAYS,
+    DEFAULT_ARCHIVE_BATCH_SIZE,
+    archive_task_attempts,
+)
+
+
+class Command(BaseCommand):
+    help = "Переносит старые ответы (TaskAttempt) в архивную таблицу (один раз или в цикле с --interval)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=DEFAULT_ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_ARCHIVE_BATCH_SIZE)
+        parser.add_argument("--interval", type=int, default=0, help="Seconds between runs; 0 — run once.")
+
+    def handle(self, *args, **options):
+        while True:
+            moved = archive_task_attempts(
+                older_than_days=options["older_than_days"],
+                batch_size=options["batch_size"],
+            )
+            self.stdout.write(f"Archived {moved} attempts.")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
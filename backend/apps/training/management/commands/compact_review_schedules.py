@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.training.application.review import compact_review_schedules
+
+
+class Command(BaseCommand):
+    help = "Удаляет расписания повторений пользователей, которые давно не занимались (запускать раз в сутки)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--inactive-days", type=int, default=90)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = compact_review_schedules(
+            inactive_days=options["inactive_days"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(f"Deleted {deleted} review schedules.")
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.training.application.expiry import DEFAULT_BATCH_SIZE, DEFAULT_IDLE_MINUTES, expire_test_attempts
+
+
+class Command(BaseCommand):
+    help = "Финализирует просроченные и брошенные попытки тестов (один раз или в цикле с --interval)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--idle-minutes", type=int, default=DEFAULT_IDLE_MINUTES)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--interval", type=int, default=0, help="Seconds between runs; 0 — run once.")
+
+    def handle(self, *args, **options):
+        while True:
+            counts = expire_test_attempts(idle_minutes=options["idle_minutes"], batch_size=options["batch_size"])
+            self.stdout.write(", ".join(f"{status}: {count}" for status, count in counts.items()))
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,48 @@
+import sys
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks.application.exports import DEFAULT_EXPORT_BATCH_SIZE, iter_gzip, iter_ndjson
+from apps.training.application.exports import iter_attempt_export
+from config.replica import read_from_replica
+
+
+class Command(BaseCommand):
+    help = "Выгружает ответы (TaskAttempt) в NDJSON потоково."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="-", help="File path or '-' for stdout.")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--subject-id", type=int)
+        parser.add_argument("--user-id", type=int)
+        parser.add_argument("--date-from", type=date.fromisoformat)
+        parser.add_argument("--date-to", type=date.fromisoformat)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_EXPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with read_from_replica():
+            self._export(options)
+
+    def _export(self, options):
+        chunks = iter_ndjson(
+            iter_attempt_export(
+                subject_id=options["subject_id"],
+                user_id=options["user_id"],
+                date_from=options["date_from"],
+                date_to=options["date_to"],
+                batch_size=options["batch_size"],
+            )
+        )
+        if options["gzip"]:
+            chunks = iter_gzip(chunks)
+
+        if options["output"] == "-":
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
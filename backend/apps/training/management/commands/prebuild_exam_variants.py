@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.training.application.exam_variants import fill_exam_variant_pool
+
+
+class Command(BaseCommand):
+    help = "Пополняет пул готовых экзаменационных вариантов (один раз или в цикле с --interval)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam-type", type=int, default=None)
+        parser.add_argument("--size", type=int, default=50)
+        parser.add_argument("--interval", type=int, default=0, help="Seconds between runs; 0 — run once.")
+
+    def handle(self, *args, **options):
+        while True:
+            created = fill_exam_variant_pool(exam_type_id=options["exam_type"], target_size=options["size"])
+            for exam_type_id, count in created.items():
+                self.stdout.write(f"ExamType {exam_type_id}: +{count} variants.")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.training.application.leaderboard import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает рейтинги предметов (за все время и за текущую неделю) из истории ответов."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subject-id", type=int)
+
+    def handle(self, *args, **options):
+        written = rebuild_leaderboards(subject_id=options["subject_id"])
+        self.stdout.write(f"Wrote {written} leaderboard counters.")
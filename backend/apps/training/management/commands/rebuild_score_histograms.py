@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.training.application.score_histogram import rebuild_score_histograms
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает гистограммы результатов подготовленных тестов и экзаменационных треков из завершенных попыток."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--test-id", type=int)
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_score_histograms(test_id=options["test_id"])
+        self.stdout.write(f"Rebuilt {rebuilt} score histograms.")
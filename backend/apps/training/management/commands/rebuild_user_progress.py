@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.training.application.progress import rebuild_all_user_progress, rebuild_user_progress
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает агрегаты прогресса учеников из истории ответов (бэкфилл)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, help="Rebuild a single user.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["user_id"] is not None:
+            rebuild_user_progress(options["user_id"])
+            self.stdout.write(f"Rebuilt progress of user {options['user_id']}.")
+            return
+
+        rebuilt = rebuild_all_user_progress(batch_size=options["batch_size"])
+        self.stdout.write(f"Rebuilt progress of {rebuilt} users.")
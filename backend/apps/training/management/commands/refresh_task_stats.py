@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.training.application.aggregation import DEFAULT_AGGREGATION_BATCH_SIZE, DEFAULT_AGGREGATION_LAG_MINUTES
+from apps.training.application.task_stats import refresh_task_stats
+
+
+class Command(BaseCommand):
+    help = "Инкрементально обновляет статистику заданий (TaskStats) по новым ответам."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_AGGREGATION_BATCH_SIZE)
+        parser.add_argument("--lag-minutes", type=int, default=DEFAULT_AGGREGATION_LAG_MINUTES)
+        parser.add_argument("--interval", type=int, default=0, help="Seconds between runs; 0 — run once.")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = refresh_task_stats(batch_size=options["batch_size"], lag_minutes=options["lag_minutes"])
+            self.stdout.write(f"Processed {processed} task attempts.")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.training.application.synthetic import (
+    DEFAULT_SYNTHETIC_BATCH_SIZE,
+    DEFAULT_SYNTHETIC_PASSWORD,
+    DEFAULT_SYNTHETIC_USER_PREFIX,
+    SyntheticDataExists,
+    SyntheticVolumes,
+    seed_synthetic,
+)
+
+
+class Command(BaseCommand):
+    help = "Генерирует синтетический набор данных для бенчмарков: граф, задания, учеников и ответы (детерминированно по --seed)."
+
+    def add_arguments(self, parser):
+        defaults = SyntheticVolumes()
+        parser.add_argument("--subjects", type=int, default=defaults.subjects)
+        parser.add_argument("--concepts-per-subject", type=int, default=defaults.concepts_per_subject)
+        parser.add_argument("--nodes-per-concept", type=int, default=defaults.nodes_per_concept)
+        parser.add_argument("--tasks", type=int, default=defaults.tasks)
+        parser.add_argument("--users", type=int, default=defaults.users)
+        parser.add_argument("--attempts", type=int, default=defaults.attempts)
+        parser.add_argument("--days", type=int, default=defaults.days, help="Spread attempts over the last N days.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_SYNTHETIC_BATCH_SIZE)
+        parser.add_argument("--user-prefix", default=DEFAULT_SYNTHETIC_USER_PREFIX)
+        parser.add_argument("--password", default=DEFAULT_SYNTHETIC_PASSWORD)
+
+    def handle(self, *args, **options):
+        volumes = SyntheticVolumes(
+            subjects=options["subjects"],
+            concepts_per_subject=options["concepts_per_subject"],
+            nodes_per_concept=options["nodes_per_concept"],
+            tasks=options["tasks"],
+            users=options["users"],
+            attempts=options["attempts"],
+            days=options["days"],
+        )
+        started = time.monotonic()
+        try:
+            counts = seed_synthetic(
+                volumes,
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                password=options["password"],
+                user_prefix=options["user_prefix"],
+                log=self.stdout.write if options["verbosity"] > 1 else lambda message: None,
+            )
+        except SyntheticDataExists as exc:
+            raise CommandError(str(exc)) from exc
+        for name, count in counts.items():
+            self.stdout.write(f"{name}: {count}")
+        self.stdout.write(f"Done in {time.monotonic() - started:.1f}s.")
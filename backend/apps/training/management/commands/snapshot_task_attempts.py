@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.training.application.snapshots import (
+    DEFAULT_SNAPSHOT_BATCH_SIZE,
+    DEFAULT_SNAPSHOT_LAG_MINUTES,
+    snapshot_task_attempts,
+)
+
+
+class Command(BaseCommand):
+    help = "Дописывает новые ответы (TaskAttempt) в колоночный снапшот .npy с партициями по месяцам."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Snapshot directory.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_SNAPSHOT_BATCH_SIZE)
+        parser.add_argument("--lag-minutes", type=int, default=DEFAULT_SNAPSHOT_LAG_MINUTES)
+
+    def handle(self, *args, **options):
+        appended = snapshot_task_attempts(
+            options["path"],
+            batch_size=options["batch_size"],
+            lag_minutes=options["lag_minutes"],
+        )
+        for month, rows in sorted(appended.items()):
+            self.stdout.write(f"{month}: +{rows} rows")
+        self.stdout.write(f"Appended {sum(appended.values())} rows.")
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0002_alter_taskattempt_options_alter_test_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testattempt',
+            name='ability',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='ability_se',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='test',
+            name='mode',
+            field=models.CharField(choices=[('simple', 'SIMPLE'), ('exam', 'EXAM'), ('diagnostic', 'DIAGNOSTIC')], default='simple', max_length=32),
+        ),
+    ]
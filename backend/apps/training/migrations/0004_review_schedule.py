@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_irt_params'),
+        ('training', '0003_diagnostic_mode'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('repetitions', models.PositiveIntegerField(default=0)),
+                ('interval_days', models.PositiveIntegerField(default=0)),
+                ('ease_factor', models.FloatField(default=2.5)),
+                ('due_at', models.DateTimeField()),
+                ('last_reviewed_at', models.DateTimeField()),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_schedules', to='tasks.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_schedules', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Расписание повторения',
+                'verbose_name_plural': 'Расписания повторений',
+                'indexes': [models.Index(fields=['user', 'due_at'], name='training_re_user_id_3f6b8b_idx'), models.Index(fields=['last_reviewed_at'], name='training_re_last_re_5fda14_idx')],
+                'unique_together': {('user', 'task')},
+            },
+        ),
+    ]
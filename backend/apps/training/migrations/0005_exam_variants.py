@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0002_alter_exam_options_alter_examtaskgroup_options_and_more'),
+        ('graph', '0002_alter_concept_options_alter_node_options_and_more'),
+        ('training', '0004_review_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='test',
+            name='exam_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tests', to='exams.examtype'),
+        ),
+        migrations.AddField(
+            model_name='test',
+            name='is_pooled',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='test',
+            index=models.Index(fields=['exam_type', 'is_pooled'], name='training_te_exam_ty_74d848_idx'),
+        ),
+    ]
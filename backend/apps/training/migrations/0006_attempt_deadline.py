@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0005_exam_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='test',
+            name='time_limit_minutes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='deadline',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='testattempt',
+            name='status',
+            field=models.CharField(choices=[('started', 'STARTED'), ('finished', 'FINISHED'), ('abandoned', 'ABANDONED'), ('expired', 'EXPIRED')], default='started', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['status', 'deadline'], name='training_te_status_000a8b_idx'),
+        ),
+    ]
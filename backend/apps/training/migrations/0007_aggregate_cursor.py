@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0006_attempt_deadline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AggregateCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Курсор агрегации',
+                'verbose_name_plural': 'Курсоры агрегации',
+            },
+        ),
+    ]
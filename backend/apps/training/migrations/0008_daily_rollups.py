@@ -0,0 +1,54 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0002_alter_concept_options_alter_node_options_and_more'),
+        ('training', '0007_aggregate_cursor'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySubjectRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('task_type', models.CharField(max_length=64)),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('correct_count', models.PositiveIntegerField(default=0)),
+                ('total_score', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_duration_ms', models.BigIntegerField(default=0)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='graph.subject')),
+            ],
+            options={
+                'verbose_name': 'Дневная сводка по предмету',
+                'verbose_name_plural': 'Дневные сводки по предметам',
+                'indexes': [models.Index(fields=['subject', 'date'], name='training_da_subject_1c6ee8_idx')],
+                'unique_together': {('date', 'subject', 'task_type')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyUserRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('correct_count', models.PositiveIntegerField(default=0)),
+                ('total_score', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_duration_ms', models.BigIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Дневная сводка пользователя',
+                'verbose_name_plural': 'Дневные сводки пользователей',
+                'indexes': [models.Index(fields=['user', 'date'], name='training_da_user_id_ef1c57_idx')],
+                'unique_together': {('date', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0002_alter_concept_options_alter_node_options_and_more'),
+        ('training', '0009_user_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=16)),
+                ('score', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_scores', to='graph.subject')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Баллы в рейтинге',
+                'verbose_name_plural': 'Баллы в рейтингах',
+                'indexes': [models.Index(fields=['subject', 'period', '-score', 'user'], name='training_le_subject_4b1038_idx')],
+                'unique_together': {('subject', 'period', 'user')},
+            },
+        ),
+    ]
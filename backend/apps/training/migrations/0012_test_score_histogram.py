@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0011_user_node_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestScoreHistogram',
+            fields=[
+                ('test', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_histogram', serialize=False, to='training.test')),
+                ('buckets', models.JSONField(blank=True, default=list)),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Гистограмма результатов теста',
+                'verbose_name_plural': 'Гистограммы результатов тестов',
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 6.0.1 on 2026-10-19 07:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+HISTORY_COLUMNS = (
+    "id, task_id, user_id, test_attempt_id, answer_payload, score, is_correct, submitted_at, duration_ms, "
+    "applied_scoring_policy, applied_max_score"
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_stats'),
+        ('training', '0012_test_score_histogram'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskattempt',
+            name='test_attempt',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='task_attempts', to='training.testattempt'),
+        ),
+        migrations.AlterField(
+            model_name='taskattempt',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_attempts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='ArchivedTaskAttempt',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('answer_payload', models.JSONField(blank=True, default=dict)),
+                ('score', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('is_correct', models.BooleanField(default=False)),
+                ('submitted_at', models.DateTimeField()),
+                ('duration_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('applied_scoring_policy', models.JSONField(blank=True, null=True)),
+                ('applied_max_score', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='tasks.task')),
+                ('test_attempt', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='training.testattempt')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Архивная попытка задания',
+                'verbose_name_plural': 'Архивные попытки заданий',
+                'indexes': [models.Index(fields=['user', 'task', 'submitted_at'], name='training_ar_user_id_2db617_idx'), models.Index(fields=['test_attempt', 'submitted_at'], name='training_ar_test_at_5e1ad5_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskAttemptHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('answer_payload', models.JSONField(blank=True, default=dict)),
+                ('score', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('is_correct', models.BooleanField(default=False)),
+                ('submitted_at', models.DateTimeField()),
+                ('duration_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('applied_scoring_policy', models.JSONField(blank=True, null=True)),
+                ('applied_max_score', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+            ],
+            options={
+                'verbose_name': 'Попытка задания (вся история)',
+                'verbose_name_plural': 'Попытки заданий (вся история)',
+                'db_table': 'training_taskattempt_history',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql=f"""
+                CREATE VIEW training_taskattempt_history AS
+                SELECT {HISTORY_COLUMNS} FROM training_taskattempt
+                UNION ALL
+                SELECT {HISTORY_COLUMNS} FROM training_archivedtaskattempt
+            """,
+            reverse_sql="DROP VIEW training_taskattempt_history",
+        ),
+    ]
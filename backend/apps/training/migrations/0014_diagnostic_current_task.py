@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-19 08:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_stats'),
+        ('training', '0013_task_attempt_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testattempt',
+            name='current_task',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tasks.task'),
+        ),
+    ]
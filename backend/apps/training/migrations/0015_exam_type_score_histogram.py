@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 08:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0003_examtype_time_limit'),
+        ('training', '0014_diagnostic_current_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamTypeScoreHistogram',
+            fields=[
+                ('buckets', models.JSONField(blank=True, default=list)),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('exam_type', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_histogram', serialize=False, to='exams.examtype')),
+            ],
+            options={
+                'verbose_name': 'Гистограмма результатов экзамена',
+                'verbose_name_plural': 'Гистограммы результатов экзаменов',
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:23
+
+from django.db import migrations, models
+
+from apps.training.domain.hyperloglog import empty_sketch, sketch_add
+
+
+def forwards_build_daily_activity(apps, schema_editor):
+    """
+    Daily active users used to be counted over DailyUserRollup on every request.
+    Build the per-date counts and sketches from the existing rollups once.
+    """
+
+    DailyUserRollup = apps.get_model("training", "DailyUserRollup")
+    DailyActivityRollup = apps.get_model("training", "DailyActivityRollup")
+
+    activity = {}
+    for day, user_id in DailyUserRollup.objects.order_by("date").values_list("date", "user_id").iterator():
+        row = activity.get(day)
+        if row is None:
+            row = activity[day] = DailyActivityRollup(date=day, users_sketch=empty_sketch())
+        row.active_users += 1
+        sketch_add(row.users_sketch, user_id)
+
+    for row in activity.values():
+        row.users_sketch = bytes(row.users_sketch)
+    DailyActivityRollup.objects.bulk_create(activity.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0015_exam_type_score_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivityRollup',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('active_users', models.PositiveIntegerField(default=0)),
+                ('users_sketch', models.BinaryField(default=bytes)),
+            ],
+            options={
+                'verbose_name': 'Дневная активность',
+                'verbose_name_plural': 'Дневная активность',
+            },
+        ),
+        migrations.RunPython(forwards_build_daily_activity, migrations.RunPython.noop),
+    ]
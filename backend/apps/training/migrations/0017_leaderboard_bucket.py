@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def forwards_count_leaderboard_buckets(apps, schema_editor):
+    """
+    Rank used to be a count of every LeaderboardScore row above the user.
+    Count the existing scores per (subject, period, integer part of the score) once.
+    """
+
+    LeaderboardScore = apps.get_model("training", "LeaderboardScore")
+    LeaderboardBucket = apps.get_model("training", "LeaderboardBucket")
+
+    counts = {}
+    for subject_id, period, score in LeaderboardScore.objects.values_list("subject_id", "period", "score").iterator():
+        key = (subject_id, period, max(int(score), 0))
+        counts[key] = counts.get(key, 0) + 1
+
+    LeaderboardBucket.objects.bulk_create(
+        [
+            LeaderboardBucket(subject_id=subject_id, period=period, bucket=bucket, user_count=count)
+            for (subject_id, period, bucket), count in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('graph', '0002_alter_concept_options_alter_node_options_and_more'),
+        ('training', '0016_daily_activity_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=16)),
+                ('bucket', models.PositiveIntegerField()),
+                ('user_count', models.PositiveIntegerField(default=0)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_buckets', to='graph.subject')),
+            ],
+            options={
+                'verbose_name': 'Корзина рейтинга',
+                'verbose_name_plural': 'Корзины рейтингов',
+                'unique_together': {('subject', 'period', 'bucket')},
+            },
+        ),
+        migrations.RunPython(forwards_count_leaderboard_buckets, migrations.RunPython.noop),
+    ]
@@ -4,7 +4,45 @@ Infrastructure layer: Django ORM models live in apps.training.infrastructure.mod
 This module re-exports them so Django can auto-discover models via apps.training.
 """
 
-from .infrastructure.models import TaskAttempt, Test, TestAttempt, TestItem
+from .infrastructure.models import (
+    AggregateCursor,
+    ArchivedTaskAttempt,
+    DailyActivityRollup,
+    DailySubjectRollup,
+    DailyUserRollup,
+    ExamTypeScoreHistogram,
+    LeaderboardBucket,
+    LeaderboardScore,
+    ReviewSchedule,
+    TaskAttempt,
+    TaskAttemptHistory,
+    Test,
+    TestAttempt,
+    TestItem,
+    TestScoreHistogram,
+    UserNodeProgress,
+    UserProgress,
+    UserSubjectProgress,
+)
 
-__all__ = ["Test", "TestItem", "TestAttempt", "TaskAttempt"]
+__all__ = [
+    "Test",
+    "TestItem",
+    "TestAttempt",
+    "TaskAttempt",
+    "ArchivedTaskAttempt",
+    "TaskAttemptHistory",
+    "ReviewSchedule",
+    "AggregateCursor",
+    "DailySubjectRollup",
+    "DailyUserRollup",
+    "DailyActivityRollup",
+    "UserProgress",
+    "UserSubjectProgress",
+    "UserNodeProgress",
+    "LeaderboardScore",
+    "LeaderboardBucket",
+    "TestScoreHistogram",
+    "ExamTypeScoreHistogram",
+]
 
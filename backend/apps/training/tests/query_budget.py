@@ -0,0 +1,310 @@
+"""
+Харнесс бюджетов SQL-запросов для API.
+
+Эндпоинт вызывается на данных растущего объема (`SEED_SCALES`); число запросов должно
+укладываться в бюджет и не меняться с ростом данных. При регрессии тест падает с diff
+нормализованного SQL между базовым и выросшим набором данных (N+1 видны как лишние строки).
+"""
+
+from __future__ import annotations
+
+import difflib
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.exams.models import Exam, ExamTaskGroup, ExamTaskType, ExamType
+from apps.graph.models import Node, Subject
+from apps.tasks.domain.enums import TaskType
+from apps.tasks.models import Task, TaskNode
+from apps.training.application import diagnostic, exam_variants
+from apps.training.application.leaderboard import rebuild_leaderboards
+from apps.training.application.progress import rebuild_all_user_progress
+from apps.training.application.rollups import build_daily_rollups
+from apps.training.application.score_histogram import rebuild_score_histograms
+from apps.training.application.task_stats import refresh_task_stats
+from apps.training.domain.enums import AttemptStatus, TestMode
+from apps.training.models import ReviewSchedule, TaskAttempt, Test, TestAttempt, TestItem
+from apps.users.models import ParentChildLink, StudyGroup, StudyGroupMembership, User
+
+SEED_SCALES = (1, 3, 9)
+
+# Per scale unit.
+TASKS_PER_SCALE = 10
+NODES_PER_SCALE = 2
+STUDENTS_PER_SCALE = 2
+ANSWERS_PER_STUDENT_PER_SCALE = 5
+TEST_ITEMS_PER_SCALE = 2
+HISTORY_DAYS = 20
+
+ANSWER_KEYS = {
+    TaskType.SHORT_TEXT.value: ({"correct": ["масса"]}, {"value": "масса"}),
+    TaskType.NUMBER.value: ({"correct": [3.14], "tolerance": 0.01}, {"value": "3.14"}),
+    TaskType.SINGLE_CHOICE.value: ({"correct": "b"}, {"value": "b"}),
+    TaskType.MULTI_CHOICE.value: ({"correct": ["a", "c"]}, {"value": ["a", "c"]}),
+    TaskType.MATCH.value: ({"correct": {"1": "a", "2": "b"}}, {"value": {"1": "a", "2": "b"}}),
+}
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"IN \((?:\?|%s)(?:, (?:\?|%s))*\)")
+_SAVEPOINTS = re.compile(r'"s\d+_x\d+"')
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    SQL без литералов: разные id и размеры `IN (...)` не считаются изменением запроса.
+
+    Пример:
+        normalize_sql('SELECT 1 FROM "t" WHERE "id" IN (3, 4)') -> 'SELECT ? FROM "t" WHERE "id" IN (...)'
+    """
+    return _IN_LISTS.sub("IN (...)", _LITERALS.sub("?", _SAVEPOINTS.sub('"savepoint"', sql)))
+
+
+def reset_caches() -> None:
+    """
+    Холодный старт для замера: общий кеш и кеши процесса (индексы вариантов, банки диагностики).
+    """
+    cache.clear()
+    exam_variants._variant_indexes.clear()
+    diagnostic._item_banks.clear()
+
+
+class SeedWorld:
+    """
+    Учебные данные, которые можно наращивать: `grow(scale)` досоздает объекты до масштаба `scale`.
+
+    Все вставки — bulk; агрегаты (прогресс, рейтинги, статистика, сводки) пересчитываются
+    штатными пересборками, как после бэкфилла.
+
+    Пример:
+        world = SeedWorld()
+        world.grow(1)
+        world.grow(9)
+    """
+
+    def __init__(self):
+        self.scale = 0
+        self.subject = Subject.objects.create(title="Математика")
+        self.teacher = User.objects.create_user(username="teacher", password="x")
+        self.parent = User.objects.create_user(username="parent", password="x")
+        self.staff = User.objects.create_user(username="staff", password="x", is_staff=True, is_superuser=True)
+        self.student = User.objects.create_user(username="student", password="x")
+        self.group = StudyGroup.objects.create(title="9А", teacher=self.teacher)
+        self.exam_type = ExamType.objects.create(exam=Exam.objects.create(title="ЕГЭ"), subject=self.subject)
+        self.test = Test.objects.create(title="Контрольная", subject=self.subject, mode=TestMode.EXAM.value)
+        self.students = [self.student]
+        self.tasks: list[Task] = []
+        self.nodes: list[Node] = []
+        StudyGroupMembership.objects.create(group=self.group, student=self.student)
+        ParentChildLink.objects.create(parent=self.parent, child=self.student)
+
+    def grow(self, scale: int) -> None:
+        if scale <= self.scale:
+            return
+        previous, self.scale = self.scale, scale
+        now = timezone.now()
+
+        nodes = Node.objects.bulk_create(
+            [
+                Node(title=f"Вершина {index}", subject=self.subject)
+                for index in range(previous * NODES_PER_SCALE, scale * NODES_PER_SCALE)
+            ]
+        )
+        self.nodes.extend(nodes)
+
+        groups = ExamTaskGroup.objects.bulk_create(
+            [
+                ExamTaskGroup(exam_type=self.exam_type, num=num, title=f"Задание {num}", max_score=1)
+                for num in range(previous + 1, scale + 1)
+            ]
+        )
+        exam_task_types = ExamTaskType.objects.bulk_create(
+            [ExamTaskType(exam_task_group=group, title=f"Тип {group.num}") for group in groups]
+        )
+
+        task_types = list(ANSWER_KEYS)
+        tasks = Task.objects.bulk_create(
+            [
+                Task(
+                    subject=self.subject,
+                    task_type=task_types[index % len(task_types)],
+                    prompt=f"Задание {index}",
+                    answer_key=ANSWER_KEYS[task_types[index % len(task_types)]][0],
+                    exam_task_type=exam_task_types[index % len(exam_task_types)],
+                    irt_difficulty=(index % 7 - 3) / 2,
+                )
+                for index in range(previous * TASKS_PER_SCALE, scale * TASKS_PER_SCALE)
+            ]
+        )
+        self.tasks.extend(tasks)
+        TaskNode.objects.bulk_create(
+            [TaskNode(task=task, node=self.nodes[index % len(self.nodes)]) for index, task in enumerate(tasks)]
+        )
+        TestItem.objects.bulk_create(
+            [
+                TestItem(test=self.test, task=self.tasks[order - 1], order=order, max_score=1)
+                for order in range(previous * TEST_ITEMS_PER_SCALE + 1, scale * TEST_ITEMS_PER_SCALE + 1)
+            ]
+        )
+
+        new_students = User.objects.bulk_create(
+            [
+                User(username=f"student-{index}")
+                for index in range(previous * STUDENTS_PER_SCALE, scale * STUDENTS_PER_SCALE)
+            ]
+        )
+        self.students.extend(new_students)
+        StudyGroupMembership.objects.bulk_create(
+            [StudyGroupMembership(group=self.group, student=student) for student in new_students]
+        )
+        ParentChildLink.objects.bulk_create([ParentChildLink(parent=self.parent, child=child) for child in new_students])
+
+        # Every student (old and new) answers up to ANSWERS_PER_STUDENT_PER_SCALE * scale tasks.
+        answers = []
+        for student_index, student in enumerate(self.students):
+            start = 0 if student in new_students else previous * ANSWERS_PER_STUDENT_PER_SCALE
+            for offset in range(start, scale * ANSWERS_PER_STUDENT_PER_SCALE):
+                task = self.tasks[(student_index + offset) % len(self.tasks)]
+                is_correct = (student_index + offset) % 3 != 0
+                answers.append(
+                    TaskAttempt(
+                        user=student,
+                        task=task,
+                        answer_payload={},
+                        score=Decimal(is_correct),
+                        is_correct=is_correct,
+                        duration_ms=1_000 + offset * 10,
+                        applied_max_score=Decimal(1),
+                    )
+                )
+        TaskAttempt.objects.bulk_create(answers)
+        # `submitted_at` is auto_now_add: spread the history over the last days afterwards.
+        ids_by_day: dict[int, list[int]] = {}
+        for index, answer in enumerate(answers):
+            ids_by_day.setdefault(index % HISTORY_DAYS, []).append(answer.id)
+        for days, ids in ids_by_day.items():
+            TaskAttempt.objects.filter(id__in=ids).update(submitted_at=now - timedelta(days=days, hours=1))
+        ReviewSchedule.objects.bulk_create(
+            [
+                ReviewSchedule(user=answer.user, task=answer.task, due_at=now, last_reviewed_at=now)
+                for answer in answers
+            ],
+            ignore_conflicts=True,
+        )
+        TestAttempt.objects.bulk_create(
+            [
+                TestAttempt(
+                    user=student,
+                    test=self.test,
+                    status=AttemptStatus.FINISHED.value,
+                    finished_at=now,
+                    total_score=Decimal(index % 5),
+                    max_score=Decimal(scale * TEST_ITEMS_PER_SCALE),
+                )
+                for index, student in enumerate(new_students)
+            ]
+        )
+
+        rebuild_all_user_progress()
+        rebuild_leaderboards()
+        rebuild_score_histograms()
+        refresh_task_stats(lag_minutes=0)
+        build_daily_rollups(lag_minutes=0)
+
+
+# Budgets are measured on one database: a replica mirror would not see the test's uncommitted data.
+# Budgets count application queries: a `database` cache backend (CACHE_BACKEND) would add its own.
+@override_settings(
+    DATABASE_ROUTERS=[],
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class QueryBudgetTestCase(APITestCase):
+    """
+    База для тестов бюджетов: `self.world` — растущие данные, `assertQueryBudget` — проверка.
+    """
+
+    scales = SEED_SCALES
+
+    def setUp(self):
+        self.world = SeedWorld()
+
+    def assertQueryBudget(self, budget: int, request, *, prepare=None, user=None, status_code: int = 200):
+        """
+        Вызывает `request(prepared)` на каждом масштабе данных и проверяет число SQL-запросов.
+
+        - `prepare()` выполняется до замера (его запросы не считаются), результат передается в `request`;
+        - `user` — от чьего имени запрос (по умолчанию `world.student`);
+        - кеши сбрасываются перед каждым замером (холодный путь);
+        - перед первым замером запрос выполняется вхолостую: разовые `get_or_create`
+          (служебные тесты, первые строки агрегатов) не попадают в базовую линию.
+
+        Пример:
+            self.assertQueryBudget(3, lambda _: self.client.get("/api/training/progress/"))
+        """
+        self.client.force_authenticate(user or self.world.student)
+
+        baseline = None
+        for scale in self.scales:
+            self.world.grow(scale)
+            if baseline is None:
+                request(prepare() if prepare is not None else None)
+            prepared = prepare() if prepare is not None else None
+            queries = self._capture_queries(lambda: request(prepared), status_code=status_code)
+            baseline = self._check_queries(budget, scale, queries, baseline=baseline)
+
+    def assertQueryBudgets(self, budget: int, requests: dict, *, status_code: int = 200):
+        """
+        Как `assertQueryBudget` для набора запросов (`label -> request()`): данные наращиваются
+        один раз на масштаб, регрессии собираются по всем запросам.
+
+        Пример:
+            self.assertQueryBudgets(10, {url: lambda url=url: client.get(url) for url in urls})
+        """
+        baselines = {}
+        failures: dict[str, str] = {}
+        for scale in self.scales:
+            self.world.grow(scale)
+            for label, request in requests.items():
+                if label in failures:
+                    continue
+                if label not in baselines:
+                    request()
+                queries = self._capture_queries(request, status_code=status_code)
+                try:
+                    baselines[label] = self._check_queries(budget, scale, queries, baseline=baselines.get(label))
+                except self.failureException as exc:
+                    failures[label] = f"{label}: {exc}"
+        if failures:
+            self.fail("\n\n".join(failures.values()))
+
+    def _capture_queries(self, request, *, status_code: int) -> list[str]:
+        reset_caches()
+        with CaptureQueriesContext(connection) as context:
+            response = request()
+            if getattr(response, "streaming", False):
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, status_code, getattr(response, "data", response))
+        return [normalize_sql(query["sql"]) for query in context.captured_queries]
+
+    def _check_queries(self, budget: int, scale: int, queries: list[str], *, baseline):
+        if len(queries) > budget:
+            self.fail(
+                f"{len(queries)} queries at scale {scale}, budget is {budget}:\n"
+                + "\n".join(f"  {index}. {sql}" for index, sql in enumerate(queries, start=1))
+            )
+        if baseline is None:
+            return scale, queries
+        if len(queries) > len(baseline[1]):
+            diff = difflib.unified_diff(baseline[1], queries, f"scale {baseline[0]}", f"scale {scale}", lineterm="", n=1)
+            self.fail(
+                f"Query count grows with data: {len(baseline[1])} at scale {baseline[0]}, "
+                f"{len(queries)} at scale {scale}.\n" + "\n".join(diff)
+            )
+        return baseline
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.graph.models import Subject
+from apps.tasks.domain.enums import TaskType
+from apps.tasks.models import Task
+from apps.training.application.archive import archive_task_attempts
+from apps.training.application.progress import rebuild_all_user_progress
+from apps.training.application.rollups import build_daily_rollups
+from apps.training.application.task_stats import refresh_task_stats
+from apps.training.domain.enums import AttemptStatus, TestMode
+from apps.training.models import (
+    ArchivedTaskAttempt,
+    TaskAttempt,
+    TaskAttemptHistory,
+    Test,
+    TestAttempt,
+    UserProgress,
+)
+from apps.training.tests.query_budget import ANSWER_KEYS
+from apps.users.models import User
+
+
+# Replica reads would not see this TestCase's uncommitted data.
+@override_settings(DATABASE_ROUTERS=[])
+class TaskAttemptArchiveTests(APITestCase):
+    def setUp(self):
+        subject = Subject.objects.create(title="Физика")
+        answer_key, self.answer_payload = ANSWER_KEYS[TaskType.SHORT_TEXT.value]
+        self.tasks = [
+            Task.objects.create(subject=subject, task_type=TaskType.SHORT_TEXT.value, prompt="?", answer_key=answer_key)
+            for _ in range(3)
+        ]
+        self.student = User.objects.create_user(username="student", password="x")
+        test = Test.objects.create(title="Тест", subject=subject, mode=TestMode.SIMPLE)
+        self.finished = TestAttempt.objects.create(user=self.student, test=test, status=AttemptStatus.FINISHED)
+        self.started = TestAttempt.objects.create(user=self.student, test=test, status=AttemptStatus.STARTED)
+
+        old = timezone.now() - timedelta(days=365)
+        self.old_practice = self._answer(self.tasks[0], submitted_at=old)
+        self.old_finished = self._answer(self.tasks[1], submitted_at=old, test_attempt=self.finished)
+        self.old_started = self._answer(self.tasks[2], submitted_at=old, test_attempt=self.started)
+        self.fresh = self._answer(self.tasks[0], submitted_at=timezone.now(), is_correct=False)
+
+    def test_waits_for_incremental_aggregates(self):
+        self.assertEqual(archive_task_attempts(older_than_days=30), 0)
+
+        self._run_aggregates()
+        self.assertEqual(archive_task_attempts(older_than_days=30), 2)
+
+        self.assertEqual(
+            set(ArchivedTaskAttempt.objects.values_list("id", flat=True)), {self.old_practice.id, self.old_finished.id}
+        )
+        self.assertEqual(
+            set(TaskAttempt.hot_objects.values_list("id", flat=True)), {self.old_started.id, self.fresh.id}
+        )
+        self.assertEqual(TaskAttemptHistory.objects.count(), 4)
+        self.assertEqual(archive_task_attempts(older_than_days=30), 0)
+
+    def test_history_reads_see_archived_rows(self):
+        self._run_aggregates()
+        archive_task_attempts(older_than_days=30)
+
+        rebuild_all_user_progress()
+        progress = UserProgress.objects.get(user=self.student)
+        self.assertEqual((progress.attempt_count, progress.correct_count, progress.solved_task_count), (4, 3, 3))
+
+        self.client.force_authenticate(self.student)
+        response = self.client.get(f"/api/training/test-attempt/summary/?test_attempt_id={self.finished.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["task_id"] for item in response.json()["items"]], [self.tasks[1].id])
+
+    def test_default_manager_reads_history_and_writes_hot_table(self):
+        self._run_aggregates()
+        archive_task_attempts(older_than_days=30)
+
+        self.assertEqual(TaskAttempt.objects.count(), 4)
+        self.assertEqual(self.student.task_attempts.count(), 4)
+        self.assertEqual(list(self.finished.task_attempts.values_list("id", flat=True)), [self.old_finished.id])
+        self.assertTrue(TaskAttempt.objects.get(id=self.old_practice.id).is_archived())
+
+        self.assertEqual(self.student.task_attempts.update(duration_ms=1), 2)
+        self.student.task_attempts.filter(is_correct=True).delete()
+        self.assertEqual(list(TaskAttempt.hot_objects.values_list("id", flat=True)), [self.fresh.id])
+        self.assertEqual(ArchivedTaskAttempt.objects.filter(duration_ms=1).count(), 0)
+        self.assertEqual(TaskAttempt.objects.count(), 3)
+
+    def _answer(self, task, *, submitted_at, test_attempt=None, is_correct=True):
+        attempt = TaskAttempt.objects.create(
+            user=self.student,
+            task=task,
+            test_attempt=test_attempt,
+            answer_payload=self.answer_payload,
+            score=int(is_correct),
+            is_correct=is_correct,
+        )
+        # `submitted_at` is auto_now_add: backdate after insert.
+        TaskAttempt.objects.filter(id=attempt.id).update(submitted_at=submitted_at)
+        return attempt
+
+    def _run_aggregates(self):
+        refresh_task_stats(lag_minutes=0)
+        build_daily_rollups(lag_minutes=0)
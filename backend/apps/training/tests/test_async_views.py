@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.graph.models import Subject
+from apps.tasks.domain.enums import TaskType
+from apps.tasks.models import Task
+from apps.training.models import TaskAttempt, UserProgress
+from apps.training.tests.query_budget import ANSWER_KEYS, reset_caches
+from apps.users.models import User
+
+
+# Replica reads would not see this TestCase's uncommitted data.
+@override_settings(DATABASE_ROUTERS=[])
+class AsyncTrainingViewsTests(TestCase):
+    def setUp(self):
+        reset_caches()
+        subject = Subject.objects.create(title="Физика")
+        answer_key, self.answer_payload = ANSWER_KEYS[TaskType.SHORT_TEXT.value]
+        self.task = Task.objects.create(
+            subject=subject, task_type=TaskType.SHORT_TEXT.value, prompt="?", answer_key=answer_key
+        )
+        self.student = User.objects.create_user(username="student", password="x")
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.student)}"}
+
+    async def test_practice_session(self):
+        response = await self.async_client.get("/api/training/async/random-task/", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        task = response.json()
+        self.assertEqual(task["id"], self.task.id)
+        test_attempt_id = task["test_attempt_id"]
+
+        response = await self.async_client.post(
+            "/api/training/async/submit-answer/",
+            {"task_id": self.task.id, "answer_payload": self.answer_payload, "test_attempt_id": test_attempt_id},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_correct"])
+        self.assertEqual(await TaskAttempt.objects.filter(user=self.student).acount(), 1)
+        self.assertEqual((await UserProgress.objects.aget(user=self.student)).correct_count, 1)
+
+        response = await self.async_client.get(
+            f"/api/training/async/test-attempt/summary/?test_attempt_id={test_attempt_id}", headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Decimal(response.json()["total_score"]), 1)
+        self.assertEqual([item["task_id"] for item in response.json()["items"]], [self.task.id])
+
+        response = await self.async_client.post(
+            "/api/training/async/random-session/finish/",
+            {"test_attempt_id": test_attempt_id},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(response.json()["status"], "finished")
+
+    async def test_errors_match_sync_api(self):
+        response = await self.async_client.get("/api/training/async/random-task/")
+        sync_response = await self.async_client.get("/api/training/random-task/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response["WWW-Authenticate"], sync_response["WWW-Authenticate"])
+
+        response = await self.async_client.get(
+            "/api/training/async/random-task/", headers={"Authorization": "Bearer not-a-token"}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_not_valid")
+
+        response = await self.async_client.post(
+            "/api/training/async/submit-answer/", "{", content_type="application/json", headers=self.headers
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = await self.async_client.post(
+            "/api/training/async/submit-answer/", {}, content_type="application/json", headers=self.headers
+        )
+        self.assertEqual(response.json(), {"error": "task_id is required."})
+
+        response = await self.async_client.get(
+            "/api/training/async/test-attempt/summary/?test_attempt_id=999", headers=self.headers
+        )
+        self.assertEqual((response.status_code, response.json()), (400, {"error": "Invalid test_attempt_id."}))
+
+    def test_summary_matches_sync_view(self):
+        test_attempt_id = self.client.get("/api/training/random-task/", headers=self.headers).json()["test_attempt_id"]
+        self.client.post(
+            "/api/training/submit-answer/",
+            {"task_id": self.task.id, "answer_payload": self.answer_payload, "test_attempt_id": test_attempt_id},
+            content_type="application/json",
+            headers=self.headers,
+        )
+
+        path = f"test-attempt/summary/?test_attempt_id={test_attempt_id}"
+        sync_response = self.client.get(f"/api/training/{path}", headers=self.headers)
+        async_response = async_to_sync(self.async_client.get)(f"/api/training/async/{path}", headers=self.headers)
+        self.assertEqual(async_response.json(), sync_response.json())
@@ -0,0 +1,72 @@
+import ast
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from django.test import SimpleTestCase
+
+from apps.training.infrastructure.npy import HEADER_SIZE, MAGIC, append_column
+
+try:
+    import numpy
+except ImportError:  # numpy is not a dependency: the header is parsed by hand then.
+    numpy = None
+
+TYPECODES = {"<i8": "q", "<i4": "i", "<f8": "d", "|b1": "B"}
+
+
+class NpyAppendColumnTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "user_id.npy")
+
+    def test_append_and_truncate_round_trip(self):
+        self.assertEqual(append_column(self.path, descr="<i8", values=array("q", [1, 2, 3]), rows_before=0), 3)
+        self.assertEqual(self._load(), ("<i8", (3,), [1, 2, 3]))
+
+        self.assertEqual(append_column(self.path, descr="<i8", values=array("q", [4, 5]), rows_before=3), 5)
+        self.assertEqual(self._load(), ("<i8", (5,), [1, 2, 3, 4, 5]))
+
+        # An interrupted run left row 5 on disk but the manifest says 4: the tail is replaced, not duplicated.
+        self.assertEqual(append_column(self.path, descr="<i8", values=array("q", [9, 10]), rows_before=4), 6)
+        self.assertEqual(self._load(), ("<i8", (6,), [1, 2, 3, 4, 9, 10]))
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + 6 * 8)
+
+    def test_other_dtypes(self):
+        for descr, values, expected in (
+            ("<f8", array("d", [0.5, 2.0]), [0.5, 2.0]),
+            ("<i4", array("i", [-1, 4200]), [-1, 4200]),
+            ("|b1", array("B", [1, 0]), [True, False]),
+        ):
+            with self.subTest(descr=descr):
+                path = os.path.join(self.directory, f"{values.typecode}.npy")
+                append_column(path, descr=descr, values=values, rows_before=0)
+                self.assertEqual(self._load(path), (descr, (2,), expected))
+
+    def _load(self, path: str | None = None) -> tuple[str, tuple, list]:
+        path = path or self.path
+        if numpy is not None:
+            column = numpy.load(path, mmap_mode="r")
+            return column.dtype.str, column.shape, column.tolist()
+
+        with open(path, "rb") as file:
+            data = file.read()
+        self.assertEqual(data[: len(MAGIC)], MAGIC)
+        (header_length,) = struct.unpack("<H", data[len(MAGIC) : len(MAGIC) + 2])
+        self.assertEqual(len(MAGIC) + 2 + header_length, HEADER_SIZE)
+        header = ast.literal_eval(data[len(MAGIC) + 2 : HEADER_SIZE].decode("latin1"))
+        self.assertFalse(header["fortran_order"])
+
+        values = array(TYPECODES[header["descr"]])
+        values.frombytes(data[HEADER_SIZE:])
+        if sys.byteorder != "little":
+            values.byteswap()
+        self.assertEqual((len(values),), header["shape"])
+        values = values.tolist()
+        if header["descr"] == "|b1":
+            values = [bool(value) for value in values]
+        return header["descr"], header["shape"], values
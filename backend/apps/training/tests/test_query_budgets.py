@@ -0,0 +1,166 @@
+from django.contrib import admin
+from django.test import Client
+
+from apps.training.application.test_runner import start_test_attempt
+from apps.training.application.use_cases import submit_task_answer
+from apps.training.tests.query_budget import ANSWER_KEYS, TASKS_PER_SCALE, QueryBudgetTestCase
+
+
+class TrainingQueryBudgetTests(QueryBudgetTestCase):
+    def test_random_task(self):
+        self.assertQueryBudget(
+            4, lambda _: self.client.get(f"/api/training/random-task/?subject_id={self.world.subject.id}")
+        )
+
+    def test_submit_answer(self):
+        def request(_):
+            # Same task at every scale: a first answer also inserts its ReviewSchedule row.
+            task = self.world.tasks[TASKS_PER_SCALE - 1]
+            return self.client.post(
+                "/api/training/submit-answer/",
+                {"task_id": task.id, "answer_payload": ANSWER_KEYS[task.task_type][1]},
+                format="json",
+            )
+
+        self.assertQueryBudget(15, request)
+
+    def test_submit_answer_in_test(self):
+        def prepare():
+            return start_test_attempt(user=self.world.student, test_id=self.world.test.id)
+
+        def request(attempt):
+            task = self.world.tasks[0]
+            return self.client.post(
+                "/api/training/submit-answer/",
+                {"task_id": task.id, "test_attempt_id": attempt.id, "answer_payload": ANSWER_KEYS[task.task_type][1]},
+                format="json",
+            )
+
+        # The leading student's score moves into a new leaderboard bucket on every answer.
+        self.assertQueryBudget(25, request, prepare=prepare)
+
+    def test_start_test_attempt(self):
+        self.assertQueryBudget(
+            3,
+            lambda _: self.client.post(
+                "/api/training/test-attempt/start/", {"test_id": self.world.test.id}, format="json"
+            ),
+        )
+
+    def test_next_test_item(self):
+        self.assertQueryBudget(
+            2,
+            lambda attempt: self.client.get(f"/api/training/test-attempt/next-item/?test_attempt_id={attempt.id}"),
+            prepare=lambda: start_test_attempt(user=self.world.student, test_id=self.world.test.id),
+        )
+
+    def test_finish_test_attempt(self):
+        def prepare():
+            attempt = start_test_attempt(user=self.world.student, test_id=self.world.test.id)
+            task = self.world.tasks[0]
+            submit_task_answer(
+                user=self.world.student,
+                task_id=task.id,
+                answer_payload=ANSWER_KEYS[task.task_type][1],
+                test_attempt_id=attempt.id,
+            )
+            return attempt
+
+        self.assertQueryBudget(
+            10,
+            lambda attempt: self.client.post(
+                "/api/training/test-attempt/finish/", {"test_attempt_id": attempt.id}, format="json"
+            ),
+            prepare=prepare,
+        )
+
+    def test_test_attempt_summary(self):
+        def prepare():
+            attempt = start_test_attempt(user=self.world.student, test_id=self.world.test.id)
+            for task in self.world.tasks[:2]:
+                submit_task_answer(
+                    user=self.world.student,
+                    task_id=task.id,
+                    answer_payload=ANSWER_KEYS[task.task_type][1],
+                    test_attempt_id=attempt.id,
+                )
+            return attempt
+
+        self.assertQueryBudget(
+            3,
+            lambda attempt: self.client.get(f"/api/training/test-attempt/summary/?test_attempt_id={attempt.id}"),
+            prepare=prepare,
+        )
+
+    def test_diagnostic_start(self):
+        self.assertQueryBudget(
+            5,
+            lambda _: self.client.post(
+                "/api/training/diagnostic/start/", {"subject_id": self.world.subject.id}, format="json"
+            ),
+        )
+
+    def test_claim_exam_variant(self):
+        # Empty pool: the SKIP LOCKED lookup (with its savepoint) and an on-the-fly build.
+        self.assertQueryBudget(
+            10,
+            lambda _: self.client.post(
+                "/api/training/exam-variants/claim/", {"exam_type_id": self.world.exam_type.id}, format="json"
+            ),
+        )
+
+    def test_review_queue(self):
+        self.assertQueryBudget(1, lambda _: self.client.get("/api/training/review-queue/"))
+
+    def test_progress(self):
+        self.assertQueryBudget(2, lambda _: self.client.get("/api/training/progress/"))
+
+    def test_children_progress(self):
+        self.assertQueryBudget(
+            2, lambda _: self.client.get("/api/training/children-progress/"), user=self.world.parent
+        )
+
+    def test_leaderboard(self):
+        self.assertQueryBudget(
+            2, lambda _: self.client.get(f"/api/training/leaderboard/?subject_id={self.world.subject.id}")
+        )
+
+    def test_class_report(self):
+        self.assertQueryBudget(
+            4,
+            lambda _: self.client.get(
+                f"/api/training/class-report/?group_id={self.world.group.id}&subject_id={self.world.subject.id}"
+            ),
+            user=self.world.teacher,
+        )
+
+    def test_dashboard(self):
+        self.assertQueryBudget(3, lambda _: self.client.get("/api/training/dashboard/"), user=self.world.staff)
+
+    def test_attempts_export(self):
+        self.assertQueryBudget(
+            2, lambda _: self.client.get("/api/training/attempts/export/"), user=self.world.staff
+        )
+
+
+class CatalogQueryBudgetTests(QueryBudgetTestCase):
+    def test_task_stats(self):
+        self.assertQueryBudget(1, lambda _: self.client.get("/api/tasks/stats/"), user=self.world.staff)
+
+    def test_tasks_export(self):
+        self.assertQueryBudget(3, lambda _: self.client.get("/api/tasks/export/"), user=self.world.staff)
+
+    def test_subjects(self):
+        self.assertQueryBudget(1, lambda _: self.client.get("/api/graph/subjects/"))
+
+    def test_exam_tree(self):
+        self.assertQueryBudget(5, lambda _: self.client.get("/api/exams/tree/"))
+
+
+class AdminQueryBudgetTests(QueryBudgetTestCase):
+    def test_changelists(self):
+        # Changelists render `__str__` of related objects: the usual source of N+1.
+        admin_client = Client()
+        admin_client.force_login(self.world.staff)
+        urls = [f"/admin/{model._meta.app_label}/{model._meta.model_name}/" for model in admin.site._registry]
+        self.assertQueryBudgets(7, {url: lambda url=url: admin_client.get(url) for url in urls})
@@ -0,0 +1,117 @@
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.graph.models import Subject
+from apps.tasks.domain.enums import TaskType
+from apps.tasks.models import Task
+from apps.training.models import Test, TestAttempt
+from apps.training.tests.query_budget import ANSWER_KEYS, reset_caches
+from apps.users.models import User
+from config.replica import REPLICA_DATABASE_ALIAS
+
+
+@skipUnless(
+    REPLICA_DATABASE_ALIAS in settings.DATABASES,
+    "Set DB_REPLICA_NAME (or DB_REPLICA_HOST) to run replica routing tests.",
+)
+class ReplicaRoutingTests(APITransactionTestCase):
+    # The replica mirrors the default test database: routing is observed through per-alias query counts.
+    databases = "__all__"
+
+    def setUp(self):
+        reset_caches()
+        subject = Subject.objects.create(title="Физика")
+        answer_key, self.answer_payload = ANSWER_KEYS[TaskType.SHORT_TEXT.value]
+        self.task = Task.objects.create(
+            subject=subject, task_type=TaskType.SHORT_TEXT.value, prompt="?", answer_key=answer_key
+        )
+        self.student = User.objects.create_user(username="student", password="x")
+        self.client.force_authenticate(self.student)
+
+    def test_reporting_reads_go_to_replica(self):
+        response, primary, replica = self._count_queries(lambda: self.client.get("/api/training/progress/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_writes_go_to_primary(self):
+        response, primary, replica = self._count_queries(self._submit)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_own_submit_pins_reads_to_primary(self):
+        self._submit()
+
+        response, primary, replica = self._count_queries(lambda: self.client.get("/api/training/progress/"))
+        self.assertEqual(response.json()["attempt_count"], 1)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+        self.client.force_authenticate(User.objects.create_user(username="other", password="x"))
+        _, primary, replica = self._count_queries(lambda: self.client.get("/api/training/progress/"))
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_replica_reads_do_not_fill_cache(self):
+        self.client.get("/api/training/progress/")
+
+        # A lagging replica may not have seen the latest answer yet: the second read goes to it again.
+        _, primary, replica = self._count_queries(lambda: self.client.get("/api/training/progress/"))
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_streaming_export_reads_replica(self):
+        self._submit()
+        self.client.force_authenticate(User.objects.create_user(username="staff", password="x", is_staff=True))
+
+        def export():
+            response = self.client.get("/api/training/attempts/export/")
+            response.content_lines = b"".join(response.streaming_content).splitlines()
+            return response
+
+        response, primary, replica = self._count_queries(export)
+        self.assertEqual(len(response.content_lines), 1)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_async_summary_reads_replica(self):
+        test = Test.objects.create(title="Тест", subject=self.task.subject)
+        attempt = TestAttempt.objects.create(user=self.student, test=test)
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.student)}"}
+
+        with (
+            CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary,
+            CaptureQueriesContext(connections[REPLICA_DATABASE_ALIAS]) as replica,
+        ):
+            response = async_to_sync(self.async_client.get)(
+                f"/api/training/async/test-attempt/summary/?test_attempt_id={attempt.id}", headers=headers
+            )
+
+        self.assertEqual(response.status_code, 200)
+        # Only the token's user lookup, which runs before the read alias is chosen.
+        self.assertEqual([query["sql"].split(" FROM ")[1].split()[0] for query in primary], ['"users_user"'])
+        self.assertGreater(len(replica), 0)
+
+    def _submit(self):
+        return self.client.post(
+            "/api/training/submit-answer/",
+            {"task_id": self.task.id, "answer_payload": self.answer_payload},
+            format="json",
+        )
+
+    def _count_queries(self, request):
+        with (
+            CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary,
+            CaptureQueriesContext(connections[REPLICA_DATABASE_ALIAS]) as replica,
+        ):
+            response = request()
+        return response, len(primary), len(replica)
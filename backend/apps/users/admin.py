@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 
+from apps.users.models import ParentChildLink, StudyGroup, StudyGroupMembership
+
 User = get_user_model()
 
 
@@ -13,4 +15,29 @@ class UserAdmin(admin.ModelAdmin):
     ordering = ("id",)
 
 
+class StudyGroupMembershipInline(admin.TabularInline):
+    model = StudyGroupMembership
+    extra = 0
+    autocomplete_fields = ("student",)
+
+
+@admin.register(StudyGroup)
+class StudyGroupAdmin(admin.ModelAdmin):
+    list_display = ("id", "title", "teacher", "created_at")
+    list_select_related = ("teacher",)
+    search_fields = ("title", "teacher__username")
+    ordering = ("title",)
+    autocomplete_fields = ("teacher",)
+    inlines = (StudyGroupMembershipInline,)
+
+
+@admin.register(ParentChildLink)
+class ParentChildLinkAdmin(admin.ModelAdmin):
+    list_display = ("id", "parent", "child", "created_at")
+    list_select_related = ("parent", "child")
+    search_fields = ("parent__username", "child__username")
+    ordering = ("-id",)
+    autocomplete_fields = ("parent", "child")
+
+
 admin.site.unregister(Group)
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_study_groups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParentChildLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parent_links', to=settings.AUTH_USER_MODEL)),
+                ('parent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='child_links', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Связь родитель — ученик',
+                'verbose_name_plural': 'Связи родитель — ученик',
+                'unique_together': {('parent', 'child')},
+            },
+        ),
+    ]
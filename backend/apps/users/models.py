@@ -25,3 +25,70 @@ class User(AbstractUser):
         choices=ROLE_CHOICES,
         default="student"
     )
+
+
+class StudyGroup(models.Model):
+    """
+    Учебная группа (класс) учителя.
+
+    Зачем:
+    - учитель видит результаты своих учеников (отчет по классу);
+    - ученик может состоять в нескольких группах (например, у разных учителей).
+
+    Пример:
+        group = StudyGroup.objects.create(title="9А", teacher=teacher)
+        group.memberships.create(student=student)
+    """
+
+    title = models.CharField(max_length=255)
+    teacher = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="study_groups")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Учебная группа"
+        verbose_name_plural = "Учебные группы"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.title
+
+
+class StudyGroupMembership(models.Model):
+    """
+    Ученик в учебной группе.
+
+    Пример:
+        StudyGroupMembership.objects.filter(group=group).values_list("student_id", flat=True)
+    """
+
+    group = models.ForeignKey("users.StudyGroup", on_delete=models.CASCADE, related_name="memberships")
+    student = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="group_memberships")
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Участник группы"
+        verbose_name_plural = "Участники групп"
+        unique_together = [("group", "student")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.group_id} / {self.student_id}"
+
+
+class ParentChildLink(models.Model):
+    """
+    Связь родителя с учеником: родитель видит прогресс привязанных детей.
+
+    Пример:
+        ParentChildLink.objects.create(parent=mother, child=ivan)
+    """
+
+    parent = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="child_links")
+    child = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="parent_links")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Связь родитель — ученик"
+        verbose_name_plural = "Связи родитель — ученик"
+        unique_together = [("parent", "child")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.parent_id} -> {self.child_id}"
@@ -0,0 +1,57 @@
+"""
+Настройки кеша из переменных окружения (`CACHES["default"]`).
+
+На кеше держатся версии и снапшоты, которые инвалидируются из сигналов: дерево рубрикатора, структура тестов,
+версии прогресса, метка read-your-writes реплики. Сигнал срабатывает только в процессе, принявшем запись,
+поэтому при нескольких воркерах кеш обязан быть общим — иначе остальные процессы отдают старые данные до TTL.
+
+`CACHE_BACKEND`:
+- `locmem` (по умолчанию) — память процесса; только для разработки и тестов (один процесс);
+- `database` — таблица в `default`-базе, без новых зависимостей (`python manage.py createcachetable`);
+- `redis` — Redis (`pip install redis`), `CACHE_LOCATION` — URL, например `redis://127.0.0.1:6379/1`;
+- `memcached` — Memcached (`pip install pymemcache`), `CACHE_LOCATION` — `host:port`.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Mapping
+
+from django.core.exceptions import ImproperlyConfigured
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "database": "django.core.cache.backends.db.DatabaseCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "memcached": "django.core.cache.backends.memcached.PyMemcacheCache",
+}
+DEFAULT_CACHE_LOCATIONS = {
+    "locmem": "",
+    "database": "django_cache",
+    "redis": "redis://127.0.0.1:6379/1",
+    "memcached": "127.0.0.1:11211",
+}
+
+
+def caches_from_env(environ: Mapping[str, str] = os.environ) -> dict:
+    """
+    Собирает `CACHES` по `CACHE_*` переменным окружения.
+
+    Пример:
+        caches_from_env({"CACHE_BACKEND": "redis", "CACHE_LOCATION": "redis://cache:6379/1"})
+        # {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache:6379/1",
+        #              "KEY_PREFIX": "adaptaki"}}
+    """
+    backend = environ.get("CACHE_BACKEND", "locmem").lower()
+    if backend not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f"Unsupported CACHE_BACKEND: {backend!r} (expected one of {', '.join(map(repr, CACHE_BACKENDS))})."
+        )
+    return {
+        "default": {
+            "BACKEND": CACHE_BACKENDS[backend],
+            "LOCATION": environ.get("CACHE_LOCATION") or DEFAULT_CACHE_LOCATIONS[backend],
+            # Several deployments may share one Redis/Memcached.
+            "KEY_PREFIX": environ.get("CACHE_KEY_PREFIX", "adaptaki"),
+        }
+    }
@@ -0,0 +1,125 @@
+"""
+Настройки базы данных из переменных окружения (`DATABASES["default"]`).
+
+`DB_ENGINE=sqlite` (по умолчанию) — файл SQLite, настроенный под конкурентные записи;
+`DB_ENGINE=postgresql` — PostgreSQL (psycopg 3) с persistent-соединениями или пулом.
+`DB_REPLICA_*` — необязательная read-реплика (алиас `replica`, маршрутизация — `config.replica`).
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Mapping
+
+from django.core.exceptions import ImproperlyConfigured
+
+SQLITE_DEFAULT_BUSY_TIMEOUT_SECONDS = 20
+SQLITE_DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+POSTGRES_DEFAULT_CONN_MAX_AGE = 60
+
+
+def databases_from_env(base_dir: Path, environ: Mapping[str, str] = os.environ) -> dict:
+    """
+    `DATABASES` целиком: `default` и, если задан `DB_REPLICA_NAME` или `DB_REPLICA_HOST`, `replica` — те же
+    настройки с подменой имени/хоста/учетных данных. В тестах реплика — зеркало `default` (`TEST.MIRROR`).
+
+    Пример:
+        databases_from_env(BASE_DIR, {"DB_NAME": "primary.sqlite3", "DB_REPLICA_NAME": "replica.sqlite3"})
+        # {"default": {..., "NAME": "primary.sqlite3"}, "replica": {..., "NAME": "replica.sqlite3", "TEST": {"MIRROR": "default"}}}
+    """
+    default = database_from_env(base_dir, environ)
+    databases = {"default": default}
+    if environ.get("DB_REPLICA_NAME") or environ.get("DB_REPLICA_HOST"):
+        replica = {**default, "OPTIONS": {**default["OPTIONS"]}, "TEST": {"MIRROR": "default"}}
+        for name in ("NAME", "USER", "PASSWORD", "HOST", "PORT"):
+            value = environ.get(f"DB_REPLICA_{name}")
+            if value:
+                replica[name] = value
+        databases["replica"] = replica
+    return databases
+
+
+def database_from_env(base_dir: Path, environ: Mapping[str, str] = os.environ) -> dict:
+    """
+    Собирает конфигурацию `default`-базы по `DB_*` переменным окружения.
+
+    Пример:
+        database_from_env(BASE_DIR, {"DB_ENGINE": "postgresql", "DB_NAME": "adaptaki", "DB_POOL": "1"})
+        # {"ENGINE": "django.db.backends.postgresql", "NAME": "adaptaki", ..., "OPTIONS": {"pool": {...}}}
+    """
+    engine = environ.get("DB_ENGINE", "sqlite").lower()
+    if engine in ("sqlite", "sqlite3"):
+        return _sqlite(base_dir, environ)
+    if engine in ("postgres", "postgresql"):
+        return _postgresql(environ)
+    raise ImproperlyConfigured(f"Unsupported DB_ENGINE: {engine!r} (expected 'sqlite' or 'postgresql').")
+
+
+def _sqlite(base_dir: Path, environ: Mapping[str, str]) -> dict:
+    """
+    SQLite под конкурентные записи (несколько воркеров, один файл):
+    - WAL — читатели не блокируют писателя и наоборот;
+    - `synchronous=NORMAL` — fsync только на чекпойнтах WAL (безопасно в WAL-режиме, теряются лишь последние
+      транзакции при отключении питания, не целостность);
+    - `timeout` — busy timeout: ждать освобождения блокировки вместо мгновенного "database is locked";
+    - `transaction_mode=IMMEDIATE` — блокировка на запись берется в начале `atomic()`, а не при первом INSERT:
+      иначе две транзакции, начавшие с чтения, не могут повысить блокировку и одна падает, не дожидаясь timeout;
+    - `mmap_size` — чтения через отображение файла в память, без копирования через page cache SQLite.
+    """
+    mmap_size = _int(environ, "DB_SQLITE_MMAP_SIZE", SQLITE_DEFAULT_MMAP_SIZE)
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": environ.get("DB_NAME") or base_dir / "db.sqlite3",
+        "OPTIONS": {
+            "timeout": _int(environ, "DB_SQLITE_BUSY_TIMEOUT", SQLITE_DEFAULT_BUSY_TIMEOUT_SECONDS),
+            "transaction_mode": "IMMEDIATE",
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                f"PRAGMA mmap_size={mmap_size};"
+            ),
+        },
+    }
+
+
+def _postgresql(environ: Mapping[str, str]) -> dict:
+    """
+    PostgreSQL: либо persistent-соединения (`DB_CONN_MAX_AGE` секунд, с health check перед переиспользованием),
+    либо пул psycopg (`DB_POOL=1`) — Django не допускает их одновременно, при пуле `CONN_MAX_AGE` равен 0.
+    Пул общий на процесс: `DB_POOL_MAX_SIZE` × число воркеров не должно превышать `max_connections` сервера.
+    """
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": environ.get("DB_NAME", "adaptaki"),
+        "USER": environ.get("DB_USER", "postgres"),
+        "PASSWORD": environ.get("DB_PASSWORD", ""),
+        "HOST": environ.get("DB_HOST", ""),
+        "PORT": environ.get("DB_PORT", ""),
+        "OPTIONS": {},
+    }
+    if _flag(environ, "DB_POOL"):
+        config["CONN_MAX_AGE"] = 0
+        config["OPTIONS"]["pool"] = {
+            "min_size": _int(environ, "DB_POOL_MIN_SIZE", 2),
+            "max_size": _int(environ, "DB_POOL_MAX_SIZE", 10),
+            "timeout": _int(environ, "DB_POOL_TIMEOUT", 10),
+        }
+    else:
+        config["CONN_MAX_AGE"] = _int(environ, "DB_CONN_MAX_AGE", POSTGRES_DEFAULT_CONN_MAX_AGE)
+        config["CONN_HEALTH_CHECKS"] = True
+    return config
+
+
+def _int(environ: Mapping[str, str], name: str, default: int) -> int:
+    value = environ.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} must be an integer, got {value!r}.") from None
+
+
+def _flag(environ: Mapping[str, str], name: str) -> bool:
+    return environ.get(name, "").lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,202 @@
+"""
+Чтение отчетных запросов с реплики (`DATABASES["replica"]`, см. `config.database.databases_from_env`).
+
+По умолчанию все запросы идут в `default`. На реплику читают только явно помеченные места:
+- APIView с `ReplicaReadMixin` (GET/HEAD) — сводки, прогресс, рейтинги, отчеты, выгрузки;
+  async-views — `AsyncReplicaReadMixin`;
+- код внутри `read_from_replica()` — read-only команды.
+
+Read-your-writes: после собственной записи (ответ, завершение попытки) пользователь `pin_to_primary` на
+`REPLICA_STICKY_SECONDS` и все это время читает с primary — видит свой последний ответ, даже если реплика отстает.
+Окно должно быть больше типичного отставания реплики; метка хранится в Django cache, поэтому при нескольких
+процессах нужен общий кеш (`CACHE_BACKEND`, см. `config.cache`), иначе метка видна только процессу, принявшему запись.
+
+Кеши, которые заполняются по запросу, заполняются только чтениями с primary (`reads_from_replica`).
+
+Без `replica` в `DATABASES` все это — no-op.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DATABASE_ALIAS = "replica"
+DEFAULT_REPLICA_STICKY_SECONDS = 15
+
+_read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+
+class ReplicaRouter:
+    """
+    Чтение — с алиаса, выбранного для текущего контекста (`read_from_replica`), запись и миграции — в `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == "django_cache":
+            # DatabaseCache: invalidation marks must not be read from a lagging replica.
+            return None
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика — копия primary: объекты с обеих баз можно связывать.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def replica_alias() -> str | None:
+    return REPLICA_DATABASE_ALIAS if REPLICA_DATABASE_ALIAS in settings.DATABASES else None
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Все чтения ORM внутри блока идут на реплику (если она настроена).
+
+    Пример:
+        with read_from_replica():
+            rows = list(TaskAttempt.objects.filter(user_id=42))
+    """
+    token = _read_alias.set(replica_alias())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def iter_on_read_alias(iterable: Iterable) -> Iterator:
+    """
+    Сохраняет выбор базы для ленивого итератора: тело `StreamingHttpResponse` итерируется уже после выхода
+    из view, когда контекст запроса сброшен.
+
+    Пример:
+        return ndjson_streaming_response(iter_on_read_alias(iter_attempt_export()), filename="attempts.ndjson")
+    """
+    alias = _read_alias.get()
+    iterator = iter(iterable)
+
+    def generate():
+        while True:
+            token = _read_alias.set(alias)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _read_alias.reset(token)
+            yield item
+
+    return generate()
+
+
+def reads_from_replica() -> bool:
+    """
+    Идут ли чтения текущего контекста на реплику.
+
+    Результат, собранный с реплики, может отставать от primary: его не кладут в кеш, ключ которого сдвигается
+    записью (версии прогресса), — иначе данные до записи закешируются как новая версия.
+
+    Пример:
+        report = get_class_report(user=request.user, group_id=5, subject_id=1, fill_cache=not reads_from_replica())
+    """
+    return _read_alias.get() is not None
+
+
+def pin_to_primary(user_id: int) -> None:
+    """
+    Помечает пользователя как недавно писавшего: его чтения идут на primary `REPLICA_STICKY_SECONDS`.
+
+    Пример:
+        attempt = submit_task_answer(user=request.user, ...)
+        pin_to_primary(request.user.id)
+    """
+    if replica_alias() is None:
+        return
+    cache.set(_sticky_key(user_id), True, getattr(settings, "REPLICA_STICKY_SECONDS", DEFAULT_REPLICA_STICKY_SECONDS))
+
+
+async def apin_to_primary(user_id: int) -> None:
+    """
+    Async-вариант `pin_to_primary`.
+
+    Пример:
+        attempt = await asubmit_task_answer(user=request.user, ...)
+        await apin_to_primary(request.user.id)
+    """
+    if replica_alias() is None:
+        return
+    await cache.aset(
+        _sticky_key(user_id), True, getattr(settings, "REPLICA_STICKY_SECONDS", DEFAULT_REPLICA_STICKY_SECONDS)
+    )
+
+
+def is_pinned_to_primary(user_id: int | None) -> bool:
+    return user_id is not None and cache.get(_sticky_key(user_id)) is not None
+
+
+async def ais_pinned_to_primary(user_id: int | None) -> bool:
+    return user_id is not None and await cache.aget(_sticky_key(user_id)) is not None
+
+
+class ReplicaReadMixin:
+    """
+    Для read-only APIView: GET/HEAD читают с реплики, кроме пользователей в окне read-your-writes.
+
+    Решение принимается после аутентификации (`initial`) и сбрасывается по выходу из `dispatch`.
+
+    Пример:
+        class UserProgressView(ReplicaReadMixin, APIView):
+            ...
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_alias.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        alias = replica_alias()
+        if alias is not None and request.method in SAFE_METHODS and not is_pinned_to_primary(request.user.id):
+            _read_alias.set(alias)
+
+
+class AsyncReplicaReadMixin:
+    """
+    `ReplicaReadMixin` для async-views (`apps.training.api.async_views.AsyncAPIView`): тот же выбор базы
+    в async `initial`. Контекст запроса копируется в потоки async ORM, поэтому выбор действует и там.
+
+    Пример:
+        class TestAttemptSummaryView(AsyncReplicaReadMixin, AsyncAPIView):
+            ...
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        token = _read_alias.set(None)
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    async def initial(self, request):
+        await super().initial(request)
+        alias = replica_alias()
+        if alias is not None and request.method in SAFE_METHODS and not await ais_pinned_to_primary(request.user.id):
+            _read_alias.set(alias)
+
+
+def _sticky_key(user_id: int) -> str:
+    return f"replica:pinned:{user_id}"
@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 
+from config.cache import caches_from_env
+from config.database import databases_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -49,9 +52,11 @@ INSTALLED_APPS = [
     'apps.exams',
     'apps.tasks',
     'apps.training',
+    'apps.monitoring',
 ]
 
 MIDDLEWARE = [
+    "apps.monitoring.infrastructure.middleware.ProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -86,12 +91,20 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# Configured by DB_* environment variables, see config/database.py.
+DATABASES = databases_from_env(BASE_DIR)
+
+# Reporting reads go to the optional "replica" alias, see config/replica.py.
+DATABASE_ROUTERS = ["config.replica.ReplicaRouter"]
+
+REPLICA_STICKY_SECONDS = 15
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+# Configured by CACHE_* environment variables, see config/cache.py (shared across workers in production).
+CACHES = caches_from_env()
 
 
 # Password validation
@@ -152,3 +165,14 @@ SIMPLE_JWT = {
 # CORS policy
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Request profiling (apps.monitoring)
+
+PROFILING = {
+    "PATH_PREFIXES": ("/api/training/",),
+    "SERVER_TIMING": True,
+    "SLOW_REQUEST_MS": 500,
+    "QUERY_SAMPLE_RATE": 0.0,
+    "QUERY_BUDGET": None,
+    "ROUTE_QUERY_BUDGETS": {},
+}
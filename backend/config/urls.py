@@ -17,6 +17,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from apps.monitoring.api.views import MetricsView
+
 admin.site.site_header = "Adaptaki — Админка"
 admin.site.site_title = "Adaptaki"
 admin.site.index_title = "Управление данными"
@@ -27,4 +29,7 @@ urlpatterns = [
     path("api/training/", include("apps.training.api.urls")),
     path("api/tasks/", include("apps.tasks.api.urls")),
     path("api/graph/", include("apps.graph.api.urls")),
+    path("api/exams/", include("apps.exams.api.urls")),
+    path("api/monitoring/", include("apps.monitoring.api.urls")),
+    path("metrics", MetricsView.as_view()),
 ]
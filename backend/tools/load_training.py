@@ -0,0 +1,391 @@
+"""
+Нагрузочный драйвер тренажера: виртуальные ученики гоняют цикл
+login → random-task → submit-answer (× N) → summary → finish против запущенного сервера.
+
+Только стандартная библиотека (asyncio + собственный HTTP/1.1 клиент с keep-alive),
+Django не импортируется — драйвер запускается с любой машины.
+
+Пример:
+    python tools/load_training.py --base-url http://127.0.0.1:8000 --students 2000 --duration 120 \
+        --think-time 1.5 --task-mix number=3,short_text=1 --register --output runs/baseline.json
+    python tools/load_training.py ... --output runs/after.json --compare runs/baseline.json
+    python tools/load_training.py ... --training-prefix /api/training/async/ --output runs/asgi.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+ENDPOINTS = ("register", "login", "random-task", "submit-answer", "summary", "finish")
+
+# Plausible (mostly wrong) answers: the load profile only needs valid payload shapes.
+ANSWERS = {
+    "short_text": lambda rng: {"value": rng.choice(["масса", "сила", "скорость"])},
+    "number": lambda rng: {"value": str(rng.randint(0, 20))},
+    "single_choice": lambda rng: {"value": rng.choice(["a", "b", "c", "d"])},
+    "multi_choice": lambda rng: {"value": rng.sample(["a", "b", "c", "d"], 2)},
+    "match": lambda rng: {"value": {"1": "a", "2": "b"}},
+}
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpConnection:
+    """
+    Минимальный HTTP/1.1 клиент: одно keep-alive соединение на виртуального ученика.
+
+    Пример:
+        conn = HttpConnection("127.0.0.1", 8000)
+        status, body = await conn.request("GET", "/api/exams/tree/")
+    """
+
+    def __init__(self, host: str, port: int, *, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def request(self, method: str, path: str, *, body: dict | None = None, token: str | None = None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        headers = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+            f"Content-Length: {len(payload)}",
+        ]
+        if body is not None:
+            headers.append("Content-Type: application/json")
+        if token:
+            headers.append(f"Authorization: Bearer {token}")
+        raw = ("\r\n".join(headers) + "\r\n\r\n").encode() + payload
+
+        # A keep-alive connection may have been closed by the server since the last request.
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout
+                )
+            try:
+                self.writer.write(raw)
+                await self.writer.drain()
+                return await asyncio.wait_for(self._read_response(), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if attempt:
+                    raise
+
+    async def _read_response(self) -> tuple[int, bytes]:
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            await self.reader.readuntil(b"\r\n")
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, body
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.reader = self.writer = None
+
+
+@dataclass
+class Stats:
+    latencies_ms: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, endpoint: str, latency_ms: float, status: str, *, ok: bool) -> None:
+        self.latencies_ms[endpoint].append(latency_ms)
+        self.statuses[endpoint][status] += 1
+        if not ok:
+            self.errors[endpoint] += 1
+
+
+class Student:
+    """
+    Виртуальный ученик: логин, затем сессии рандомной практики до дедлайна.
+    """
+
+    def __init__(self, index: int, *, args, stats: Stats, deadline: float, rng: random.Random):
+        self.username = f"{args.user_prefix}{index}"
+        self.args = args
+        self.stats = stats
+        self.deadline = deadline
+        self.rng = rng
+        url = urlsplit(args.base_url)
+        self.conn = HttpConnection(url.hostname, url.port or 80, timeout=args.timeout)
+        self.token: str | None = None
+
+    async def call(self, endpoint: str, method: str, path: str, *, body: dict | None = None):
+        started = time.perf_counter()
+        try:
+            status, raw = await self.conn.request(method, path, body=body, token=self.token)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as exc:
+            self.stats.record(endpoint, (time.perf_counter() - started) * 1000, type(exc).__name__, ok=False)
+            await self.conn.close()
+            raise HttpError(endpoint) from exc
+        self.stats.record(endpoint, (time.perf_counter() - started) * 1000, str(status), ok=status < 400)
+        if status >= 400:
+            raise HttpError(f"{endpoint}: HTTP {status}")
+        return json.loads(raw) if raw else None
+
+    async def think(self) -> None:
+        if self.args.think_time > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.args.think_time))
+
+    async def run(self) -> None:
+        try:
+            await self.login()
+            while time.monotonic() < self.deadline:
+                try:
+                    await self.session()
+                except HttpError:
+                    await self.think()
+        except HttpError:
+            pass
+        finally:
+            await self.conn.close()
+
+    async def login(self) -> None:
+        credentials = {"username": self.username, "password": self.args.password}
+        try:
+            data = await self.call("login", "POST", "/api/auth/login/", body=credentials)
+        except HttpError:
+            if not self.args.register:
+                raise
+            await self.call("register", "POST", "/api/auth/register/", body=credentials)
+            data = await self.call("login", "POST", "/api/auth/login/", body=credentials)
+        self.token = data["access"]
+
+    async def session(self) -> None:
+        test_attempt_id = None
+        for _ in range(self.args.tasks_per_session):
+            if time.monotonic() >= self.deadline:
+                break
+            params = {"task_type": self.rng.choices(self.args.task_types, self.args.task_weights)[0]}
+            if self.args.subject_id is not None:
+                params["subject_id"] = self.args.subject_id
+            if test_attempt_id is not None:
+                params["test_attempt_id"] = test_attempt_id
+            task = await self.call("random-task", "GET", f"{self.args.training_prefix}random-task/?{urlencode(params)}")
+            test_attempt_id = task["test_attempt_id"]
+
+            await self.think()
+            await self.call(
+                "submit-answer",
+                "POST",
+                f"{self.args.training_prefix}submit-answer/",
+                body={
+                    "task_id": task["id"],
+                    "test_attempt_id": test_attempt_id,
+                    "answer_payload": ANSWERS.get(task["task_type"], ANSWERS["short_text"])(self.rng),
+                    "duration_ms": self.rng.randint(2_000, 90_000),
+                },
+            )
+
+        if test_attempt_id is not None:
+            await self.call(
+                "summary", "GET", f"{self.args.training_prefix}test-attempt/summary/?test_attempt_id={test_attempt_id}"
+            )
+            await self.call(
+                "finish",
+                "POST",
+                f"{self.args.training_prefix}random-session/finish/",
+                body={"test_attempt_id": test_attempt_id},
+            )
+        await self.think()
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """
+    Перцентиль по методу ближайшего ранга.
+
+    Пример:
+        percentile([10, 20, 30, 40], 0.5) -> 20
+    """
+    if not sorted_values:
+        return None
+    rank = max(int(-(-q * len(sorted_values) // 1)), 1)
+    return sorted_values[rank - 1]
+
+
+def build_report(args, stats: Stats, *, started_at: datetime, elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint in sorted(stats.latencies_ms, key=lambda name: ENDPOINTS.index(name) if name in ENDPOINTS else 99):
+        values = sorted(stats.latencies_ms[endpoint])
+        count = len(values)
+        endpoints[endpoint] = {
+            "count": count,
+            "errors": stats.errors[endpoint],
+            "error_rate": round(stats.errors[endpoint] / count, 4),
+            "rps": round(count / elapsed, 2),
+            "p50_ms": round(percentile(values, 0.50), 2),
+            "p95_ms": round(percentile(values, 0.95), 2),
+            "p99_ms": round(percentile(values, 0.99), 2),
+            "max_ms": round(values[-1], 2),
+            "statuses": dict(stats.statuses[endpoint]),
+        }
+    total = sum(row["count"] for row in endpoints.values())
+    errors = sum(row["errors"] for row in endpoints.values())
+    return {
+        "started_at": started_at.isoformat(),
+        "elapsed_s": round(elapsed, 2),
+        "config": {
+            "base_url": args.base_url,
+            "training_prefix": args.training_prefix,
+            "students": args.students,
+            "duration_s": args.duration,
+            "ramp_up_s": args.ramp_up,
+            "think_time_s": args.think_time,
+            "tasks_per_session": args.tasks_per_session,
+            "task_mix": dict(zip(args.task_types, args.task_weights)),
+            "subject_id": args.subject_id,
+            "seed": args.seed,
+        },
+        "totals": {
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "rps": round(total / elapsed, 2),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict, *, baseline: dict | None = None) -> None:
+    header = f"{'endpoint':<15}{'count':>9}{'rps':>9}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"{endpoint:<15}{row['count']:>9}{row['rps']:>9}{row['error_rate'] * 100:>8.2f}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+        previous = (baseline or {}).get("endpoints", {}).get(endpoint)
+        if previous:
+            print(
+                f"{'  vs baseline':<15}{'':>9}{_delta(row['rps'], previous['rps']):>9}{'':>8}"
+                f"{_delta(row['p50_ms'], previous['p50_ms']):>10}{_delta(row['p95_ms'], previous['p95_ms']):>10}"
+                f"{_delta(row['p99_ms'], previous['p99_ms']):>10}"
+            )
+    totals = report["totals"]
+    print(f"\n{totals['requests']} requests in {report['elapsed_s']} s: {totals['rps']} rps, "
+          f"{totals['error_rate'] * 100:.2f}% errors")
+
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def parse_task_mix(value: str) -> dict[str, float]:
+    """
+    `number=3,short_text=1` -> {"number": 3.0, "short_text": 1.0}
+    """
+    mix = {}
+    for part in value.split(","):
+        task_type, _, weight = part.partition("=")
+        if task_type.strip() not in ANSWERS:
+            raise argparse.ArgumentTypeError(f"Unknown task type: {task_type!r}.")
+        mix[task_type.strip()] = float(weight or 1)
+    return mix
+
+
+async def run(args) -> dict:
+    stats = Stats()
+    rng = random.Random(args.seed)
+    started_at = datetime.now(timezone.utc)
+    started = time.monotonic()
+    deadline = started + args.ramp_up + args.duration
+
+    async def start_student(index: int):
+        # Spread logins over the ramp-up window instead of a thundering herd.
+        await asyncio.sleep(args.ramp_up * index / max(args.students, 1))
+        student = Student(index, args=args, stats=stats, deadline=deadline, rng=random.Random(rng.random()))
+        await student.run()
+
+    await asyncio.gather(*(start_student(index) for index in range(args.students)))
+    return build_report(args, stats, started_at=started_at, elapsed=time.monotonic() - started)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон тренажера против запущенного сервера.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--training-prefix",
+        default="/api/training/",
+        help="Префикс эндпоинтов тренажера; /api/training/async/ — async-варианты (ASGI).",
+    )
+    parser.add_argument("--students", type=int, default=100, help="Число одновременных виртуальных учеников.")
+    parser.add_argument("--duration", type=float, default=60, help="Секунды нагрузки после разгона.")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Секунды, за которые стартуют все ученики.")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Средняя пауза ученика, с (экспоненциальная).")
+    parser.add_argument("--tasks-per-session", type=int, default=10)
+    parser.add_argument(
+        "--task-mix",
+        type=parse_task_mix,
+        default=parse_task_mix(",".join(ANSWERS)),
+        help="Веса типов заданий: number=3,short_text=1 (по умолчанию — поровну).",
+    )
+    parser.add_argument("--subject-id", type=int)
+    parser.add_argument("--user-prefix", default="load-student-")
+    parser.add_argument("--password", default="load-password-1")
+    parser.add_argument("--register", action="store_true", help="Регистрировать учеников, которых еще нет.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Таймаут запроса, с.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Сохранить результаты в JSON.")
+    parser.add_argument("--compare", help="JSON прошлого прогона: показать изменения rps и перцентилей.")
+    args = parser.parse_args(argv)
+    args.task_types = list(args.task_mix)
+    args.task_weights = list(args.task_mix.values())
+
+    report = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline=baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if report["totals"]["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())